@@ -1,12 +1,25 @@
-from strawberry.fastapi import GraphQLRouter
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import RedirectResponse
 from dotenv import load_dotenv
+import asyncio
 import os
 from pathlib import Path
 from packages.schema import schema
 from packages.context.database import db_context
+from packages.utils.encoding import EncodingGraphQLRouter
+from packages.utils.metrics import metrics
+from packages.utils.persisted_queries import build_persisted_router
+from packages.routes.Account._query_.AccountConnection.account_export import router as account_export_router
+from packages.routes.Product._query_.ProductList.product_list import check_list_indexes
+from packages.middleware.compression import CompressionMiddleware
+from packages.middleware.admission import AdmissionControlMiddleware
+from packages.middleware.rate_limit import RateLimitMiddleware
+from packages.middleware.auth import apply_password_policy
+from packages.engines.suggest import suggest_index
+from packages.engines.catalog import CATALOG_ENGINE, catalog_snapshot
+from packages.engines.recommend import recommendation_index
+from packages.engines.trending import trending
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -14,6 +27,14 @@ load_dotenv(ROOT_DIR / '.env')
 # Create FastAPI app
 app = FastAPI(title="E-commerce Monorepo API", version="1.0.0")
 
+# Adaptive concurrency limits for /graphql (see ADMISSION_* env vars)
+# Added before CORS so shed requests still carry CORS headers
+app.add_middleware(AdmissionControlMiddleware)
+
+# Per-user / per-IP limits by operation (see RATE_LIMITS); runs before admission so
+# rejected callers never take a concurrency slot
+app.add_middleware(RateLimitMiddleware)
+
 """
 Configure CORS
 - Use env var ALLOW_ORIGINS as a comma-separated list of allowed origins
@@ -33,8 +54,12 @@ app.add_middleware(
 
 # Rely on CORSMiddleware for preflight; no manual OPTIONS handlers needed
 
+# Negotiated brotli/gzip compression (see COMPRESSION_* env vars)
+app.add_middleware(CompressionMiddleware)
+
 # Mount GraphQL router with playground at /graphql
-graphql_app = GraphQLRouter(
+# Responses are encoded with orjson when installed (override with JSON_ENCODER=stdlib)
+graphql_app = EncodingGraphQLRouter(
     schema,
     context_getter=db_context.get_context,
     graphql_ide=True  
@@ -43,6 +68,57 @@ graphql_app = GraphQLRouter(
 # Mount GraphQL router at /graphql
 app.include_router(graphql_app, prefix="/graphql", include_in_schema=True)
 
+# Cacheable GET endpoint for persisted catalog queries at /graphql/persisted/{name}
+app.include_router(
+    build_persisted_router(schema, db_context.get_context, graphql_app.response_encoder),
+    prefix="/graphql"
+)
+
+# Streaming CSV/NDJSON account export for admins at /export/accounts
+app.include_router(account_export_router)
+
+# Create declared database indexes
+@app.on_event("startup")
+async def create_indexes():
+    await db_context.ensure_indexes()
+    await check_list_indexes(db_context.db)
+
+# Apply the bcrypt cost policy (calibrated to BCRYPT_TARGET_MS when set)
+@app.on_event("startup")
+async def configure_password_hashing():
+    await asyncio.to_thread(apply_password_policy)
+
+# Build the product typeahead index in the background and keep it fresh
+background_tasks = set()
+
+@app.on_event("startup")
+async def start_suggest_index():
+    task = asyncio.create_task(suggest_index.run(db_context.db))
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+
+# Wishlist co-occurrence index behind productRecommendations
+@app.on_event("startup")
+async def start_recommendation_index():
+    task = asyncio.create_task(recommendation_index.run(db_context.db))
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+
+# Decayed trending scores: periodic flush to / reload from trending_scores
+@app.on_event("startup")
+async def start_trending():
+    task = asyncio.create_task(trending.run(db_context.db))
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+
+# Columnar catalog snapshot serving productList (CATALOG_ENGINE=snapshot)
+@app.on_event("startup")
+async def start_catalog_snapshot():
+    if CATALOG_ENGINE == "snapshot":
+        task = asyncio.create_task(catalog_snapshot.run(db_context.db))
+        background_tasks.add(task)
+        task.add_done_callback(background_tasks.discard)
+
 # Redirect root to GraphQL Playground
 @app.get("/")
 async def root():
@@ -53,6 +129,11 @@ async def root():
 async def health_check():
     return {"status": "healthy", "message": "E-commerce Monorepo API is running"}
 
+# In-process metrics (compression, caches, limiters)
+@app.get("/metrics")
+async def metrics_snapshot():
+    return metrics.snapshot()
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -1,8 +1,12 @@
 from motor.motor_asyncio import AsyncIOMotorClient
+from starlette.requests import Request
 import os
 from dotenv import load_dotenv
 from pathlib import Path
 
+from .indexes import ensure_indexes
+from ..utils.deadline import Deadline, DeadlineDatabase
+
 ROOT_DIR = Path(__file__).parent.parent.parent
 load_dotenv(ROOT_DIR / '.env')
 
@@ -13,8 +17,13 @@ class DatabaseContext:
         self.client = AsyncIOMotorClient(self.mongo_url)
         self.db = self.client[self.db_name]
     
-    async def get_context(self):
-        return {"db": self.db}
+    async def get_context(self, request: Request = None):
+        # Reads run with maxTimeMS bounded by the request deadline
+        deadline = Deadline.from_request(request)
+        return {"db": DeadlineDatabase(self.db, deadline), "deadline": deadline}
+
+    async def ensure_indexes(self):
+        await ensure_indexes(self.db)
 
 # Global database context
 db_context = DatabaseContext()
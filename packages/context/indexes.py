@@ -0,0 +1,210 @@
+"""
+Database Indexes
+Declarative index definitions, created on application startup
+"""
+
+from pymongo import ASCENDING, DESCENDING, GEOSPHERE, IndexModel
+from pymongo.errors import PyMongoError
+
+
+
+def _product_list_index(scope, sort_field) -> IndexModel:
+    keys = [(scope, ASCENDING)] if scope else []
+    keys += [(sort_field, ASCENDING), ("id", ASCENDING)]
+    name = f"list_{scope}_{sort_field}" if scope else f"list_{sort_field}"
+    return IndexModel(keys, name=name)
+
+
+# product_list sort plans: (equality filter, sort field) -> index (equality, sort, id)
+# Other filters (availability, type, price and stock ranges) are not in the index: they are checked
+# on the fetched documents, so results still come in index order and no plan sorts in memory
+# Combinations missing here are rejected by ProductList rather than sorted in memory
+PRODUCT_LIST_INDEXES = {
+    (scope, sort_field): _product_list_index(scope, sort_field)
+    for scope, sort_field in [
+        (None, "created_at"),
+        (None, "price"),
+        ("category_id", "created_at"),
+        ("category_id", "price"),
+        ("category_id", "name"),
+        ("seller_id", "created_at"),
+        ("seller_id", "price"),
+        ("seller_id", "name"),
+        ("tags", "created_at"),
+        ("tags", "price"),
+    ]
+}
+
+INDEXES = {
+    "bookings": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        # A provider's schedule and a customer's bookings, in time order
+        IndexModel([("seller_id", ASCENDING), ("start", ASCENDING)], name="seller_id_start"),
+        IndexModel([("customer_id", ASCENDING), ("start", ASCENDING)], name="customer_id_start"),
+    ],
+    "booking_days": [
+        # One document per provider and day holds its booked intervals; service_book claims an
+        # interval with a conditional update on this document, so overlapping bookings cannot both win
+        IndexModel([("seller_id", ASCENDING), ("day", ASCENDING)], name="seller_id_day_unique", unique=True),
+    ],
+    "working_hours": [
+        IndexModel([("seller_id", ASCENDING)], name="seller_id_unique", unique=True),
+    ],
+    "orders": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        # orders_for_customer / orders_for_seller keyset pages (newest first)
+        IndexModel(
+            [("customer_id", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)],
+            name="customer_created_at"
+        ),
+        IndexModel(
+            [("seller_id", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)],
+            name="seller_created_at"
+        ),
+        # Day-range scans of the sales rollup backfill
+        IndexModel([("created_at", ASCENDING)], name="created_at"),
+    ],
+    "products": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        # Data version for catalog ETags (max updated_at)
+        IndexModel([("updated_at", DESCENDING)], name="updated_at_desc"),
+        *PRODUCT_LIST_INDEXES.values(),
+    ],
+    "categories": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("updated_at", DESCENDING)], name="updated_at_desc"),
+    ],
+    "users": [
+        # Admin account listing: equality filters first, then the keyset sort. users takes every
+        # login and profile write, so only the user_type scopes are indexed; is_active and a bare
+        # seller_type filter are checked on the documents these indexes return
+        IndexModel([("created_at", DESCENDING), ("id", DESCENDING)], name="created_at"),
+        IndexModel(
+            [("user_type", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)],
+            name="user_type_created_at"
+        ),
+        IndexModel(
+            [("user_type", ASCENDING), ("seller_type", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)],
+            name="user_type_seller_type_created_at"
+        ),
+        # sellers_near: $geoNear over seller business locations (users without one are not indexed)
+        IndexModel(
+            [("business_location", GEOSPHERE), ("seller_type", ASCENDING), ("is_active", ASCENDING)],
+            name="business_location_2dsphere"
+        ),
+    ],
+    "idempotency_keys": [
+        IndexModel([("key", ASCENDING)], name="key_unique", unique=True),
+        # Keys are forgotten after IDEMPOTENCY_TTL_HOURS
+        IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0),
+    ],
+    "refresh_tokens": [
+        IndexModel([("token_hash", ASCENDING)], name="token_hash_unique", unique=True),
+        IndexModel([("user_id", ASCENDING)], name="user_id"),
+        IndexModel([("family_id", ASCENDING)], name="family_id"),
+        # Expired refresh tokens are removed by MongoDB
+        IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0),
+    ],
+    "seller_daily_sales": [
+        # seller_stats reads a seller's day range; the rollups $inc / replace rows by this key
+        IndexModel(
+            [("seller_id", ASCENDING), ("day", ASCENDING), ("product_id", ASCENDING)],
+            name="seller_day_product_unique",
+            unique=True
+        ),
+        # Backfill removes rows of a day range that no longer have sales
+        IndexModel([("day", ASCENDING)], name="day"),
+    ],
+    "trending_scores": [
+        IndexModel([("product_id", ASCENDING)], name="product_id_unique", unique=True),
+        # Scores untouched for 30 days have decayed to nothing
+        IndexModel([("updated_at", ASCENDING)], name="updated_at_ttl", expireAfterSeconds=30 * 24 * 3600),
+    ],
+    "wishlists": [
+        # Keyset pagination of a user's wishlist (newest first)
+        IndexModel(
+            [("user_id", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)],
+            name="user_created_at"
+        ),
+        # One row per (user, product); makes upserts race-free
+        IndexModel(
+            [("user_id", ASCENDING), ("product_id", ASCENDING)],
+            name="user_product_unique",
+            unique=True
+        ),
+    ],
+}
+
+
+async def dedupe_wishlists(db) -> int:
+    """
+    Keep the oldest row per (user_id, product_id) so the unique index can be built
+    wishlist_add used to check and insert in two steps, which could store duplicates
+    """
+    duplicates = db.wishlists.aggregate([
+        {"$sort": {"created_at": 1, "_id": 1}},
+        {"$group": {"_id": {"user_id": "$user_id", "product_id": "$product_id"}, "ids": {"$push": "$_id"}}},
+        {"$match": {"ids.1": {"$exists": True}}}
+    ], allowDiskUse=True)
+    removed = 0
+    async for group in duplicates:
+        result = await db.wishlists.delete_many({"_id": {"$in": group["ids"][1:]}})
+        removed += result.deleted_count
+    return removed
+
+
+# Indexes that were declared once and are dropped on startup, so writes stop maintaining them
+OBSOLETE_INDEXES = {
+    "users": [
+        "is_active_created_at",
+        "seller_type_created_at",
+        "user_type_is_active_created_at",
+        "seller_type_is_active_created_at",
+        "user_type_seller_type_is_active_created_at",
+    ],
+}
+
+# Run before a collection's indexes are built, to make existing data fit unique indexes
+PRE_INDEX_MIGRATIONS = {
+    "wishlists": dedupe_wishlists,
+}
+
+
+async def ensure_indexes(db) -> None:
+    """
+    Create all declared indexes (no-op for indexes that already exist)
+    Indexes are built one by one so a failing build doesn't block the others. Correctness
+    depends on the unique ones (no double bookings, duplicate wishlist rows or replayed
+    idempotency keys), so startup fails when any of them could not be built
+    """
+    for collection, names in OBSOLETE_INDEXES.items():
+        existing = await db[collection].index_information()
+        for name in names:
+            if name in existing:
+                try:
+                    await db[collection].drop_index(name)
+                except PyMongoError as e:
+                    print(f"ERROR: Failed to drop obsolete index {collection}.{name}: {str(e)}")
+
+    failed_unique = []
+    for collection, models in INDEXES.items():
+        migrate = PRE_INDEX_MIGRATIONS.get(collection)
+        if migrate is not None:
+            try:
+                removed = await migrate(db)
+                if removed:
+                    print(f"Removed {removed} duplicate documents from {collection}")
+            except PyMongoError as e:
+                print(f"ERROR: Failed to prepare {collection} for its indexes: {str(e)}")
+
+        for model in models:
+            name = model.document["name"]
+            try:
+                await db[collection].create_indexes([model])
+            except PyMongoError as e:
+                print(f"ERROR: Failed to create index {collection}.{name}: {str(e)}")
+                if model.document.get("unique"):
+                    failed_unique.append(f"{collection}.{name}")
+
+    if failed_unique:
+        raise RuntimeError(f"Required unique indexes could not be created: {', '.join(failed_unique)}")
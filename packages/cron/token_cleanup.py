@@ -1,6 +1,6 @@
 """
 Token Cleanup Utility
-Cleans up expired blacklisted tokens from the database
+Cleans up expired blacklisted and refresh tokens from the database
 This should be run periodically as a cron job
 """
 
@@ -27,7 +27,10 @@ async def cleanup_expired_tokens():
         current_time = datetime.now(timezone.utc)
         result = await db.blacklisted_tokens.delete_many({"expires_at": {"$lt": current_time}})
         
+        refresh_result = await db.refresh_tokens.delete_many({"expires_at": {"$lt": current_time}})
+
         print(f"Cleanup completed: {result.deleted_count} expired tokens removed")
+        print(f"Cleanup completed: {refresh_result.deleted_count} expired refresh tokens removed")
         
     except Exception as e:
         print(f"Error during cleanup: {str(e)}")
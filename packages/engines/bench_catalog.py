@@ -0,0 +1,137 @@
+"""
+Benchmark for the columnar catalog snapshot
+Measures memory per product and product_list query latency on the snapshot and, with
+--mongo, the same queries against MongoDB (products are loaded into a scratch database
+named by BENCH_DB_NAME, dropped afterwards)
+
+Run with:
+    python -m packages.engines.bench_catalog [--products N] [--mongo]
+"""
+
+import argparse
+import asyncio
+import gc
+import random
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+
+from packages.engines.catalog import CatalogTable
+from packages.routes.Product._query_.ProductList.product_list import build_product_filter, plan_product_list
+from packages.types.inputs import ProductFilterInput
+
+ROUNDS = 50
+CATEGORIES = [str(uuid.UUID(int=n)) for n in range(200)]
+SELLERS = [str(uuid.UUID(int=10_000 + n)) for n in range(5000)]
+TAGS = ["organic", "handmade", "sale", "new", "eco", "premium", "gift", "local", "vegan", "imported"]
+
+QUERIES = [
+    ("newest", ProductFilterInput(), "created_at", True),
+    ("category by price", ProductFilterInput(category_id=CATEGORIES[7]), "price", False),
+    ("price range in stock", ProductFilterInput(min_price=20, max_price=40, in_stock=True), "price", True),
+    ("two tags", ProductFilterInput(tags=["organic", "sale"]), "created_at", True),
+    ("seller by name", ProductFilterInput(seller_id=SELLERS[3]), "name", False),
+]
+
+
+def build_product(rng: random.Random, index: int) -> dict:
+    created_at = datetime(2024, 1, 1) + timedelta(seconds=index * 17)
+    is_service = rng.random() < 0.1
+    return {
+        "id": str(uuid.UUID(int=rng.getrandbits(128))),
+        "name": f"Product {rng.randrange(1_000_000):06d}",
+        "description": "Synthetic benchmark product",
+        "type": "service" if is_service else "product",
+        "category_id": rng.choice(CATEGORIES),
+        "seller_id": rng.choice(SELLERS),
+        "price": round(rng.uniform(1, 500), 2),
+        "images": [],
+        "is_available": rng.random() < 0.9,
+        "stock_quantity": None if is_service else rng.randint(0, 50),
+        "service_duration": 60 if is_service else None,
+        "tags": rng.sample(TAGS, 3),
+        "created_at": created_at,
+        "updated_at": created_at,
+    }
+
+
+def report(label: str, samples: list) -> None:
+    samples = sorted(samples)
+    p50 = samples[len(samples) // 2] * 1000
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000
+    print(f"  {label:<24} p50 {p50:>8.3f}ms  p99 {p99:>8.3f}ms")
+
+
+def bench_snapshot(products: list) -> None:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    table = CatalogTable(len(products))
+    for product in products:
+        table.upsert(product)
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    count = len(products)
+    print(f"snapshot: {count} products, {used / count:.0f} bytes/product "
+          f"({table.column_bytes() / count:.0f} in NumPy columns)")
+    for label, filters, sort_field, descending in QUERIES:
+        samples = []
+        for _ in range(ROUNDS):
+            start = time.perf_counter()
+            table.query(filters, sort_field, descending, 50)
+            samples.append(time.perf_counter() - start)
+        report(label, samples)
+
+
+async def bench_mongo(products: list) -> None:
+    import os
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from packages.context.indexes import INDEXES
+
+    client = AsyncIOMotorClient(os.environ.get("MONGO_URL", "mongodb://localhost:27017"))
+    db = client[os.environ.get("BENCH_DB_NAME", "catalog_bench")]
+    try:
+        await db.products.drop()
+        for start in range(0, len(products), 10_000):
+            await db.products.insert_many([dict(product) for product in products[start:start + 10_000]])
+        await db.products.create_indexes(INDEXES["products"])
+
+        print(f"mongo: {len(products)} products")
+        for label, filters, sort_field, descending in QUERIES:
+            filter_query = build_product_filter(filters)
+            index_name = plan_product_list(filter_query, sort_field)
+            order = -1 if descending else 1
+            samples = []
+            for _ in range(ROUNDS):
+                start = time.perf_counter()
+                await db.products.find(filter_query, {"_id": 0, "id": 1}) \
+                    .sort([(sort_field, order), ("id", order)]) \
+                    .hint(index_name) \
+                    .limit(50) \
+                    .to_list(length=50)
+                samples.append(time.perf_counter() - start)
+            report(label, samples)
+    finally:
+        await db.products.drop()
+        client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--products", type=int, default=1_000_000)
+    parser.add_argument("--mongo", action="store_true", help="also run the queries against MongoDB")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    products = [build_product(rng, i) for i in range(args.products)]
+    # Keep collector pauses over the synthetic documents out of the timings
+    gc.collect()
+    gc.freeze()
+    bench_snapshot(products)
+    if args.mongo:
+        asyncio.run(bench_mongo(products))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark for the wishlist co-occurrence index
+Builds the top-K matrix from synthetic wishlists (Zipf-distributed product popularity) and
+measures build time, index size, query latency and incremental update cost
+
+Run with:
+    python -m packages.engines.bench_recommend [users] [products]
+"""
+
+import random
+import sys
+import time
+
+import numpy as np
+
+from packages.engines.recommend import RECOMMEND_TOP_K, RecommendationIndex, cooccurrence_top_k
+
+DEFAULT_USERS = 200_000
+DEFAULT_PRODUCTS = 100_000
+ITEMS_PER_USER = 20
+QUERIES = 10_000
+
+
+def synthetic_wishlists(users: int, products: int, rng: np.random.Generator):
+    sizes = rng.poisson(ITEMS_PER_USER, users).clip(1, 200)
+    user_codes = np.repeat(np.arange(users), sizes)
+    product_codes = (rng.zipf(1.3, len(user_codes)) - 1) % products
+    # The unique (user, product) index means no duplicate pairs
+    pairs = np.unique(user_codes * products + product_codes)
+    return pairs // products, pairs % products
+
+
+def main():
+    users = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_USERS
+    products = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_PRODUCTS
+    user_codes, product_codes = synthetic_wishlists(users, products, np.random.default_rng(42))
+
+    start = time.perf_counter()
+    indptr, indices, scores = cooccurrence_top_k(user_codes, product_codes, products, RECOMMEND_TOP_K)
+    elapsed = time.perf_counter() - start
+    size = indptr.nbytes + indices.nbytes + scores.nbytes
+    print(f"build: {len(user_codes)} wishlist rows, {users} users, {products} products in {elapsed:.1f}s")
+    print(f"index: {len(indices)} neighbours, {size / 1024 / 1024:.1f} MiB ({size / products:.0f} bytes/product)")
+
+    index = RecommendationIndex()
+    index.load([f"p{code}" for code in range(products)], indptr, indices, scores)
+
+    rng = random.Random(42)
+    targets = [f"p{rng.randrange(products)}" for _ in range(QUERIES)]
+    samples = []
+    for product_id in targets:
+        begin = time.perf_counter()
+        index.recommend(product_id, 10)
+        samples.append(time.perf_counter() - begin)
+    samples.sort()
+    print(f"query: p50 {samples[len(samples) // 2] * 1e6:.1f}us  p99 {samples[int(len(samples) * 0.99)] * 1e6:.1f}us")
+
+    begin = time.perf_counter()
+    for _ in range(1000):
+        wishlist = [f"p{rng.randrange(products)}" for _ in range(ITEMS_PER_USER)]
+        index._adjust([wishlist[0]], wishlist[1:], 1)
+    print(f"incremental add (20-item wishlist): {(time.perf_counter() - begin) / 1000 * 1e6:.1f}us")
+
+    samples = []
+    for product_id in targets:
+        begin = time.perf_counter()
+        index.recommend(product_id, 10)
+        samples.append(time.perf_counter() - begin)
+    samples.sort()
+    print(f"query with deltas: p50 {samples[len(samples) // 2] * 1e6:.1f}us  p99 {samples[int(len(samples) * 0.99)] * 1e6:.1f}us")
+
+
+if __name__ == "__main__":
+    main()
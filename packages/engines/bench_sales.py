@@ -0,0 +1,79 @@
+"""
+Benchmark for the sales rollup backfill grouping
+Groups synthetic orders into (seller, day, product) rollups chunk by chunk, as backfill does,
+and checks the sums against a plain dict accumulation
+
+Run with:
+    python -m packages.engines.bench_sales [orders]
+"""
+
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+from packages.engines.sales import BACKFILL_CHUNK, SalesRollups, _Codes, group_sums, order_rows
+
+DEFAULT_ORDERS = 500_000
+SELLERS = 2000
+PRODUCTS_PER_SELLER = 50
+DAYS = 31
+FIRST_DAY = date(2026, 1, 1)
+
+
+def build_orders(count: int, rng: random.Random) -> list:
+    orders = []
+    for _ in range(count):
+        seller = rng.randrange(SELLERS)
+        items = [
+            {
+                "product_service_id": f"p{seller}-{rng.randrange(PRODUCTS_PER_SELLER)}",
+                "quantity": rng.randint(1, 4),
+                "price": round(rng.uniform(1, 80), 2),
+            }
+            for _ in range(rng.randint(1, 4))
+        ]
+        orders.append({
+            "seller_id": f"s{seller}",
+            "created_at": datetime.combine(FIRST_DAY, datetime.min.time()) + timedelta(seconds=rng.randrange(DAYS * 86400)),
+            "items": items,
+            "total_amount": sum(item["price"] * item["quantity"] for item in items),
+        })
+    return orders
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ORDERS
+    orders = build_orders(count, random.Random(42))
+
+    begin = time.perf_counter()
+    sellers, products = _Codes(), _Codes()
+    no_product = products.code(None)
+    partials = [
+        SalesRollups._group_chunk(orders[start:start + BACKFILL_CHUNK], FIRST_DAY, sellers, products, no_product)
+        for start in range(0, count, BACKFILL_CHUNK)
+    ]
+    keys, revenue, units, _ = group_sums(*(np.concatenate(part) for part in zip(*partials)))
+    vectorized = time.perf_counter() - begin
+
+    begin = time.perf_counter()
+    expected = {}
+    for order in orders:
+        for key, row in order_rows(order).items():
+            total = expected.setdefault(key, [0.0, 0])
+            total[0] += row["revenue"]
+            total[1] += row["units"]
+    plain = time.perf_counter() - begin
+
+    print(f"{count} orders -> {len(keys)} rollup rows")
+    print(f"  chunked NumPy grouping {vectorized:.2f}s ({count / vectorized:,.0f} orders/s)")
+    print(f"  dict accumulation      {plain:.2f}s ({count / plain:,.0f} orders/s)")
+    assert len(keys) == len(expected)
+    assert np.isclose(revenue.sum(), sum(total[0] for total in expected.values()))
+    assert units.sum() == sum(total[1] for total in expected.values())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark for the product typeahead index
+Builds the index over a synthetic catalog and measures suggest() latency for short
+(cached) and longer prefixes, plus the cost of incremental updates
+
+Run with:
+    python -m packages.engines.bench_suggest [products]
+"""
+
+import random
+import sys
+import time
+import uuid
+
+from packages.engines.suggest import SuggestIndex
+
+DEFAULT_PRODUCTS = 1_000_000
+QUERIES = 2000
+UPDATES = 2000
+
+ADJECTIVES = ["premium", "organic", "classic", "vintage", "deluxe", "compact", "wireless", "handmade",
+              "ultra", "smart", "eco", "portable", "artisan", "pro", "mini", "rustic"]
+NOUNS = ["coffee", "headphones", "backpack", "lamp", "keyboard", "teapot", "sneakers", "blender",
+         "jacket", "notebook", "candle", "speaker", "wallet", "chair", "mug", "watch", "camera", "sofa"]
+TAGS = ["kitchen", "audio", "travel", "office", "home", "outdoor", "gift", "fitness", "decor", "tech"]
+
+
+def build_product(rng: random.Random, index: int) -> dict:
+    name = f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {rng.choice(NOUNS)} {index}"
+    return {
+        "id": str(uuid.UUID(int=rng.getrandbits(128))),
+        "name": name.title(),
+        "tags": rng.sample(TAGS, 2),
+        "is_available": True,
+    }
+
+
+def percentiles(samples: list) -> str:
+    samples = sorted(samples)
+    pick = lambda q: samples[min(len(samples) - 1, int(q * len(samples)))] * 1_000_000
+    return f"p50 {pick(0.5):>7.1f}us  p99 {pick(0.99):>7.1f}us  max {samples[-1] * 1_000_000:>8.1f}us"
+
+
+def time_queries(index: SuggestIndex, prefixes: list) -> list:
+    samples = []
+    for prefix in prefixes:
+        start = time.perf_counter()
+        index.suggest(prefix, 10)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PRODUCTS
+    rng = random.Random(42)
+    products = [build_product(rng, i) for i in range(count)]
+    popularity = {product["id"]: rng.randint(0, 500) for product in rng.sample(products, count // 10)}
+
+    index = SuggestIndex()
+    start = time.perf_counter()
+    index.load(products, popularity)
+    print(f"build: {count} products, {index.stats()['terms']} terms in {time.perf_counter() - start:.1f}s")
+
+    words = ADJECTIVES + NOUNS + TAGS
+    short = [rng.choice(words)[:rng.randint(1, 2)] for _ in range(QUERIES)]
+    longer = [rng.choice(words)[:rng.randint(3, 6)] for _ in range(QUERIES)]
+    phrases = [f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)[:rng.randint(1, 4)]}" for _ in range(QUERIES)]
+    time_queries(index, short)  # warm the short-prefix cache
+
+    print(f"short prefixes (1-2 chars, cached): {percentiles(time_queries(index, short))}")
+    print(f"word prefixes (3-6 chars):          {percentiles(time_queries(index, longer))}")
+    print(f"two-word prefixes:                  {percentiles(time_queries(index, phrases))}")
+
+    samples = []
+    for product in rng.sample(products, UPDATES):
+        product = dict(product, name=f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} renamed".title())
+        start = time.perf_counter()
+        index.upsert(product)
+        samples.append(time.perf_counter() - start)
+    print(f"incremental upsert:                 {percentiles(samples)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Event-replay benchmark for the trending engine
+Replays a synthetic stream of views, wishlist adds and orders spread over two days (with the
+popular products shifting halfway), then checks the maintained per-category top-K against
+decayed scores recomputed from scratch with NumPy
+
+Run with:
+    python -m packages.engines.bench_trending [events]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from packages.engines.trending import (
+    ORDER_WEIGHT, TRENDING_TOP_K, VIEW_WEIGHT, WISHLIST_WEIGHT, TrendingEngine
+)
+
+DEFAULT_EVENTS = 2_000_000
+PRODUCTS = 100_000
+CATEGORIES = 500
+SPAN_SECONDS = 2 * 24 * 3600
+CHECK_LIMIT = 10
+
+
+def synthetic_events(count: int, rng: np.random.Generator):
+    start = time.time() - SPAN_SECONDS
+    at = np.sort(rng.uniform(start, start + SPAN_SECONDS, count))
+    products = (rng.zipf(1.2, count) - 1) % PRODUCTS
+    # Popularity moves to a different set of products for the second day
+    second_day = at > start + SPAN_SECONDS / 2
+    products[second_day] = (products[second_day] * 7919 + 13) % PRODUCTS
+    weights = rng.choice([VIEW_WEIGHT, WISHLIST_WEIGHT, ORDER_WEIGHT], count, p=[0.9, 0.08, 0.02])
+    categories = np.arange(PRODUCTS) % CATEGORIES
+    return at, products, weights, categories
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_EVENTS
+    rng = np.random.default_rng(42)
+    at, products, weights, categories = synthetic_events(count, rng)
+    product_ids = [f"p{code}" for code in range(PRODUCTS)]
+    category_ids = [f"c{code}" for code in range(CATEGORIES)]
+
+    engine = TrendingEngine(landmark=float(at[0]))
+    replay = list(zip(at.tolist(), products.tolist(), weights.tolist()))
+    begin = time.perf_counter()
+    for event_at, product, weight in replay:
+        engine.record(product_ids[product], category_ids[categories[product]], weight, at=event_at)
+    elapsed = time.perf_counter() - begin
+    print(f"replay: {count} events in {elapsed:.2f}s ({count / elapsed:,.0f} events/s, "
+          f"{elapsed / count * 1e6:.2f}us/event)")
+
+    # Reference: decayed scores at the end of the stream, recomputed from scratch
+    now = float(at[-1])
+    reference = np.bincount(products, weights=weights * np.exp(-engine.decay * (now - at)), minlength=PRODUCTS)
+    mismatches = 0
+    for category in range(CATEGORIES):
+        members = np.flatnonzero(categories == category)
+        expected = members[np.argsort(-reference[members], kind="stable")][:CHECK_LIMIT]
+        got = [int(product_id[1:]) for product_id, _ in engine.top(category_ids[category], CHECK_LIMIT)]
+        if not np.allclose(reference[got], reference[expected]):
+            mismatches += 1
+    print(f"check: {CATEGORIES - mismatches}/{CATEGORIES} category top-{CHECK_LIMIT} lists match the reference")
+
+    samples = []
+    for category in rng.integers(0, CATEGORIES, 10_000).tolist():
+        begin = time.perf_counter()
+        engine.top(category_ids[category], CHECK_LIMIT)
+        samples.append(time.perf_counter() - begin)
+    samples.sort()
+    print(f"query: p50 {samples[len(samples) // 2] * 1e6:.1f}us  p99 {samples[int(len(samples) * 0.99)] * 1e6:.1f}us "
+          f"(top-{CHECK_LIMIT} of {TRENDING_TOP_K} kept)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,317 @@
+"""
+Columnar Catalog Snapshot
+Optional in-memory read engine for product_list: the filterable and sortable fields of every
+product are kept in NumPy columns, so filters, price ranges and sorts run as vectorized masks
+and only the page of ids that is returned gets hydrated (through product_cache)
+
+- Enable with CATALOG_ENGINE=snapshot; product_list falls back to MongoDB until the first
+  build finishes
+- category_id, seller_id and type are interned into integer codes; tags are kept as an
+  inverted index (tag -> rows)
+- Built at startup, updated on PRODUCT_CHANGED in this worker and, for writes handled by
+  other workers, by polling products.updated_at every CATALOG_REFRESH_SECONDS
+- Results can lag other workers' writes by up to CATALOG_REFRESH_SECONDS; hydrated documents
+  come from product_cache and can trail them by up to PRODUCT_CACHE_L1_TTL seconds
+"""
+
+import asyncio
+import heapq
+import os
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+
+import numpy as np
+
+from packages.utils.metrics import metrics
+
+# "mongo" (default) or "snapshot"
+CATALOG_ENGINE = os.environ.get("CATALOG_ENGINE", "mongo")
+CATALOG_REFRESH_SECONDS = float(os.environ.get("CATALOG_REFRESH_SECONDS", "30"))
+BUILD_BATCH_SIZE = 5000
+INITIAL_CAPACITY = 1024
+# Every SAMPLE_STEP-th value is used to bound the top-k search
+SAMPLE_STEP = 64
+
+PRODUCT_PROJECTION = {
+    "_id": 0, "id": 1, "name": 1, "type": 1, "category_id": 1, "seller_id": 1, "price": 1,
+    "stock_quantity": 1, "is_available": 1, "tags": 1, "created_at": 1, "updated_at": 1
+}
+
+# Numeric columns and their dtypes; stock is NaN for services so it never matches in_stock
+COLUMNS = {
+    "price": np.float64,
+    "stock": np.float64,
+    "created_at": np.float64,
+    "available": np.bool_,
+    "type": np.int32,
+    "category": np.int32,
+    "seller": np.int32,
+}
+
+# Code for a missing interned value
+NO_CODE = -1
+
+
+class Interner:
+    """Maps strings to dense integer codes"""
+
+    def __init__(self):
+        self.codes: Dict[str, int] = {}
+
+    def code(self, value: Optional[str]) -> int:
+        if value is None:
+            return NO_CODE
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.codes)
+        return code
+
+    def lookup(self, value: str) -> Optional[int]:
+        return self.codes.get(value)
+
+
+def _top_candidates(values: np.ndarray, limit: int, descending: bool) -> np.ndarray:
+    """
+    Positions of a superset of the `limit` best values (including ties)
+    The limit-th best of a strided sample is never better than the limit-th best overall, so
+    using it as the cut-off keeps every winner while skipping a full-size partition
+    """
+    if len(values) <= limit:
+        return np.arange(len(values))
+    sample = values[::SAMPLE_STEP] if len(values) >= limit * SAMPLE_STEP else values
+    if descending:
+        threshold = np.partition(sample, len(sample) - limit)[len(sample) - limit]
+        return np.flatnonzero(values >= threshold)
+    threshold = np.partition(sample, limit - 1)[limit - 1]
+    return np.flatnonzero(values <= threshold)
+
+
+def _is_empty(filters) -> bool:
+    return filters is None or not any(
+        getattr(filters, name) is not None and getattr(filters, name) != []
+        for name in ("category_id", "seller_id", "is_available", "product_type",
+                     "min_price", "max_price", "in_stock", "tags")
+    )
+
+
+class CatalogTable:
+    """Columns for one generation of the snapshot; rows are never reused"""
+
+    def __init__(self, capacity: int = INITIAL_CAPACITY):
+        self.size = 0
+        self.columns = {name: np.zeros(capacity, dtype) for name, dtype in COLUMNS.items()}
+        self.ids: List[str] = []
+        self.names: List[str] = []
+        self.rows: Dict[str, int] = {}
+        self.tags: Dict[str, Set[int]] = {}
+        # Row arrays built from `tags` on first use, dropped when the tag's rows change
+        self._tag_rows: Dict[str, np.ndarray] = {}
+        self._row_tags: List[tuple] = []
+        self._types = Interner()
+        self._categories = Interner()
+        self._sellers = Interner()
+
+    def _grow(self) -> None:
+        capacity = max(INITIAL_CAPACITY, len(self.columns["price"]) * 2)
+        for name, column in self.columns.items():
+            grown = np.zeros(capacity, column.dtype)
+            grown[: self.size] = column[: self.size]
+            self.columns[name] = grown
+
+    def upsert(self, product: dict) -> None:
+        """Write a product into its row, appending a row for new products"""
+        row = self.rows.get(product["id"])
+        if row is None:
+            if self.size == len(self.columns["price"]):
+                self._grow()
+            row = self.rows[product["id"]] = self.size
+            self.size += 1
+            self.ids.append(product["id"])
+            self.names.append(product["name"])
+            self._row_tags.append(())
+        else:
+            self.names[row] = product["name"]
+
+        columns = self.columns
+        stock = product.get("stock_quantity")
+        columns["price"][row] = product["price"]
+        columns["stock"][row] = np.nan if stock is None else stock
+        columns["created_at"][row] = product["created_at"].timestamp()
+        columns["available"][row] = bool(product.get("is_available"))
+        columns["type"][row] = self._types.code(product.get("type"))
+        columns["category"][row] = self._categories.code(product.get("category_id"))
+        columns["seller"][row] = self._sellers.code(product.get("seller_id"))
+
+        tags = tuple(dict.fromkeys(product.get("tags") or []))
+        if tags != self._row_tags[row]:
+            for tag in self._row_tags[row]:
+                self.tags[tag].discard(row)
+                self._tag_rows.pop(tag, None)
+            for tag in tags:
+                self.tags.setdefault(tag, set()).add(row)
+                self._tag_rows.pop(tag, None)
+            self._row_tags[row] = tags
+
+    def _rows_with_tag(self, tag: str) -> np.ndarray:
+        rows = self._tag_rows.get(tag)
+        if rows is None:
+            members = self.tags.get(tag, ())
+            rows = self._tag_rows[tag] = np.fromiter(members, np.int64, len(members))
+        return rows
+
+    def mask(self, filters) -> Optional[np.ndarray]:
+        """Boolean mask over rows matching a ProductFilterInput; None when nothing can match"""
+        size = self.size
+        columns = self.columns
+        mask = np.ones(size, np.bool_)
+        if filters is None:
+            return mask
+
+        for value, interner, column in (
+            (filters.category_id, self._categories, "category"),
+            (filters.seller_id, self._sellers, "seller"),
+            (filters.product_type, self._types, "type"),
+        ):
+            if value:
+                code = interner.lookup(value)
+                if code is None:
+                    return None
+                mask &= columns[column][:size] == code
+
+        if filters.is_available is not None:
+            mask &= columns["available"][:size] == filters.is_available
+        if filters.min_price is not None:
+            mask &= columns["price"][:size] >= filters.min_price
+        if filters.max_price is not None:
+            mask &= columns["price"][:size] <= filters.max_price
+        if filters.in_stock is not None:
+            stock = columns["stock"][:size]
+            mask &= stock > 0 if filters.in_stock else stock <= 0
+
+        if filters.tags:
+            # Smallest tag first; the others can only narrow it
+            for tag in sorted(set(filters.tags), key=lambda tag: len(self.tags.get(tag, ()))):
+                rows = self._rows_with_tag(tag)
+                if not len(rows):
+                    return None
+                tag_mask = np.zeros(size, np.bool_)
+                tag_mask[rows] = True
+                mask &= tag_mask
+        return mask
+
+    def query(self, filters, sort_field: str, descending: bool, limit: int) -> List[str]:
+        """Ids of the first `limit` matching products ordered by (sort_field, id), like the Mongo path"""
+        rows = None
+        if not _is_empty(filters):
+            mask = self.mask(filters)
+            if mask is None:
+                return []
+            rows = np.flatnonzero(mask)
+
+        ids = self.ids
+        if sort_field == "name":
+            names = self.names
+            rows = range(self.size) if rows is None else rows.tolist()
+            keys = ((names[row], ids[row]) for row in rows)
+        else:
+            column = self.columns[sort_field][: self.size]
+            values = column if rows is None else column[rows]
+            # Narrow to the rows that can make the page before the exact (value, id) sort
+            positions = _top_candidates(values, limit, descending)
+            rows = positions if rows is None else rows[positions]
+            keys = zip(values[positions].tolist(), (ids[row] for row in rows.tolist()))
+
+        select = heapq.nlargest if descending else heapq.nsmallest
+        return [product_id for _, product_id in select(limit, keys)]
+
+    def column_bytes(self) -> int:
+        """Bytes held by the NumPy columns (excluding ids, names and tags)"""
+        return sum(column.nbytes for column in self.columns.values())
+
+
+class CatalogSnapshot:
+    def __init__(self):
+        self.table = CatalogTable()
+        self.ready = False
+        self._building = False
+        self._pending: Set[str] = set()
+        self._last_updated_at: Optional[datetime] = None
+        metrics.register("catalog", self.stats)
+
+    def upsert(self, product: dict) -> None:
+        self.table.upsert(product)
+        updated_at = product.get("updated_at")
+        if updated_at and (self._last_updated_at is None or updated_at > self._last_updated_at):
+            self._last_updated_at = updated_at
+
+    async def apply_change(self, db, product_id: str) -> None:
+        """PRODUCT_CHANGED handler"""
+        if self._building:
+            self._pending.add(product_id)
+            return
+        product = await db.products.find_one({"id": product_id}, PRODUCT_PROJECTION)
+        if product is not None:
+            self.upsert(product)
+
+    def query(self, filters, sort_field: str, descending: bool, limit: int) -> List[str]:
+        metrics.incr("catalog.queries")
+        return self.table.query(filters, sort_field, descending, limit)
+
+    async def build(self, db) -> None:
+        """Load every product into a fresh table and swap it in"""
+        self._building = True
+        try:
+            table = CatalogTable(max(INITIAL_CAPACITY, await db.products.estimated_document_count()))
+            last_updated_at = None
+            cursor = db.products.find({}, PRODUCT_PROJECTION).batch_size(BUILD_BATCH_SIZE)
+            async for product in cursor:
+                table.upsert(product)
+                updated_at = product.get("updated_at")
+                if updated_at and (last_updated_at is None or updated_at > last_updated_at):
+                    last_updated_at = updated_at
+            self.table = table
+            self._last_updated_at = last_updated_at
+            self.ready = True
+        finally:
+            self._building = False
+
+        # Apply changes that arrived while building
+        pending, self._pending = self._pending, set()
+        for product_id in pending:
+            await self.apply_change(db, product_id)
+
+    async def refresh(self, db) -> None:
+        """Pick up products written by other workers since the last seen updated_at"""
+        if not self.ready or self._building:
+            return
+        query = {"updated_at": {"$gt": self._last_updated_at}} if self._last_updated_at else {}
+        async for product in db.products.find(query, PRODUCT_PROJECTION).sort("updated_at", 1):
+            self.upsert(product)
+
+    async def run(self, db) -> None:
+        """Build, then keep the snapshot fresh (run as a background task)"""
+        while not self.ready:
+            try:
+                await self.build(db)
+            except Exception as e:
+                print(f"Catalog snapshot build failed: {str(e)}")
+                await asyncio.sleep(CATALOG_REFRESH_SECONDS)
+
+        while True:
+            await asyncio.sleep(CATALOG_REFRESH_SECONDS)
+            try:
+                await self.refresh(db)
+            except Exception as e:
+                print(f"Catalog snapshot refresh failed: {str(e)}")
+
+    def stats(self) -> dict:
+        return {
+            "ready": self.ready,
+            "products": self.table.size,
+            "column_bytes": self.table.column_bytes(),
+            "tags": len(self.table.tags),
+        }
+
+
+# Global catalog snapshot (only built when CATALOG_ENGINE=snapshot)
+catalog_snapshot = CatalogSnapshot()
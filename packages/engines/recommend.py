@@ -0,0 +1,265 @@
+"""
+"Also Wishlisted" Recommendations
+Item-to-item co-occurrence over the wishlists collection: two products score one point for
+every user who wishlisted both
+
+- A background job loads all (user_id, product_id) pairs and counts co-occurrences with
+  vectorized NumPy (pairs are expanded per user in chunks of at most PAIR_CHUNK)
+- Each product keeps only its RECOMMEND_TOP_K best neighbours, stored as CSR arrays:
+  indptr[code]:indptr[code + 1] slices `indices` (neighbour codes) and `scores`, already ranked
+- wishlist_add / wishlist_remove events adjust per-product deltas until the next rebuild
+  (every RECOMMEND_REBUILD_SECONDS), which folds them in exactly
+- Users with more than MAX_ITEMS_PER_USER wishlisted products only contribute their first
+  MAX_ITEMS_PER_USER, bounding the quadratic pair expansion
+"""
+
+import asyncio
+import heapq
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from packages.utils.metrics import metrics
+
+RECOMMEND_TOP_K = int(os.environ.get("RECOMMEND_TOP_K", "50"))
+RECOMMEND_REBUILD_SECONDS = float(os.environ.get("RECOMMEND_REBUILD_SECONDS", "3600"))
+MAX_ITEMS_PER_USER = 500
+PAIR_CHUNK = 20_000_000
+BUILD_BATCH_SIZE = 10000
+
+
+def _group_starts(sorted_keys: np.ndarray) -> np.ndarray:
+    if not len(sorted_keys):
+        return np.zeros(0, np.int64)
+    return np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+
+
+def _pair_counts(items: np.ndarray, starts: np.ndarray, sizes: np.ndarray, product_count: int):
+    """Count ordered (left, right) product pairs within each user's group; keys are left * P + right"""
+    occurrence_sizes = np.repeat(sizes, sizes)
+    total = int(occurrence_sizes.sum())
+    left = np.repeat(items, occurrence_sizes)
+    # For every occurrence, walk the whole group it belongs to
+    block_offsets = np.cumsum(occurrence_sizes) - occurrence_sizes
+    within = np.arange(total) - np.repeat(block_offsets, occurrence_sizes)
+    right = items[np.repeat(np.repeat(starts, sizes), occurrence_sizes) + within]
+    keep = left != right
+    keys = left[keep].astype(np.int64) * product_count + right[keep]
+    return np.unique(keys, return_counts=True)
+
+
+def cooccurrence_top_k(
+    user_codes: np.ndarray,
+    product_codes: np.ndarray,
+    product_count: int,
+    top_k: int,
+    max_items_per_user: int = MAX_ITEMS_PER_USER
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    CSR (indptr, indices, scores) of each product's top_k co-occurring products
+    Input pairs must be unique; neighbours are ordered by score desc, then code asc
+    """
+    order = np.lexsort((product_codes, user_codes))
+    users, items = user_codes[order], product_codes[order]
+
+    starts = _group_starts(users)
+    sizes = np.diff(np.r_[starts, len(users)])
+    if len(sizes) and sizes.max() > max_items_per_user:
+        keep = np.arange(len(users)) - np.repeat(starts, sizes) < max_items_per_user
+        users, items = users[keep], items[keep]
+        starts = _group_starts(users)
+        sizes = np.diff(np.r_[starts, len(users)])
+
+    # Expand users in chunks so the pair arrays stay bounded
+    chunk_keys, chunk_counts = [], []
+    pair_totals = np.cumsum(sizes.astype(np.int64) ** 2)
+    first = 0
+    while first < len(sizes):
+        base = pair_totals[first - 1] if first else 0
+        last = max(first + 1, int(np.searchsorted(pair_totals, base + PAIR_CHUNK, side="right")))
+        begin = starts[first]
+        end = starts[last] if last < len(starts) else len(items)
+        keys, counts = _pair_counts(items[begin:end], starts[first:last] - begin, sizes[first:last], product_count)
+        chunk_keys.append(keys)
+        chunk_counts.append(counts)
+        first = last
+
+    if len(chunk_keys) > 1:
+        keys, inverse = np.unique(np.concatenate(chunk_keys), return_inverse=True)
+        counts = np.bincount(inverse, weights=np.concatenate(chunk_counts)).astype(np.int64)
+    elif chunk_keys:
+        keys, counts = chunk_keys[0], chunk_counts[0]
+    else:
+        keys, counts = np.zeros(0, np.int64), np.zeros(0, np.int64)
+
+    left, right = keys // product_count, keys % product_count
+    order = np.lexsort((right, -counts, left))
+    left, right, counts = left[order], right[order], counts[order]
+
+    # Keep the first top_k neighbours of every product
+    starts = _group_starts(left)
+    sizes = np.diff(np.r_[starts, len(left)])
+    keep = np.arange(len(left)) - np.repeat(starts, sizes) < top_k
+    left, right, counts = left[keep], right[keep], counts[keep]
+
+    indptr = np.zeros(product_count + 1, np.int64)
+    np.cumsum(np.bincount(left, minlength=product_count), out=indptr[1:])
+    return indptr, right.astype(np.int32), counts.astype(np.int32)
+
+
+class RecommendationIndex:
+    def __init__(self, top_k: int = RECOMMEND_TOP_K):
+        self.top_k = top_k
+        self.ready = False
+        self._ids: List[str] = []
+        self._codes: Dict[str, int] = {}
+        self._indptr = np.zeros(1, np.int64)
+        self._indices = np.zeros(0, np.int32)
+        self._scores = np.zeros(0, np.int32)
+        # Score changes since the last build: code -> {neighbour code: delta}
+        self._deltas: Dict[int, Dict[int, int]] = {}
+        # Changes made while a build is running, carried over to the new index
+        self._next_deltas: Optional[Dict[int, Dict[int, int]]] = None
+        metrics.register("recommendations", self.stats)
+
+    def _code(self, product_id: str) -> int:
+        code = self._codes.get(product_id)
+        if code is None:
+            code = self._codes[product_id] = len(self._ids)
+            self._ids.append(product_id)
+        return code
+
+    # Queries
+
+    def recommend(self, product_id: str, limit: int) -> List[str]:
+        """Up to `limit` product ids most often wishlisted together with product_id"""
+        code = self._codes.get(product_id)
+        if code is None:
+            return []
+        metrics.incr("recommendations.queries")
+
+        if code + 1 < len(self._indptr):
+            start, end = self._indptr[code], self._indptr[code + 1]
+            neighbours, scores = self._indices[start:end], self._scores[start:end]
+        else:
+            neighbours, scores = self._indices[:0], self._scores[:0]
+
+        delta = self._deltas.get(code)
+        if not delta:
+            return [self._ids[neighbour] for neighbour in neighbours[:limit].tolist()]
+
+        merged = dict(zip(neighbours.tolist(), scores.tolist()))
+        for neighbour, change in delta.items():
+            merged[neighbour] = merged.get(neighbour, 0) + change
+        ranked = heapq.nsmallest(
+            limit, ((-score, neighbour) for neighbour, score in merged.items() if score > 0)
+        )
+        return [self._ids[neighbour] for _, neighbour in ranked]
+
+    # Updates
+
+    def _adjust(self, changed: Iterable[str], others: Iterable[str], change: int) -> None:
+        changed = [self._code(product_id) for product_id in changed]
+        others = [self._code(product_id) for product_id in others][:MAX_ITEMS_PER_USER]
+        targets = [self._deltas] if self._next_deltas is None else [self._deltas, self._next_deltas]
+
+        def bump(left: int, right: int) -> None:
+            for deltas in targets:
+                row = deltas.setdefault(left, {})
+                row[right] = row.get(right, 0) + change
+
+        for index, product in enumerate(changed):
+            for other in others:
+                bump(product, other)
+                bump(other, product)
+            # Pairs within the changed batch, counted once per direction
+            for other in changed[index + 1:]:
+                bump(product, other)
+                bump(other, product)
+
+    async def _wishlist(self, db, user_id: str) -> List[str]:
+        items = await db.wishlists.find({"user_id": user_id}, {"product_id": 1, "_id": 0}).to_list(length=None)
+        return [item["product_id"] for item in items]
+
+    async def on_wishlist_added(self, db, user_id: str, product_ids: List[str]) -> None:
+        """WISHLIST_ADDED handler"""
+        added = set(product_ids)
+        others = [product_id for product_id in await self._wishlist(db, user_id) if product_id not in added]
+        self._adjust(product_ids, others, 1)
+
+    async def on_wishlist_removed(self, db, user_id: str, product_ids: List[str]) -> None:
+        """WISHLIST_REMOVED handler"""
+        self._adjust(product_ids, await self._wishlist(db, user_id), -1)
+
+    # Loading
+
+    async def build(self, db) -> None:
+        """Recount co-occurrences from the wishlists collection and swap in the new index"""
+        self._next_deltas = {}
+        try:
+            user_codes: Dict[str, int] = {}
+            product_codes: Dict[str, int] = {}
+            users, products = [], []
+            cursor = db.wishlists.find({}, {"user_id": 1, "product_id": 1, "_id": 0}).batch_size(BUILD_BATCH_SIZE)
+            async for item in cursor:
+                users.append(user_codes.setdefault(item["user_id"], len(user_codes)))
+                products.append(product_codes.setdefault(item["product_id"], len(product_codes)))
+
+            # The counting is pure NumPy; keep it off the event loop
+            indptr, indices, scores = await asyncio.to_thread(
+                cooccurrence_top_k,
+                np.array(users, np.int64),
+                np.array(products, np.int64),
+                len(product_codes),
+                self.top_k
+            )
+
+            ids = list(product_codes)
+            old_ids = self._ids
+
+            def new_code(old_code: int) -> int:
+                product_id = old_ids[old_code]
+                code = product_codes.get(product_id)
+                if code is None:
+                    code = product_codes[product_id] = len(ids)
+                    ids.append(product_id)
+                return code
+
+            # Changes made since the build started refer to codes of the old index
+            remapped: Dict[int, Dict[int, int]] = {}
+            for code, row in self._next_deltas.items():
+                remapped[new_code(code)] = {new_code(other): change for other, change in row.items()}
+
+            self.load(ids, indptr, indices, scores)
+            self._deltas = remapped
+        finally:
+            self._next_deltas = None
+
+    def load(self, ids: List[str], indptr: np.ndarray, indices: np.ndarray, scores: np.ndarray) -> None:
+        """Swap in a matrix from cooccurrence_top_k; ids[code] is the product id of each code"""
+        self._ids, self._codes = ids, {product_id: code for code, product_id in enumerate(ids)}
+        self._indptr, self._indices, self._scores = indptr, indices, scores
+        self._deltas = {}
+        self.ready = True
+
+    async def run(self, db) -> None:
+        """Build now and every RECOMMEND_REBUILD_SECONDS (run as a background task)"""
+        while True:
+            try:
+                await self.build(db)
+            except Exception as e:
+                print(f"Recommendation index build failed: {str(e)}")
+            await asyncio.sleep(RECOMMEND_REBUILD_SECONDS)
+
+    def stats(self) -> dict:
+        return {
+            "ready": self.ready,
+            "products": len(self._ids),
+            "neighbours": len(self._indices),
+            "delta_rows": len(self._deltas),
+        }
+
+
+# Global recommendation index
+recommendation_index = RecommendationIndex()
@@ -0,0 +1,214 @@
+"""
+Seller Sales Rollups
+Daily aggregates in seller_daily_sales, one row per (seller_id, day, product_id) with revenue
+and units, plus one total row per (seller_id, day) with product_id None that also counts
+orders. seller_stats reads only these rows, never raw orders
+
+- Cancelled orders contribute nothing; every other status counts from the moment it is placed
+- ORDER_PLACED / ORDER_STATUS_CHANGED apply an order's contribution incrementally. Whether an
+  order is counted is recorded on the order (orders.rolled_up) and flipped with a conditional
+  update before the $inc, so duplicated or concurrent events apply each change once
+- backfill() recomputes a day range from raw orders in chunks of BACKFILL_CHUNK orders,
+  grouping each chunk with NumPy, and resets rolled_up on those orders (see sales_backfill).
+  It only rebuilds closed days (before today): new orders keep landing on today's rows, and
+  their $inc could be overwritten or deleted by the rebuild. A status change that races the
+  rebuild of its day is corrected by the next run
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from pymongo import DeleteMany, ReplaceOne, UpdateOne
+
+from packages.utils.metrics import metrics
+
+BACKFILL_CHUNK = 10000
+WRITE_BATCH = 1000
+CANCELLED = "cancelled"
+
+# Composite group key: seller code << 42 | day offset << 30 | product code
+_DAY_SHIFT = 30
+_SELLER_SHIFT = 42
+MAX_BACKFILL_DAYS = 1 << (_SELLER_SHIFT - _DAY_SHIFT)
+
+RowKey = Tuple[str, str, Optional[str]]
+
+
+def order_day(order: dict) -> str:
+    return order["created_at"].date().isoformat()
+
+
+def order_rows(order: dict) -> Dict[RowKey, dict]:
+    """Rollup increments of one order: a row per product and the day total row"""
+    seller_id, day = order["seller_id"], order_day(order)
+    rows: Dict[RowKey, dict] = {}
+    units = 0
+    for item in order.get("items", []):
+        quantity = item.get("quantity", 1)
+        row = rows.setdefault((seller_id, day, item["product_service_id"]), {"revenue": 0.0, "units": 0})
+        row["revenue"] += item["price"] * quantity
+        row["units"] += quantity
+        units += quantity
+    rows[(seller_id, day, None)] = {"revenue": float(order["total_amount"]), "units": units, "orders": 1}
+    return rows
+
+
+def _row_filter(key: RowKey) -> dict:
+    seller_id, day, product_id = key
+    return {"seller_id": seller_id, "day": day, "product_id": product_id}
+
+
+class _Codes:
+    def __init__(self):
+        self.codes: Dict[Optional[str], int] = {}
+        self.values: List[Optional[str]] = []
+
+    def code(self, value: Optional[str]) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+def group_sums(keys: np.ndarray, revenue: np.ndarray, units: np.ndarray, orders: np.ndarray):
+    """Sum revenue, units and orders per distinct key"""
+    unique, inverse = np.unique(keys, return_inverse=True)
+    size = len(unique)
+    return (
+        unique,
+        np.bincount(inverse, weights=revenue, minlength=size),
+        np.bincount(inverse, weights=units, minlength=size).astype(np.int64),
+        np.bincount(inverse, weights=orders, minlength=size).astype(np.int64),
+    )
+
+
+class SalesRollups:
+    def __init__(self):
+        self.applied = 0
+        self.skipped = 0
+        metrics.register("sales_rollups", self.stats)
+
+    # Incremental updates
+
+    async def _apply(self, db, order: dict, counted: bool) -> None:
+        # Only the caller that flips the flag applies the change
+        flag = {"rolled_up": {"$ne": True}} if counted else {"rolled_up": True}
+        result = await db.orders.update_one({"id": order["id"], **flag}, {"$set": {"rolled_up": counted}})
+        if not result.modified_count:
+            self.skipped += 1
+            return
+
+        sign = 1 if counted else -1
+        await db.seller_daily_sales.bulk_write([
+            UpdateOne(_row_filter(key), {"$inc": {field: value * sign for field, value in row.items()}}, upsert=True)
+            for key, row in order_rows(order).items()
+        ], ordered=False)
+        self.applied += 1
+
+    async def on_order_placed(self, db, order: dict) -> None:
+        """ORDER_PLACED handler"""
+        if order.get("status") != CANCELLED:
+            await self._apply(db, order, True)
+
+    async def on_order_status_changed(self, db, order: dict, previous_status: str) -> None:
+        """ORDER_STATUS_CHANGED handler; order is the updated document"""
+        await self._apply(db, order, order["status"] != CANCELLED)
+
+    # Backfill
+
+    async def backfill(self, db, first_day: date, last_day: date) -> int:
+        """Recompute the rollups of [first_day, last_day] from raw orders; returns rows written"""
+        days = (last_day - first_day).days + 1
+        if not 0 < days <= MAX_BACKFILL_DAYS:
+            raise ValueError(f"Backfill range must be 1..{MAX_BACKFILL_DAYS} days")
+        if last_day >= date.today():
+            raise ValueError("Only closed days can be rebuilt; today's orders are still being rolled up")
+        range_start = datetime.combine(first_day, datetime.min.time())
+        created_at = {"$gte": range_start, "$lt": range_start + timedelta(days=days)}
+        rebuilt_at = datetime.now()
+
+        sellers, products = _Codes(), _Codes()
+        no_product = products.code(None)
+        partials = []
+
+        cursor = db.orders.find(
+            {"created_at": created_at, "status": {"$ne": CANCELLED}},
+            {"_id": 0, "seller_id": 1, "created_at": 1, "items": 1, "total_amount": 1}
+        ).batch_size(BACKFILL_CHUNK)
+        chunk = []
+        async for order in cursor:
+            chunk.append(order)
+            if len(chunk) == BACKFILL_CHUNK:
+                partials.append(self._group_chunk(chunk, first_day, sellers, products, no_product))
+                chunk = []
+        if chunk:
+            partials.append(self._group_chunk(chunk, first_day, sellers, products, no_product))
+
+        if partials:
+            keys, revenue, units, orders = group_sums(*(np.concatenate(part) for part in zip(*partials)))
+        else:
+            keys = revenue = units = orders = np.zeros(0)
+
+        # Absolute rows for every key with sales, then drop rows of the range nothing rebuilt
+        writes = []
+        for key, row_revenue, row_units, row_orders in zip(
+            keys.tolist(), revenue.tolist(), units.tolist(), orders.tolist()
+        ):
+            product_id = products.values[key & ((1 << _DAY_SHIFT) - 1)]
+            row = {
+                "seller_id": sellers.values[key >> _SELLER_SHIFT],
+                "day": (first_day + timedelta(days=(key >> _DAY_SHIFT) & (MAX_BACKFILL_DAYS - 1))).isoformat(),
+                "product_id": product_id,
+                "revenue": row_revenue,
+                "units": row_units,
+                "rebuilt_at": rebuilt_at,
+            }
+            if product_id is None:
+                row["orders"] = row_orders
+            writes.append(ReplaceOne(_row_filter((row["seller_id"], row["day"], product_id)), row, upsert=True))
+        writes.append(DeleteMany({
+            "day": {"$gte": first_day.isoformat(), "$lte": last_day.isoformat()},
+            "rebuilt_at": {"$ne": rebuilt_at}
+        }))
+        for start in range(0, len(writes), WRITE_BATCH):
+            await db.seller_daily_sales.bulk_write(writes[start:start + WRITE_BATCH], ordered=True)
+
+        # The rebuilt rows now count exactly the orders that are not cancelled
+        await db.orders.update_many({"created_at": created_at, "status": {"$ne": CANCELLED}}, {"$set": {"rolled_up": True}})
+        await db.orders.update_many({"created_at": created_at, "status": CANCELLED}, {"$set": {"rolled_up": False}})
+        return len(writes) - 1
+
+    @staticmethod
+    def _group_chunk(orders: List[dict], first_day: date, sellers: _Codes, products: _Codes, no_product: int):
+        """Grouped (keys, revenue, units, orders) of one chunk of orders"""
+        keys, revenue, units, counts = [], [], [], []
+        for order in orders:
+            prefix = (sellers.code(order["seller_id"]) << _SELLER_SHIFT) \
+                | ((order["created_at"].date() - first_day).days << _DAY_SHIFT)
+            order_units = 0
+            for item in order.get("items", []):
+                quantity = item.get("quantity", 1)
+                keys.append(prefix | products.code(item["product_service_id"]))
+                revenue.append(item["price"] * quantity)
+                units.append(quantity)
+                counts.append(0)
+                order_units += quantity
+            keys.append(prefix | no_product)
+            revenue.append(order["total_amount"])
+            units.append(order_units)
+            counts.append(1)
+        return group_sums(
+            np.array(keys, np.int64),
+            np.array(revenue, np.float64),
+            np.array(units, np.float64),
+            np.array(counts, np.float64)
+        )
+
+    def stats(self) -> dict:
+        return {"applied": self.applied, "skipped": self.skipped}
+
+
+# Global sales rollups
+sales_rollups = SalesRollups()
@@ -0,0 +1,55 @@
+"""
+Rebuild seller_daily_sales from raw orders
+Recomputes whole days, so it also repairs rollups that missed order events. Only closed days
+(before today) are rebuilt: today's rows keep receiving live order events, which a rebuild
+would overwrite. Run it from cron for recent days, e.g. nightly:
+
+    0 3 * * * python -m packages.engines.sales_backfill --days 7
+
+Run with:
+    python -m packages.engines.sales_backfill [--days N | --start YYYY-MM-DD --end YYYY-MM-DD]
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import date, timedelta
+
+from packages.context.database import db_context
+from packages.engines.sales import sales_rollups
+
+# Days rebuilt per sales_rollups.backfill call
+WINDOW_DAYS = 31
+
+
+async def backfill(first_day: date, last_day: date) -> None:
+    await db_context.ensure_indexes()
+    # One window at a time keeps the grouped partials of a call small
+    day = first_day
+    while day <= last_day:
+        window_end = min(last_day, day + timedelta(days=WINDOW_DAYS - 1))
+        started = time.perf_counter()
+        rows = await sales_rollups.backfill(db_context.db, day, window_end)
+        print(f"{day} .. {window_end}: {rows} rollup rows in {time.perf_counter() - started:.1f}s")
+        day = window_end + timedelta(days=1)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--days", type=int, default=7, help="rebuild the last N closed days, ending yesterday")
+    parser.add_argument("--start", type=date.fromisoformat)
+    parser.add_argument("--end", type=date.fromisoformat)
+    args = parser.parse_args()
+
+    last_day = args.end or date.today() - timedelta(days=1)
+    first_day = args.start or last_day - timedelta(days=args.days - 1)
+    if last_day >= date.today():
+        parser.error("--end must be before today")
+    if first_day > last_day:
+        parser.error("--start must not be after --end")
+
+    asyncio.run(backfill(first_day, last_day))
+
+
+if __name__ == "__main__":
+    main()
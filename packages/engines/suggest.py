@@ -0,0 +1,294 @@
+"""
+Product Typeahead Index
+In-memory prefix index over normalized product names and tags, answering product_suggest
+without touching MongoDB
+
+- Terms (the words of the name and tags) are kept in a sorted list; a prefix maps to a
+  contiguous slice found with bisect
+- Each term's postings are kept in rank order (most wishlisted first, then by name), so a
+  query merges the matching postings lazily and stops after `limit` products
+- Multi-word prefixes ("organic cof") match products having a term starting with every word;
+  the word with the fewest postings drives the scan
+- Prefixes of up to SHORT_PREFIX_LENGTH characters match a large part of the catalog, so
+  their top SUGGEST_MAX_LIMIT results are cached and kept up to date on changes
+- Built at startup, updated on PRODUCT_CHANGED in this worker and, for writes handled by
+  other workers, by polling products.updated_at every SUGGEST_REFRESH_SECONDS; rebuilt every
+  SUGGEST_REBUILD_SECONDS to pick up popularity changes
+"""
+
+import asyncio
+import heapq
+import os
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from packages.utils.metrics import metrics
+
+SUGGEST_MAX_LIMIT = 20
+SHORT_PREFIX_LENGTH = 2
+SUGGEST_REFRESH_SECONDS = float(os.environ.get("SUGGEST_REFRESH_SECONDS", "30"))
+SUGGEST_REBUILD_SECONDS = float(os.environ.get("SUGGEST_REBUILD_SECONDS", "600"))
+BUILD_BATCH_SIZE = 5000
+# Posting lists sorted between event loop yields during a build
+SORT_CHUNK = 2000
+
+PRODUCT_PROJECTION = {"_id": 0, "id": 1, "name": 1, "tags": 1, "is_available": 1, "updated_at": 1}
+
+_NON_WORD = re.compile(r"[^0-9a-z]+")
+
+# (-popularity, name, product id): ascending order is rank order
+RankKey = Tuple[int, str, str]
+
+
+def normalize(text: str) -> str:
+    """Lowercase, strip accents and collapse punctuation / whitespace into single spaces"""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return _NON_WORD.sub(" ", text.lower()).strip()
+
+
+def product_terms(name: str, tags: Iterable[str]) -> Set[str]:
+    terms = set(normalize(name or "").split())
+    for tag in tags or []:
+        terms.update(normalize(tag).split())
+    return terms
+
+
+def _collect(product: dict, popularity: Dict[str, int], postings: Dict[str, List[RankKey]], products: dict) -> None:
+    if not product.get("is_available"):
+        return
+    product_id = product["id"]
+    key = (-popularity.get(product_id, 0), product["name"], product_id)
+    terms = product_terms(product["name"], product.get("tags"))
+    products[product_id] = (key, terms)
+    for term in terms:
+        postings.setdefault(term, []).append(key)
+
+
+class SuggestIndex:
+    def __init__(self):
+        self._terms: List[str] = []
+        self._postings: Dict[str, List[RankKey]] = {}
+        self._products: Dict[str, Tuple[RankKey, Set[str]]] = {}
+        self._popularity: Dict[str, int] = {}
+        # Top results for short prefixes: prefix -> rank keys in rank order
+        self._short: Dict[str, List[RankKey]] = {}
+        self.ready = False
+        self._building = False
+        self._pending: Set[str] = set()
+        self._last_updated_at: Optional[datetime] = None
+        metrics.register("suggest", self.stats)
+
+    # Queries
+
+    def _matching_terms(self, prefix: str) -> List[str]:
+        start = bisect_left(self._terms, prefix)
+        end = bisect_left(self._terms, prefix + "\uffff", start)
+        return self._terms[start:end]
+
+    def _ranked(self, terms: List[str]) -> Iterator[RankKey]:
+        """Products holding any of the terms, in rank order (may repeat)"""
+        return heapq.merge(*(self._postings[term] for term in terms))
+
+    def _search(self, words: List[str], limit: int) -> List[RankKey]:
+        # Scan the rarest word's matches; check the others against each product's terms
+        matches = {word: self._matching_terms(word) for word in words}
+        driver = min(words, key=lambda word: sum(len(self._postings[term]) for term in matches[word]))
+        others = [word for word in words if word != driver]
+
+        results, seen = [], set()
+        for key in self._ranked(matches[driver]):
+            product_id = key[2]
+            if product_id in seen:
+                continue
+            seen.add(product_id)
+            terms = self._products[product_id][1]
+            if all(any(term.startswith(word) for term in terms) for word in others):
+                results.append(key)
+                if len(results) == limit:
+                    break
+        return results
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[Tuple[str, str]]:
+        """Up to `limit` (product id, name) pairs whose name or tags have words starting with prefix"""
+        words = list(dict.fromkeys(normalize(prefix).split()))
+        limit = max(1, min(limit, SUGGEST_MAX_LIMIT))
+        if not words:
+            return []
+
+        if len(words) == 1 and len(words[0]) <= SHORT_PREFIX_LENGTH:
+            keys = self._short.get(words[0])
+            if keys is None:
+                keys = self._short[words[0]] = self._search(words, SUGGEST_MAX_LIMIT)
+            keys = keys[:limit]
+        else:
+            keys = self._search(words, limit)
+
+        metrics.incr("suggest.queries")
+        return [(product_id, name) for _, name, product_id in keys]
+
+    # Updates
+
+    def _short_prefixes(self, terms: Iterable[str]) -> Set[str]:
+        return {term[:length] for term in terms for length in range(1, SHORT_PREFIX_LENGTH + 1) if len(term) >= length}
+
+    def _remove(self, product_id: str) -> None:
+        entry = self._products.pop(product_id, None)
+        if entry is None:
+            return
+        key, terms = entry
+        for term in terms:
+            postings = self._postings[term]
+            index = bisect_left(postings, key)
+            if index < len(postings) and postings[index] == key:
+                del postings[index]
+            if not postings:
+                del self._postings[term]
+                index = bisect_left(self._terms, term)
+                if index < len(self._terms) and self._terms[index] == term:
+                    del self._terms[index]
+        # Cached lists holding the product are recomputed on next use
+        for prefix in self._short_prefixes(terms):
+            cached = self._short.get(prefix)
+            if cached is not None and key in cached:
+                del self._short[prefix]
+
+    def _add(self, product_id: str, name: str, terms: Set[str]) -> None:
+        key = (-self._popularity.get(product_id, 0), name, product_id)
+        self._products[product_id] = (key, terms)
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = []
+                insort(self._terms, term)
+            insort(postings, key)
+        # Keep cached short-prefix lists exact: the product may now rank among their top
+        for prefix in self._short_prefixes(terms):
+            cached = self._short.get(prefix)
+            if cached is not None:
+                insort(cached, key)
+                del cached[SUGGEST_MAX_LIMIT:]
+
+    def upsert(self, product: dict) -> None:
+        """Index an available product, or drop it when unavailable"""
+        product_id = product["id"]
+        self._remove(product_id)
+        if product.get("is_available"):
+            self._add(product_id, product["name"], product_terms(product["name"], product.get("tags")))
+        updated_at = product.get("updated_at")
+        if updated_at and (self._last_updated_at is None or updated_at > self._last_updated_at):
+            self._last_updated_at = updated_at
+
+    async def apply_change(self, db, product_id: str) -> None:
+        """PRODUCT_CHANGED handler"""
+        if self._building:
+            self._pending.add(product_id)
+            return
+        product = await db.products.find_one({"id": product_id}, PRODUCT_PROJECTION)
+        if product is not None:
+            self.upsert(product)
+
+    # Loading
+
+    async def _load_popularity(self, db) -> Dict[str, int]:
+        rows = await db.wishlists.aggregate([
+            {"$group": {"_id": "$product_id", "count": {"$sum": 1}}}
+        ]).to_list(length=None)
+        return {row["_id"]: row["count"] for row in rows}
+
+    async def build(self, db) -> None:
+        """Rebuild from the products collection and swap in atomically"""
+        self._building = True
+        try:
+            popularity = await self._load_popularity(db)
+            postings: Dict[str, List[RankKey]] = {}
+            products: Dict[str, Tuple[RankKey, Set[str]]] = {}
+            last_updated_at = None
+
+            cursor = db.products.find({}, PRODUCT_PROJECTION).batch_size(BUILD_BATCH_SIZE)
+            async for product in cursor:
+                # Unavailable products still advance the refresh watermark
+                updated_at = product.get("updated_at")
+                if updated_at and (last_updated_at is None or updated_at > last_updated_at):
+                    last_updated_at = updated_at
+                _collect(product, popularity, postings, products)
+
+            # Sorting the postings of a large catalog takes a while; let requests run meanwhile
+            for count, term_postings in enumerate(postings.values(), 1):
+                term_postings.sort()
+                if count % SORT_CHUNK == 0:
+                    await asyncio.sleep(0)
+
+            self._swap(postings, products, popularity)
+            self._last_updated_at = last_updated_at
+        finally:
+            self._building = False
+
+        # Apply changes that arrived while building
+        pending, self._pending = self._pending, set()
+        for product_id in pending:
+            await self.apply_change(db, product_id)
+
+    def load(self, products: Iterable[dict], popularity: Optional[Dict[str, int]] = None) -> None:
+        """Replace the index contents with the given product documents"""
+        popularity = popularity or {}
+        postings: Dict[str, List[RankKey]] = {}
+        entries: Dict[str, Tuple[RankKey, Set[str]]] = {}
+        for product in products:
+            _collect(product, popularity, postings, entries)
+        for term_postings in postings.values():
+            term_postings.sort()
+        self._swap(postings, entries, popularity)
+
+    def _swap(self, postings, products, popularity) -> None:
+        self._terms = sorted(postings)
+        self._postings = postings
+        self._products = products
+        self._popularity = popularity
+        self._short = {}
+        self.ready = True
+
+    async def refresh(self, db) -> None:
+        """Pick up products written by other workers since the last seen updated_at"""
+        if not self.ready or self._building:
+            return
+        query = {"updated_at": {"$gt": self._last_updated_at}} if self._last_updated_at else {}
+        async for product in db.products.find(query, PRODUCT_PROJECTION).sort("updated_at", 1):
+            self.upsert(product)
+
+    async def run(self, db) -> None:
+        """Build, then keep the index fresh (run as a background task)"""
+        loop = asyncio.get_running_loop()
+        while not self.ready:
+            try:
+                await self.build(db)
+            except Exception as e:
+                print(f"Suggest index build failed: {str(e)}")
+                await asyncio.sleep(SUGGEST_REFRESH_SECONDS)
+
+        next_rebuild = loop.time() + SUGGEST_REBUILD_SECONDS
+        while True:
+            await asyncio.sleep(SUGGEST_REFRESH_SECONDS)
+            try:
+                if loop.time() >= next_rebuild:
+                    await self.build(db)
+                    next_rebuild = loop.time() + SUGGEST_REBUILD_SECONDS
+                else:
+                    await self.refresh(db)
+            except Exception as e:
+                print(f"Suggest index refresh failed: {str(e)}")
+
+    def stats(self) -> dict:
+        return {
+            "ready": self.ready,
+            "products": len(self._products),
+            "terms": len(self._terms),
+            "cached_prefixes": len(self._short),
+        }
+
+
+# Global typeahead index
+suggest_index = SuggestIndex()
@@ -0,0 +1,337 @@
+"""
+Trending Products
+Exponentially decayed popularity from product views, wishlist adds and orders, with a
+maintained top-K per category for trending_products
+
+- Forward decay: an event of weight w at time t adds w * exp(lambda * (t - L)) to the
+  product's score, where L is a landmark. Every score shrinks by the same factor as time
+  passes, so rankings only change when events arrive and the per-category top-K lists stay
+  valid without rescoring; scores are rebased when the exponent grows too large
+- Scores live in NumPy arrays indexed by interned product codes; each category (and the
+  catalog as a whole) keeps a lazy min-heap of its TRENDING_TOP_K best products
+- Every TRENDING_FLUSH_SECONDS this worker's new score mass is added to the trending_scores
+  collection (a pipeline update rebases stored scores to the flushing worker's landmark, so
+  workers' contributions add up); every TRENDING_RELOAD_SECONDS the merged scores are reloaded
+"""
+
+import asyncio
+import heapq
+import math
+import os
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from pymongo import UpdateOne
+
+from packages.utils.metrics import metrics
+
+TRENDING_HALF_LIFE_HOURS = float(os.environ.get("TRENDING_HALF_LIFE_HOURS", "6"))
+TRENDING_TOP_K = int(os.environ.get("TRENDING_TOP_K", "100"))
+TRENDING_FLUSH_SECONDS = float(os.environ.get("TRENDING_FLUSH_SECONDS", "10"))
+TRENDING_RELOAD_SECONDS = float(os.environ.get("TRENDING_RELOAD_SECONDS", "60"))
+
+# Event weights
+VIEW_WEIGHT = 1.0
+WISHLIST_WEIGHT = 5.0
+ORDER_WEIGHT = 10.0
+
+# Rebase once landmark factors reach e^50 (about 12 days at a 6 hour half-life)
+MAX_EXPONENT = 50.0
+# Reloaded scores that decayed below this (relative to now) are dropped
+MIN_SCORE = 1e-3
+INITIAL_CAPACITY = 1024
+
+# Heap key for the whole catalog
+ALL_CATEGORIES = -1
+
+
+class TrendingEngine:
+    def __init__(
+        self,
+        half_life_hours: float = TRENDING_HALF_LIFE_HOURS,
+        top_k: int = TRENDING_TOP_K,
+        landmark: Optional[float] = None
+    ):
+        self.decay = math.log(2) / (half_life_hours * 3600)
+        self.top_k = top_k
+        self.ready = False
+        self._landmark = time.time() if landmark is None else landmark
+        self._reset()
+        self._flushing = False
+        metrics.register("trending", self.stats)
+
+    def _reset(self) -> None:
+        self._size = 0
+        self._ids: List[str] = []
+        self._codes: Dict[str, int] = {}
+        self._category_codes: Dict[str, int] = {}
+        self._category_ids: List[str] = []
+        self._scores = np.zeros(INITIAL_CAPACITY, np.float64)
+        # Score mass added since the last flush (relative to the same landmark)
+        self._pending = np.zeros(INITIAL_CAPACITY, np.float64)
+        self._categories = np.full(INITIAL_CAPACITY, ALL_CATEGORIES, np.int32)
+        self._dirty: set = set()
+        # Per category: min-heap of (score, code), possibly with stale entries, and the
+        # authoritative member -> score map
+        self._heaps: Dict[int, List[Tuple[float, int]]] = {}
+        self._members: Dict[int, Dict[int, float]] = {}
+
+    # Codes
+
+    def _code(self, product_id: str, category_id: Optional[str]) -> int:
+        code = self._codes.get(product_id)
+        if code is None:
+            if self._size == len(self._scores):
+                self._grow()
+            code = self._codes[product_id] = self._size
+            self._size += 1
+            self._ids.append(product_id)
+        if category_id is not None and self._categories[code] == ALL_CATEGORIES:
+            category = self._category_codes.get(category_id)
+            if category is None:
+                category = self._category_codes[category_id] = len(self._category_ids)
+                self._category_ids.append(category_id)
+            self._categories[code] = category
+        return code
+
+    def _grow(self) -> None:
+        capacity = len(self._scores) * 2
+        for name, fill in (("_scores", 0), ("_pending", 0), ("_categories", ALL_CATEGORIES)):
+            column = getattr(self, name)
+            grown = np.full(capacity, fill, column.dtype)
+            grown[: self._size] = column[: self._size]
+            setattr(self, name, grown)
+
+    # Top-K maintenance
+
+    def _offer(self, category: int, code: int, score: float) -> None:
+        """Record that `code` now has `score` (scores only grow between rebuilds)"""
+        members = self._members.setdefault(category, {})
+        heap = self._heaps.setdefault(category, [])
+        if code in members:
+            members[code] = score
+            heapq.heappush(heap, (score, code))
+            if len(heap) > 4 * self.top_k:
+                # Drop the stale entries left behind by score increases
+                heap[:] = [(value, member) for member, value in members.items()]
+                heapq.heapify(heap)
+            return
+        if len(members) < self.top_k:
+            members[code] = score
+            heapq.heappush(heap, (score, code))
+            return
+        while members.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+        if score > heap[0][0]:
+            _, evicted = heapq.heappop(heap)
+            del members[evicted]
+            members[code] = score
+            heapq.heappush(heap, (score, code))
+
+    def _fill_top(self, category: int, rows: np.ndarray) -> None:
+        scores = self._scores
+        if len(rows) > self.top_k:
+            rows = rows[np.argpartition(scores[rows], -self.top_k)[-self.top_k:]]
+        members = {code: float(scores[code]) for code in rows.tolist() if scores[code] > 0}
+        heap = [(value, code) for code, value in members.items()]
+        heapq.heapify(heap)
+        self._members[category], self._heaps[category] = members, heap
+
+    def _rebuild_top(self) -> None:
+        """Recompute every category's top-K from the score arrays"""
+        self._heaps, self._members = {}, {}
+        size = self._size
+        self._fill_top(ALL_CATEGORIES, np.arange(size))
+        categories = self._categories[:size]
+        order = np.argsort(categories, kind="stable")
+        bounds = np.flatnonzero(np.diff(categories[order])) + 1
+        for rows in np.split(order, bounds):
+            if len(rows) and categories[rows[0]] != ALL_CATEGORIES:
+                self._fill_top(int(categories[rows[0]]), rows)
+
+    # Events
+
+    def record(self, product_id: str, category_id: Optional[str], weight: float, at: Optional[float] = None) -> None:
+        """Add an event of `weight` for a product (at: unix time, defaults to now)"""
+        at = time.time() if at is None else at
+        exponent = self.decay * (at - self._landmark)
+        if exponent > MAX_EXPONENT:
+            self._rebase(at)
+            exponent = 0.0
+        value = weight * math.exp(exponent)
+
+        code = self._code(product_id, category_id)
+        self._scores[code] += value
+        self._pending[code] += value
+        self._dirty.add(code)
+        score = float(self._scores[code])
+        self._offer(ALL_CATEGORIES, code, score)
+        category = int(self._categories[code])
+        if category != ALL_CATEGORIES:
+            self._offer(category, code, score)
+
+    def _rebase(self, landmark: float) -> None:
+        factor = math.exp(-self.decay * (landmark - self._landmark))
+        self._scores[: self._size] *= factor
+        self._pending[: self._size] *= factor
+        self._landmark = landmark
+        self._rebuild_top()
+
+    def _categories_known(self, product_ids: Iterable[str]) -> bool:
+        return all(
+            product_id in self._codes and self._categories[self._codes[product_id]] != ALL_CATEGORIES
+            for product_id in product_ids
+        )
+
+    async def _product_categories(self, db, product_ids: List[str]) -> Dict[str, Optional[str]]:
+        if self._categories_known(product_ids):
+            return {product_id: None for product_id in product_ids}
+        products = await db.products.find(
+            {"id": {"$in": product_ids}}, {"id": 1, "category_id": 1, "_id": 0}
+        ).to_list(length=None)
+        return {product["id"]: product.get("category_id") for product in products}
+
+    async def on_product_viewed(self, db, product_id: str, category_id: Optional[str]) -> None:
+        """PRODUCT_VIEWED handler"""
+        self.record(product_id, category_id, VIEW_WEIGHT)
+
+    async def on_wishlist_added(self, db, user_id: str, product_ids: List[str]) -> None:
+        """WISHLIST_ADDED handler"""
+        for product_id, category_id in (await self._product_categories(db, product_ids)).items():
+            self.record(product_id, category_id, WISHLIST_WEIGHT)
+
+    async def on_order_placed(self, db, order: dict) -> None:
+        """ORDER_PLACED handler; each item counts ORDER_WEIGHT per unit"""
+        quantities: Dict[str, int] = {}
+        for item in order.get("items", []):
+            product_id = item["product_service_id"]
+            quantities[product_id] = quantities.get(product_id, 0) + item.get("quantity", 1)
+        categories = await self._product_categories(db, list(quantities))
+        for product_id, quantity in quantities.items():
+            if product_id in categories:
+                self.record(product_id, categories[product_id], ORDER_WEIGHT * quantity)
+
+    # Queries
+
+    def top(self, category_id: Optional[str], limit: int) -> List[Tuple[str, float]]:
+        """Up to `limit` (product id, current score) pairs, hottest first"""
+        if category_id is None:
+            category = ALL_CATEGORIES
+        else:
+            category = self._category_codes.get(category_id)
+            if category is None:
+                return []
+        members = self._members.get(category, {})
+        now_factor = math.exp(-self.decay * (time.time() - self._landmark))
+        ranked = heapq.nlargest(limit, members.items(), key=lambda member: (member[1], -member[0]))
+        metrics.incr("trending.queries")
+        return [(self._ids[code], score * now_factor) for code, score in ranked]
+
+    # Persistence
+
+    async def flush(self, db) -> None:
+        """Add this worker's score mass since the last flush to trending_scores"""
+        if not self._dirty or self._flushing:
+            return
+        self._flushing = True
+        dirty, self._dirty = self._dirty, set()
+        codes = np.fromiter(dirty, np.int64, len(dirty))
+        deltas = self._pending[codes].copy()
+        self._pending[codes] = 0
+        landmark = self._landmark
+        now = datetime.now(timezone.utc)
+        try:
+            operations = []
+            for code, delta in zip(codes.tolist(), deltas.tolist()):
+                category = int(self._categories[code])
+                operations.append(UpdateOne(
+                    {"product_id": self._ids[code]},
+                    [{"$set": {
+                        # Rebase the stored score to this landmark, then add
+                        "score": {"$add": [
+                            {"$multiply": [
+                                {"$ifNull": ["$score", 0]},
+                                {"$exp": {"$multiply": [
+                                    -self.decay,
+                                    {"$subtract": [landmark, {"$ifNull": ["$landmark", landmark]}]}
+                                ]}}
+                            ]},
+                            delta
+                        ]},
+                        "landmark": landmark,
+                        "category_id": self._category_ids[category] if category != ALL_CATEGORIES else None,
+                        "updated_at": now
+                    }}],
+                    upsert=True
+                ))
+            await db.trending_scores.bulk_write(operations, ordered=False)
+            metrics.incr("trending.flushed", len(operations))
+        except Exception:
+            # Keep the mass for the next flush (rebased if the landmark moved meanwhile)
+            self._pending[codes] += deltas * math.exp(-self.decay * (self._landmark - landmark))
+            self._dirty.update(codes.tolist())
+            raise
+        finally:
+            self._flushing = False
+
+    async def load(self, db) -> None:
+        """Replace scores with the merged totals from trending_scores plus unflushed local mass"""
+        documents = await db.trending_scores.find(
+            {}, {"_id": 0, "product_id": 1, "category_id": 1, "score": 1, "landmark": 1}
+        ).to_list(length=None)
+
+        # No await from here on: events recorded during the read are part of this snapshot
+        landmark = time.time()
+        pending = {
+            self._ids[code]: (
+                float(self._pending[code]),
+                self._category_ids[self._categories[code]] if self._categories[code] != ALL_CATEGORIES else None
+            )
+            for code in self._dirty
+        }
+        previous_landmark = self._landmark
+        self._reset()
+        self._landmark = landmark
+        for document in documents:
+            score = document["score"] * math.exp(-self.decay * (landmark - document["landmark"]))
+            if score < MIN_SCORE:
+                continue
+            code = self._code(document["product_id"], document.get("category_id"))
+            self._scores[code] = score
+        # Events recorded after the last flush are kept (and still to be flushed)
+        rebase = math.exp(-self.decay * (landmark - previous_landmark))
+        for product_id, (value, category_id) in pending.items():
+            code = self._code(product_id, category_id)
+            self._scores[code] += value * rebase
+            self._pending[code] = value * rebase
+            self._dirty.add(code)
+        self._rebuild_top()
+        self.ready = True
+
+    async def run(self, db) -> None:
+        """Load, then flush and reload periodically (run as a background task)"""
+        loop = asyncio.get_running_loop()
+        next_reload = loop.time()
+        while True:
+            try:
+                await self.flush(db)
+                if loop.time() >= next_reload:
+                    await self.load(db)
+                    next_reload = loop.time() + TRENDING_RELOAD_SECONDS
+            except Exception as e:
+                print(f"Trending flush failed: {str(e)}")
+            await asyncio.sleep(TRENDING_FLUSH_SECONDS)
+
+    def stats(self) -> dict:
+        return {
+            "ready": self.ready,
+            "products": self._size,
+            "categories": len(self._category_ids),
+            "unflushed": len(self._dirty),
+        }
+
+
+# Global trending engine
+trending = TrendingEngine()
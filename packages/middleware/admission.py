@@ -0,0 +1,209 @@
+"""
+Admission Control Middleware
+Adaptive concurrency limits in front of the GraphQL endpoint, so overload turns into fast
+503s instead of unbounded queueing for Mongo connections and bcrypt
+
+- Requests are classified by their root fields into two pools: expensive (password hashing,
+  bulk mutations) and cheap (everything else), each with its own limit and queue
+- An expensive request takes one slot per expensive root field, so aliasing accountLogin
+  N times costs N slots. POST bodies that don't parse to a single operation (including
+  JSON array batches) go to the expensive pool
+- Limits adapt with AIMD: +1 per limit's worth of requests finishing under the pool's
+  target latency, x ADMISSION_DECREASE when a request is slower
+- A request that can't start within the pool's queue deadline gets 503 with Retry-After
+"""
+
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from typing import Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from packages.utils.graphql_ops import read_graphql_request
+from packages.utils.metrics import metrics
+
+ADMISSION_PATH = os.environ.get("ADMISSION_PATH", "/graphql")
+ADMISSION_DECREASE = float(os.environ.get("ADMISSION_DECREASE", "0.9"))
+ADMISSION_RETRY_AFTER = int(os.environ.get("ADMISSION_RETRY_AFTER", "1"))
+
+ADMISSION_CHEAP_LIMIT = int(os.environ.get("ADMISSION_CHEAP_LIMIT", "64"))
+ADMISSION_CHEAP_MAX_LIMIT = int(os.environ.get("ADMISSION_CHEAP_MAX_LIMIT", "256"))
+ADMISSION_CHEAP_TARGET_MS = float(os.environ.get("ADMISSION_CHEAP_TARGET_MS", "250"))
+ADMISSION_CHEAP_QUEUE_MS = float(os.environ.get("ADMISSION_CHEAP_QUEUE_MS", "500"))
+
+ADMISSION_EXPENSIVE_LIMIT = int(os.environ.get("ADMISSION_EXPENSIVE_LIMIT", "8"))
+ADMISSION_EXPENSIVE_MAX_LIMIT = int(os.environ.get("ADMISSION_EXPENSIVE_MAX_LIMIT", "32"))
+ADMISSION_EXPENSIVE_TARGET_MS = float(os.environ.get("ADMISSION_EXPENSIVE_TARGET_MS", "1000"))
+ADMISSION_EXPENSIVE_QUEUE_MS = float(os.environ.get("ADMISSION_EXPENSIVE_QUEUE_MS", "2000"))
+
+# Root fields that hash passwords or write in bulk; *_many mutations are always expensive
+EXPENSIVE_OPERATIONS = {"account_login", "account_register"}
+
+
+def expensive_weight(fields) -> int:
+    """Expensive root fields of a request, counting each alias"""
+    return sum(1 for field in fields if field in EXPENSIVE_OPERATIONS or field.endswith("_many"))
+
+
+class AdaptiveLimiter:
+    """Concurrency limit with a bounded FIFO wait queue and AIMD limit adjustment"""
+
+    def __init__(
+        self,
+        name: str,
+        initial_limit: int,
+        max_limit: int,
+        target_latency: float,
+        queue_timeout: float,
+        min_limit: int = 1,
+        max_queue: Optional[int] = None
+    ):
+        self.name = name
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency = target_latency
+        self.queue_timeout = queue_timeout
+        self.max_queue = max_queue if max_queue is not None else max_limit * 4
+        self.inflight = 0
+        self._waiters: deque = deque()
+        self.admitted = 0
+        self.queued = 0
+        self.shed = 0
+        metrics.register(f"admission.{name}", self.stats)
+
+    def _fits(self, weight: int) -> bool:
+        # A request heavier than the whole limit still runs, alone
+        return self.inflight == 0 or self.inflight + weight <= int(self.limit)
+
+    async def acquire(self, weight: int = 1) -> bool:
+        """Wait for `weight` slots; False when the request should be shed"""
+        if self._fits(weight) and not self._waiters:
+            self.inflight += weight
+            self.admitted += 1
+            return True
+
+        if len(self._waiters) >= self.max_queue:
+            self.shed += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append((waiter, weight))
+        self.queued += 1
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done() and not waiter.cancelled():
+                # The slots were handed over just as the wait ended
+                self.release(0, succeeded=False, weight=weight)
+            else:
+                try:
+                    self._waiters.remove((waiter, weight))
+                except ValueError:
+                    pass
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            self.shed += 1
+            return False
+        self.admitted += 1
+        return True
+
+    def release(self, latency: float, succeeded: bool = True, weight: int = 1) -> None:
+        self.inflight -= weight
+        if succeeded:
+            if latency <= self.target_latency:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            else:
+                self.limit = max(self.min_limit, self.limit * ADMISSION_DECREASE)
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self._fits(self._waiters[0][1]):
+            waiter, weight = self._waiters.popleft()
+            if not waiter.done():
+                self.inflight += weight
+                waiter.set_result(True)
+
+    def stats(self) -> dict:
+        return {
+            "limit": round(self.limit, 2),
+            "inflight": self.inflight,
+            "queue_depth": len(self._waiters),
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "shed": self.shed,
+        }
+
+
+class AdmissionControlMiddleware:
+    """Pure ASGI middleware applying AdaptiveLimiter pools to GraphQL requests"""
+
+    def __init__(self, app: ASGIApp, path: str = ADMISSION_PATH):
+        self.app = app
+        self.path = path
+        self.cheap = AdaptiveLimiter(
+            "cheap",
+            ADMISSION_CHEAP_LIMIT,
+            ADMISSION_CHEAP_MAX_LIMIT,
+            ADMISSION_CHEAP_TARGET_MS / 1000,
+            ADMISSION_CHEAP_QUEUE_MS / 1000
+        )
+        self.expensive = AdaptiveLimiter(
+            "expensive",
+            ADMISSION_EXPENSIVE_LIMIT,
+            ADMISSION_EXPENSIVE_MAX_LIMIT,
+            ADMISSION_EXPENSIVE_TARGET_MS / 1000,
+            ADMISSION_EXPENSIVE_QUEUE_MS / 1000
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "OPTIONS" or not scope["path"].startswith(self.path):
+            await self.app(scope, receive, send)
+            return
+
+        limiter, weight = self.cheap, 1
+        if scope["method"] == "POST":
+            request_info, receive = await read_graphql_request(scope, receive)
+            if not request_info.fields:
+                # Batches and bodies that don't parse can't be classified; assume the worst
+                limiter = self.expensive
+            elif expensive_weight(request_info.fields):
+                limiter, weight = self.expensive, expensive_weight(request_info.fields)
+
+        if not await limiter.acquire(weight):
+            metrics.incr(f"admission.{limiter.name}.rejected")
+            await _overloaded(send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # Only completed requests say something about capacity
+            limiter.release(time.perf_counter() - start, succeeded=status < 500, weight=weight)
+
+
+async def _overloaded(send: Send) -> None:
+    body = json.dumps({"errors": [{"message": "Server is overloaded, please retry later"}]}).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": 503,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(ADMISSION_RETRY_AFTER).encode()),
+            (b"cache-control", b"no-store"),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
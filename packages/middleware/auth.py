@@ -1,16 +1,101 @@
 from passlib.context import CryptContext
 from jose import JWTError, jwt
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Optional, Tuple
+import asyncio
+import hashlib
+import hmac
 import os
+import secrets
+import time
+import uuid
+
+from ..utils.metrics import metrics
 
 # Authentication middleware
 SECRET_KEY = os.environ.get("SECRET_KEY", "your-secret-key-here-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.environ.get("REFRESH_TOKEN_EXPIRE_DAYS", "30"))
+
+"""
+Password hashing policy
+- BCRYPT_ROUNDS sets the cost of new hashes (defaults per APP_ENV below)
+- Stored hashes with a cost outside [BCRYPT_MIN_ROUNDS, BCRYPT_MAX_ROUNDS] are rehashed
+  on the next successful login; both default to BCRYPT_ROUNDS
+- BCRYPT_TARGET_MS, when set, calibrates BCRYPT_ROUNDS at startup so one verify takes
+  about that long on the current hardware (never below BCRYPT_MIN_ROUNDS). The calibrated
+  cost only applies to new hashes; unless BCRYPT_MIN/MAX_ROUNDS are set, stored costs within
+  BCRYPT_CALIBRATION_SLACK of it are accepted, so workers whose timing lands one round apart
+  don't rehash each other's hashes back and forth
+"""
+APP_ENV = os.environ.get("APP_ENV", "production")
+BCRYPT_ROUNDS_BY_ENV = {"test": 4, "development": 10, "staging": 12, "production": 12}
+BCRYPT_ROUNDS = int(os.environ.get("BCRYPT_ROUNDS", BCRYPT_ROUNDS_BY_ENV.get(APP_ENV, 12)))
+BCRYPT_MIN_ROUNDS = os.environ.get("BCRYPT_MIN_ROUNDS")
+BCRYPT_MAX_ROUNDS = os.environ.get("BCRYPT_MAX_ROUNDS")
+BCRYPT_TARGET_MS = float(os.environ.get("BCRYPT_TARGET_MS", "0"))
+BCRYPT_CALIBRATION_SLACK = int(os.environ.get("BCRYPT_CALIBRATION_SLACK", "1"))
+# bcrypt accepts costs 4-31
+BCRYPT_LOWEST_ROUNDS = 4
+BCRYPT_HIGHEST_ROUNDS = 31
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Keeps references to fire-and-forget rehash tasks until they finish
+_background_tasks = set()
+
+
+def configure_password_policy(rounds: int, slack: int = 0):
+    """Apply the hashing cost and the window of accepted stored costs (rounds +- slack by default)"""
+    min_rounds = int(BCRYPT_MIN_ROUNDS) if BCRYPT_MIN_ROUNDS else rounds - slack
+    max_rounds = int(BCRYPT_MAX_ROUNDS) if BCRYPT_MAX_ROUNDS else rounds + slack
+    rounds = max(BCRYPT_LOWEST_ROUNDS, min(rounds, BCRYPT_HIGHEST_ROUNDS))
+    pwd_context.update(
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=max(BCRYPT_LOWEST_ROUNDS, min(min_rounds, rounds)),
+        bcrypt__max_rounds=max(max_rounds, rounds)
+    )
+    metrics.set("auth.bcrypt_rounds", rounds)
+    return rounds
+
+
+def calibrate_bcrypt_rounds(target_ms: float) -> int:
+    """
+    Pick the highest cost whose verify time stays within target_ms
+    Each extra round doubles the work, so one timed hash at a low cost is extrapolated
+    """
+    probe_rounds = 8
+    sample = pwd_context.hash("calibration", rounds=probe_rounds)
+    start = time.perf_counter()
+    pwd_context.verify("calibration", sample)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    rounds = probe_rounds
+    while rounds < BCRYPT_HIGHEST_ROUNDS and elapsed_ms * 2 <= target_ms:
+        elapsed_ms *= 2
+        rounds += 1
+    while rounds > probe_rounds and elapsed_ms > target_ms:
+        elapsed_ms /= 2
+        rounds -= 1
+
+    if BCRYPT_MIN_ROUNDS:
+        rounds = max(rounds, int(BCRYPT_MIN_ROUNDS))
+    return rounds
+
+
+def apply_password_policy():
+    """Configure hashing at startup, calibrating first when BCRYPT_TARGET_MS is set"""
+    rounds, slack = BCRYPT_ROUNDS, 0
+    if BCRYPT_TARGET_MS > 0:
+        rounds, slack = calibrate_bcrypt_rounds(BCRYPT_TARGET_MS), BCRYPT_CALIBRATION_SLACK
+    rounds = configure_password_policy(rounds, slack)
+    print(f"Password hashing: bcrypt with {rounds} rounds ({APP_ENV})")
+    return rounds
+
+
+configure_password_policy(BCRYPT_ROUNDS)
+
 class AuthMiddleware:
     @staticmethod
     def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -20,6 +105,41 @@ class AuthMiddleware:
     def get_password_hash(password: str) -> str:
         return pwd_context.hash(password)
 
+    @staticmethod
+    def password_needs_rehash(hashed_password: str) -> bool:
+        """True when a stored hash's cost is outside the current policy"""
+        return pwd_context.needs_update(hashed_password)
+
+    @staticmethod
+    async def rehash_password(db, user_id: str, password: str, old_hash: str) -> bool:
+        """
+        Store a hash at the current cost
+        Hashing runs in a worker thread and only replaces the hash that was verified,
+        so a concurrent password change is never overwritten
+        """
+        new_hash = await asyncio.to_thread(pwd_context.hash, password)
+        result = await db.users.update_one(
+            {"id": user_id, "password_hash": old_hash},
+            {"$set": {"password_hash": new_hash, "updated_at": datetime.now(timezone.utc)}}
+        )
+        if result.modified_count:
+            metrics.incr("auth.password_rehashed")
+        return result.modified_count == 1
+
+    @staticmethod
+    def schedule_rehash(db, user_id: str, password: str, old_hash: str):
+        """Rehash in the background so the login response isn't delayed"""
+        async def run():
+            try:
+                await AuthMiddleware.rehash_password(db, user_id, password, old_hash)
+            except Exception as e:
+                metrics.incr("auth.password_rehash_failed")
+                print(f"Password rehash failed for user {user_id}: {str(e)}")
+
+        task = asyncio.create_task(run())
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+
     @staticmethod
     def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
         to_encode = data.copy()
@@ -47,6 +167,69 @@ class AuthMiddleware:
         except JWTError:
             return None
 
+    @staticmethod
+    def hash_refresh_token(refresh_token: str) -> str:
+        """Refresh tokens are stored as an HMAC so a database leak cannot replay them"""
+        return hmac.new(SECRET_KEY.encode(), refresh_token.encode(), hashlib.sha256).hexdigest()
+
+    @staticmethod
+    async def create_refresh_token(db, user_id: str, family_id: Optional[str] = None) -> str:
+        """Issue a new opaque refresh token, starting a new family unless rotating an existing one"""
+        from ..types.models import RefreshToken
+
+        refresh_token = secrets.token_urlsafe(48)
+        record = RefreshToken(
+            token_hash=AuthMiddleware.hash_refresh_token(refresh_token),
+            user_id=user_id,
+            family_id=family_id or str(uuid.uuid4()),
+            expires_at=datetime.now(timezone.utc) + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+        )
+        await db.refresh_tokens.insert_one(record.dict())
+        return refresh_token
+
+    @staticmethod
+    async def rotate_refresh_token(db, refresh_token: str) -> Optional[Tuple[str, str]]:
+        """
+        Exchange a refresh token for a new one, returning (user_id, new refresh token)
+        Presenting an already rotated token revokes its whole family, since it has been replayed
+        """
+        token_hash = AuthMiddleware.hash_refresh_token(refresh_token)
+        current_time = datetime.now(timezone.utc)
+
+        # Consume the token atomically so concurrent refreshes cannot both succeed
+        record = await db.refresh_tokens.find_one_and_update(
+            {"token_hash": token_hash, "revoked_at": None, "expires_at": {"$gt": current_time}},
+            {"$set": {"revoked_at": current_time, "updated_at": current_time}}
+        )
+        if record is None:
+            reused = await db.refresh_tokens.find_one({"token_hash": token_hash}, {"family_id": 1})
+            if reused:
+                await AuthMiddleware.revoke_refresh_token_family(db, reused["family_id"])
+            return None
+
+        new_refresh_token = await AuthMiddleware.create_refresh_token(db, record["user_id"], record["family_id"])
+        return record["user_id"], new_refresh_token
+
+    @staticmethod
+    async def revoke_refresh_token(db, refresh_token: str, user_id: str) -> bool:
+        """Revoke a refresh token and every token rotated from the same login"""
+        record = await db.refresh_tokens.find_one(
+            {"token_hash": AuthMiddleware.hash_refresh_token(refresh_token), "user_id": user_id},
+            {"family_id": 1}
+        )
+        if not record:
+            return False
+        await AuthMiddleware.revoke_refresh_token_family(db, record["family_id"])
+        return True
+
+    @staticmethod
+    async def revoke_refresh_token_family(db, family_id: str):
+        current_time = datetime.now(timezone.utc)
+        await db.refresh_tokens.update_many(
+            {"family_id": family_id, "revoked_at": None},
+            {"$set": {"revoked_at": current_time, "updated_at": current_time}}
+        )
+
     @staticmethod
     async def is_token_blacklisted(db, token: str) -> bool:
         """Check if token is blacklisted"""
@@ -91,6 +274,12 @@ class AuthMiddleware:
                 },
                 upsert=True
             )
+
+            # Refresh tokens would otherwise mint new access tokens after the logout
+            await db.refresh_tokens.update_many(
+                {"user_id": user_id, "revoked_at": None},
+                {"$set": {"revoked_at": current_time, "updated_at": current_time}}
+            )
             return True
         except Exception:
             return False
@@ -115,9 +304,10 @@ class AuthMiddleware:
 
     @staticmethod
     async def cleanup_expired_tokens(db):
-        """Remove expired blacklisted tokens from database"""
+        """Remove expired blacklisted and refresh tokens from database"""
         current_time = datetime.now(timezone.utc)
         await db.blacklisted_tokens.delete_many({"expires_at": {"$lt": current_time}})
+        await db.refresh_tokens.delete_many({"expires_at": {"$lt": current_time}})
 
     @staticmethod
     async def get_current_user(db, token: str):
@@ -0,0 +1,256 @@
+"""
+Rate Limiting Middleware
+Per-operation request limits for the GraphQL endpoint, keyed by authenticated user or,
+for anonymous calls, by client IP
+
+- Limits are configured per root field in RATE_LIMITS, e.g.
+    RATE_LIMITS=account_login=10/60,product_list=300/60,default=600/60
+  (count/seconds; `default` applies to every other operation)
+- Every occurrence of a root field counts, so a request aliasing accountLogin N times is
+  charged N hits
+- Counting uses a sliding window approximated from two fixed windows
+  (previous count weighted by its overlap + current count); rejected requests are not counted
+- Counters live in-process by default; set RATE_LIMIT_REDIS_URL to share them between
+  workers
+- Responses carry X-RateLimit-Limit / -Remaining / -Reset; rejected requests get 429
+  with Retry-After
+"""
+
+import json
+import math
+import os
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from packages.middleware.auth import AuthMiddleware
+from packages.utils.cache import LRUCache
+from packages.utils.graphql_ops import read_graphql_request, to_snake_case
+from packages.utils.metrics import metrics
+from packages.utils.persisted_queries import OPERATIONS_BY_KEY
+
+DEFAULT_RATE_LIMITS = (
+    "account_login=10/60,"
+    "account_register=5/60,"
+    "account_token_refresh=30/60,"
+    "product_list=300/60,"
+    "default=600/60"
+)
+RATE_LIMITS = os.environ.get("RATE_LIMITS", DEFAULT_RATE_LIMITS)
+RATE_LIMIT_PATH = os.environ.get("RATE_LIMIT_PATH", "/graphql")
+# e.g. redis://localhost:6379/1 ; unset keeps counters in-process
+RATE_LIMIT_REDIS_URL = os.environ.get("RATE_LIMIT_REDIS_URL")
+# Token -> user id lookups, so JWTs aren't decoded on every request
+RATE_LIMIT_TOKEN_CACHE_SIZE = int(os.environ.get("RATE_LIMIT_TOKEN_CACHE_SIZE", "10000"))
+RATE_LIMIT_TOKEN_CACHE_TTL = 300
+
+
+def parse_rate_limits(spec: str) -> Dict[str, Tuple[int, int]]:
+    """Parse "operation=count/seconds,..." into {operation: (count, seconds)}"""
+    limits = {}
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        operation, _, rule = item.partition("=")
+        count, _, seconds = rule.partition("/")
+        try:
+            limits[operation.strip()] = (int(count), int(seconds or 60))
+        except ValueError:
+            raise ValueError(f"Invalid rate limit {item!r}, expected operation=count/seconds")
+    return limits
+
+
+class RateLimitBackend:
+    """Counter store interface; hit() records `cost` requests unless that would exceed the limit"""
+
+    async def hit(self, key: str, limit: int, window: int, cost: int = 1) -> Tuple[bool, int, float]:
+        """Returns (allowed, remaining, seconds until the current window resets)"""
+        raise NotImplementedError
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """Process-local sliding window counters: key -> [window index, previous count, current count, window]"""
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._counters: Dict[str, List[int]] = {}
+
+    async def hit(self, key: str, limit: int, window: int, cost: int = 1) -> Tuple[bool, int, float]:
+        now = time.time()
+        index = int(now // window)
+        counter = self._counters.get(key)
+        if counter is None:
+            if len(self._counters) >= self.max_keys:
+                self._sweep(now)
+            counter = self._counters[key] = [index, 0, 0, window]
+        elif counter[0] != index:
+            counter[1] = counter[2] if counter[0] == index - 1 else 0
+            counter[2] = 0
+            counter[0] = index
+
+        elapsed = now - index * window
+        estimate = counter[1] * (1 - elapsed / window) + counter[2] + cost
+        reset = window - elapsed
+        if estimate > limit:
+            return False, 0, reset
+        counter[2] += cost
+        return True, max(0, math.floor(limit - estimate)), reset
+
+    def _sweep(self, now: float) -> None:
+        """Drop counters that can no longer affect any window"""
+        stale = [key for key, counter in self._counters.items() if int(now // counter[3]) > counter[0] + 1]
+        for key in stale:
+            del self._counters[key]
+        if len(self._counters) >= self.max_keys:
+            # Still full: forget the oldest half (dicts keep insertion order)
+            for key in list(self._counters)[: self.max_keys // 2]:
+                del self._counters[key]
+
+
+# Same check as InMemoryRateLimitBackend, done atomically: count only when allowed
+# KEYS: previous window, current window; ARGV: previous weight, cost, limit, ttl
+_HIT_SCRIPT = """
+local estimate = tonumber(redis.call("GET", KEYS[1]) or "0") * tonumber(ARGV[1])
+    + tonumber(redis.call("GET", KEYS[2]) or "0") + tonumber(ARGV[2])
+if estimate > tonumber(ARGV[3]) then
+    return {0, tostring(estimate)}
+end
+redis.call("INCRBY", KEYS[2], ARGV[2])
+redis.call("EXPIRE", KEYS[2], ARGV[4])
+return {1, tostring(estimate)}
+"""
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """Counters shared by all workers; one round trip per hit"""
+
+    def __init__(self, url: str):
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise RuntimeError("RATE_LIMIT_REDIS_URL is set but the redis package is not installed")
+
+        self._redis = redis.from_url(url)
+        self._hit = self._redis.register_script(_HIT_SCRIPT)
+
+    async def hit(self, key: str, limit: int, window: int, cost: int = 1) -> Tuple[bool, int, float]:
+        now = time.time()
+        index = int(now // window)
+        elapsed = now - index * window
+        allowed, estimate = await self._hit(
+            keys=[f"ratelimit:{key}:{index - 1}", f"ratelimit:{key}:{index}"],
+            args=[1 - elapsed / window, cost, limit, window * 2]
+        )
+        reset = window - elapsed
+        if not allowed:
+            return False, 0, reset
+        return True, max(0, math.floor(limit - float(estimate))), reset
+
+
+class RateLimitMiddleware:
+    """Pure ASGI middleware enforcing RATE_LIMITS on GraphQL requests"""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        limits: Optional[str] = None,
+        backend: Optional[RateLimitBackend] = None,
+        path: str = RATE_LIMIT_PATH
+    ):
+        self.app = app
+        self.path = path
+        self.limits = parse_rate_limits(limits if limits is not None else RATE_LIMITS)
+        self.default = self.limits.pop("default", None)
+        if backend is None:
+            backend = RedisRateLimitBackend(RATE_LIMIT_REDIS_URL) if RATE_LIMIT_REDIS_URL else InMemoryRateLimitBackend()
+        self.backend = backend
+        self._users = LRUCache(RATE_LIMIT_TOKEN_CACHE_SIZE, ttl=RATE_LIMIT_TOKEN_CACHE_TTL)
+
+    def _identity(self, scope: Scope, token: Optional[str]) -> str:
+        if token:
+            user_id = self._users.get(token, None)
+            if user_id is None:
+                user_id = AuthMiddleware.verify_token(token) or ""
+                self._users.set(token, user_id)
+            if user_id:
+                return f"user:{user_id}"
+        client = scope.get("client")
+        return f"ip:{client[0] if client else 'unknown'}"
+
+    def _operations(self, scope: Scope, fields) -> Dict[str, int]:
+        """Operations of a request and how many times each occurs"""
+        if fields:
+            return Counter(fields)
+        # Persisted GET: /graphql/persisted/{name or sha256}
+        key = scope["path"].rsplit("/", 1)[-1]
+        operation = OPERATIONS_BY_KEY.get(key)
+        return {to_snake_case(operation.name): 1} if operation else {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "OPTIONS" or not scope["path"].startswith(self.path):
+            await self.app(scope, receive, send)
+            return
+
+        fields, token = (), None
+        if scope["method"] == "POST":
+            request_info, receive = await read_graphql_request(scope, receive)
+            fields, token = request_info.fields, request_info.token
+
+        identity = self._identity(scope, token)
+        tightest = None
+        for operation, cost in (self._operations(scope, fields) or {"default": 1}).items():
+            rule = self.limits.get(operation, self.default)
+            if rule is None:
+                continue
+            limit, window = rule
+            allowed, remaining, reset = await self.backend.hit(f"{identity}:{operation}", limit, window, cost)
+            if not allowed:
+                metrics.incr(f"rate_limit.limited.{operation}")
+                await _rate_limited(send, operation, limit, reset)
+                return
+            if tightest is None or remaining < tightest[1]:
+                tightest = (limit, remaining, reset)
+
+        if tightest is None:
+            await self.app(scope, receive, send)
+            return
+
+        limit, remaining, reset = tightest
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers["X-RateLimit-Limit"] = str(limit)
+                headers["X-RateLimit-Remaining"] = str(remaining)
+                headers["X-RateLimit-Reset"] = str(math.ceil(reset))
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+
+async def _rate_limited(send: Send, operation: str, limit: int, reset: float) -> None:
+    retry_after = str(max(1, math.ceil(reset)))
+    body = json.dumps({
+        "errors": [{
+            "message": f"Rate limit exceeded for {operation}, retry in {retry_after} seconds",
+            "extensions": {"code": "RATE_LIMITED"}
+        }]
+    }).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": 429,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", retry_after.encode()),
+            (b"x-ratelimit-limit", str(limit).encode()),
+            (b"x-ratelimit-remaining", b"0"),
+            (b"x-ratelimit-reset", retry_after.encode()),
+            (b"cache-control", b"no-store"),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
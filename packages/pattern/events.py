@@ -0,0 +1,47 @@
+"""
+In-process Event Bus
+Lets derived read models (caches, indexes) follow writes without the mutations knowing
+about each of them
+
+    events.subscribe(PRODUCT_CHANGED, handler)   # async def handler(db, product_id)
+    await events.publish(PRODUCT_CHANGED, db=db, product_id=product.id)
+
+Handlers run in subscription order; a failing handler is logged and never fails the write
+"""
+
+from collections import defaultdict
+from typing import Awaitable, Callable, Dict, List
+
+from packages.utils.metrics import metrics
+
+# A product was created or updated (kwargs: db, product_id)
+PRODUCT_CHANGED = "product.changed"
+# Products were added to / removed from a user's wishlist (kwargs: db, user_id, product_ids)
+WISHLIST_ADDED = "wishlist.added"
+WISHLIST_REMOVED = "wishlist.removed"
+# A product page was served (kwargs: db, product_id, category_id)
+PRODUCT_VIEWED = "product.viewed"
+# An order was placed (kwargs: db, order: the Order document)
+ORDER_PLACED = "order.placed"
+# An order's status changed (kwargs: db, order: the updated Order document, previous_status)
+ORDER_STATUS_CHANGED = "order.status_changed"
+
+
+class EventBus:
+    def __init__(self):
+        self._handlers: Dict[str, List[Callable[..., Awaitable[None]]]] = defaultdict(list)
+
+    def subscribe(self, event: str, handler: Callable[..., Awaitable[None]]) -> None:
+        self._handlers[event].append(handler)
+
+    async def publish(self, event: str, **payload) -> None:
+        for handler in self._handlers.get(event, []):
+            try:
+                await handler(**payload)
+            except Exception as e:
+                metrics.incr(f"events.{event}.failed")
+                print(f"Event handler {handler.__qualname__} failed for {event}: {str(e)}")
+
+
+# Global event bus
+events = EventBus()
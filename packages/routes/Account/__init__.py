@@ -1,4 +1,4 @@
 from ._mutation_ import *
 from ._query_ import *
 
-__all__ = ['AccountRegister', 'AccountLogin', 'AccountLogout', 'AccountUpdate', 'WishlistAdd', 'WishlistRemove', 'AccountList', 'AccountGet', 'WishlistGet']
\ No newline at end of file
+__all__ = ['AccountRegister', 'AccountLogin', 'AccountLogout', 'AccountTokenRefresh', 'AccountUpdate', 'WishlistAdd', 'WishlistRemove', 'WishlistAddMany', 'WishlistRemoveMany', 'AccountList', 'AccountGet', 'WishlistGet', 'WishlistConnection', 'AccountConnection', 'SellersNear']
\ No newline at end of file
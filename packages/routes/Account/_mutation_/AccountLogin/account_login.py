@@ -5,6 +5,7 @@ from datetime import timedelta
 from packages.types.inputs import UserLoginInput
 from packages.types.outputs import UserGraphQL, AuthResponse
 from packages.middleware.auth import AuthMiddleware
+from packages.utils.geo import geo_location
 
 @strawberry.type
 class AccountLogin:
@@ -28,12 +29,17 @@ class AccountLogin:
                 ),
                 message="Invalid credentials"
             )
+
+        # Migrate hashes whose cost is out of policy, off the request's critical path
+        if AuthMiddleware.password_needs_rehash(user_data["password_hash"]):
+            AuthMiddleware.schedule_rehash(db, user_data["id"], input.password, user_data["password_hash"])
         
         # Create token
         access_token_expires = timedelta(minutes=30)
         access_token = AuthMiddleware.create_access_token(
             data={"sub": user_data["id"]}, expires_delta=access_token_expires
         )
+        refresh_token = await AuthMiddleware.create_refresh_token(db, user_data["id"])
         
         return AuthResponse(
             token=access_token,
@@ -50,7 +56,9 @@ class AccountLogin:
                 business_name=user_data.get("business_name"),
                 business_address=user_data.get("business_address"),
                 business_description=user_data.get("business_description"),
+                business_location=geo_location(user_data.get("business_location")),
                 created_at=user_data["created_at"].isoformat()
             ),
-            message="Login successful"
+            message="Login successful",
+            refresh_token=refresh_token
         )
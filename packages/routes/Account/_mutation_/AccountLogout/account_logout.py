@@ -58,6 +58,10 @@ class AccountLogout:
                         message="Failed to logout. Invalid token format."
                     )
                 
+                # Revoke the refresh token too, so this device cannot mint new access tokens
+                if input.refresh_token:
+                    await AuthMiddleware.revoke_refresh_token(db, input.refresh_token, current_user.id)
+
                 message = "Logged out successfully"
             
             # Optional: Clean up expired tokens (run periodically)
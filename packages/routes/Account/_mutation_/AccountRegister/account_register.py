@@ -7,6 +7,7 @@ from packages.types.inputs import UserRegisterInput
 from packages.types.outputs import UserGraphQL, AuthResponse
 from packages.middleware.auth import AuthMiddleware
 from packages.types.models import User, UserType, AdminRole
+from packages.utils.geo import geo_location, geo_point
 
 @strawberry.type
 class AccountRegister:
@@ -31,6 +32,11 @@ class AccountRegister:
                 message="User already exists"
             )
         
+        # Only sellers have a business location
+        business_location = None
+        if input.user_type == UserType.SELLER:
+            business_location = geo_point(input.business_latitude, input.business_longitude)
+        
         # Create new user
         user_data = {
             "email": input.email,
@@ -43,6 +49,7 @@ class AccountRegister:
             "seller_type": input.seller_type,
             "business_name": input.business_name,
             "business_address": input.business_address,
+            "business_location": business_location,
             "business_description": input.business_description,
             "is_active": True,
             "created_at": datetime.now(),
@@ -58,6 +65,7 @@ class AccountRegister:
         access_token = AuthMiddleware.create_access_token(
             data={"sub": user.id}, expires_delta=access_token_expires
         )
+        refresh_token = await AuthMiddleware.create_refresh_token(db, user.id)
         
         return AuthResponse(
             token=access_token,
@@ -74,7 +82,9 @@ class AccountRegister:
                 business_name=user.business_name,
                 business_address=user.business_address,
                 business_description=user.business_description,
+                business_location=geo_location(user.business_location),
                 created_at=user.created_at.isoformat()
             ),
-            message="User registered successfully"
+            message="User registered successfully",
+            refresh_token=refresh_token
         )
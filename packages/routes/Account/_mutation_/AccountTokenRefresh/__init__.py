@@ -0,0 +1,2 @@
+from .account_token_refresh import AccountTokenRefresh
+__all__ = ['AccountTokenRefresh']
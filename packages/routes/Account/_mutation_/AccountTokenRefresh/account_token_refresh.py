@@ -0,0 +1,32 @@
+import strawberry
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from packages.types.outputs import TokenRefreshResponse
+from packages.middleware.auth import AuthMiddleware
+
+@strawberry.type
+class AccountTokenRefresh:
+    @strawberry.mutation
+    async def account_token_refresh(self, info, refresh_token: str) -> TokenRefreshResponse:
+        """
+        Exchange a refresh token for a new access token and a rotated refresh token
+        Only HMAC and index lookups are involved, so clients don't have to send credentials again
+        """
+        db: AsyncIOMotorDatabase = info.context["db"]
+
+        rotated = await AuthMiddleware.rotate_refresh_token(db, refresh_token)
+        if rotated is None:
+            return TokenRefreshResponse(
+                token="",
+                refresh_token="",
+                message="Invalid or expired refresh token"
+            )
+
+        user_id, new_refresh_token = rotated
+        access_token = AuthMiddleware.create_access_token(data={"sub": user_id})
+
+        return TokenRefreshResponse(
+            token=access_token,
+            refresh_token=new_refresh_token,
+            message="Token refreshed successfully"
+        )
@@ -1,11 +1,17 @@
 import strawberry
+import uuid
 from datetime import datetime
 from typing import List
+from pymongo import ReturnDocument
 
 from packages.types.inputs import UserProfileUpdateInput, DeliveryAddressInput
 from packages.types.outputs import UserGraphQL, SuccessResponse
 from packages.middleware.auth import AuthMiddleware
 from packages.types.models import UserType
+from packages.utils.geo import geo_location, geo_point
+
+# Fields returned by account_update; never read secrets or the address list back
+USER_PROJECTION = {"_id": 0, "password_hash": 0, "delivery_addresses": 0}
 
 @strawberry.type
 class AccountUpdate:
@@ -23,6 +29,7 @@ class AccountUpdate:
         
         # Build update data
         update_data = {"updated_at": datetime.now()}
+        unset_data = {}
         
         if input.full_name is not None:
             if len(input.full_name.strip()) < 2:
@@ -40,6 +47,15 @@ class AccountUpdate:
                 update_data["business_name"] = input.business_name.strip() if input.business_name else None
             if input.business_address is not None:
                 update_data["business_address"] = input.business_address.strip() if input.business_address else None
+            latitude, longitude = input.business_latitude, input.business_longitude
+            if latitude is not strawberry.UNSET or longitude is not strawberry.UNSET:
+                if latitude is None and longitude is None:
+                    # An explicit null pair clears the location
+                    unset_data["business_location"] = ""
+                elif latitude is strawberry.UNSET or longitude is strawberry.UNSET:
+                    raise Exception("Latitude and longitude must be given together")
+                else:
+                    update_data["business_location"] = geo_point(latitude, longitude)
             if input.business_description is not None:
                 update_data["business_description"] = input.business_description.strip() if input.business_description else None
             if input.seller_type is not None:
@@ -50,14 +66,19 @@ class AccountUpdate:
             if input.customer_category is not None:
                 update_data["customer_category"] = input.customer_category
         
-        # Update the user
-        await db.users.update_one(
+        update = {"$set": update_data}
+        if unset_data:
+            update["$unset"] = unset_data
+
+        # Update the user and read back the post-image in one atomic operation
+        updated_user_data = await db.users.find_one_and_update(
             {"id": current_user.id},
-            {"$set": update_data}
+            update,
+            projection=USER_PROJECTION,
+            return_document=ReturnDocument.AFTER
         )
-        
-        # Fetch updated user data
-        updated_user_data = await db.users.find_one({"id": current_user.id})
+        if not updated_user_data:
+            raise Exception("User not found")
         
         return UserGraphQL(
             id=updated_user_data["id"],
@@ -72,6 +93,7 @@ class AccountUpdate:
             business_name=updated_user_data.get("business_name"),
             business_address=updated_user_data.get("business_address"),
             business_description=updated_user_data.get("business_description"),
+            business_location=geo_location(updated_user_data.get("business_location")),
             created_at=updated_user_data["created_at"].isoformat()
         )
     
@@ -92,28 +114,42 @@ class AccountUpdate:
         
         # Create address object
         address = {
-            "id": f"addr_{datetime.now().timestamp()}",
+            "id": f"addr_{uuid.uuid4().hex}",
             "street": input.street.strip(),
             "city": input.city.strip(),
             "state": input.state.strip(),
             "postal_code": input.postal_code.strip(),
             "country": input.country.strip(),
             "is_default": input.is_default or False,
+            "location": geo_point(input.latitude, input.longitude),
             "created_at": datetime.now()
         }
         
-        # If this is set as default, make all other addresses non-default
         if input.is_default:
-            await db.users.update_one(
-                {"id": current_user.id},
-                {"$set": {"delivery_addresses.$[].is_default": False}}
-            )
-        
-        # Add the new address
-        await db.users.update_one(
-            {"id": current_user.id},
-            {"$push": {"delivery_addresses": address}}
-        )
+            # Clear the other defaults and append the new address in a single pipeline update
+            update = [{
+                "$set": {
+                    "delivery_addresses": {
+                        "$concatArrays": [
+                            {
+                                "$map": {
+                                    "input": {"$ifNull": ["$delivery_addresses", []]},
+                                    "as": "address",
+                                    "in": {"$mergeObjects": ["$$address", {"is_default": False}]}
+                                }
+                            },
+                            # $literal keeps user input from being read as expressions
+                            {"$literal": [address]}
+                        ]
+                    }
+                }
+            }]
+        else:
+            update = {"$push": {"delivery_addresses": address}}
+        
+        result = await db.users.update_one({"id": current_user.id}, update)
+        if result.matched_count == 0:
+            raise Exception("User not found")
         
         return SuccessResponse(
             success=True,
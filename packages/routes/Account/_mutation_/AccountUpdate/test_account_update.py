@@ -0,0 +1,140 @@
+"""
+Concurrency test script for Account Update API
+Hammers the same user with concurrent accountUpdate and addDeliveryAddress calls
+and checks the stored document stays consistent:
+- every address is stored exactly once
+- exactly one address is marked as default
+- accountUpdate always returns a complete post-image
+"""
+
+import asyncio
+import os
+import uuid
+import aiohttp
+from motor.motor_asyncio import AsyncIOMotorClient
+
+# Configuration
+API_URL = "http://localhost:8001/graphql"
+HEADERS = {"Content-Type": "application/json"}
+MONGO_URL = os.environ.get("MONGO_URL", "mongodb://localhost:27017")
+DB_NAME = os.environ.get("DB_NAME", "ecommerce_db")
+CONCURRENCY = 50
+
+REGISTER_MUTATION = """
+mutation AccountRegister($input: UserRegisterInput!) {
+  accountRegister(input: $input) {
+    token
+    user { id }
+    message
+  }
+}
+"""
+
+UPDATE_MUTATION = """
+mutation AccountUpdate($token: String!, $input: UserProfileUpdateInput!) {
+  accountUpdate(token: $token, input: $input) {
+    id
+    fullName
+    phone
+  }
+}
+"""
+
+ADD_ADDRESS_MUTATION = """
+mutation AddDeliveryAddress($token: String!, $input: DeliveryAddressInput!) {
+  addDeliveryAddress(token: $token, input: $input) {
+    success
+    message
+  }
+}
+"""
+
+async def graphql_request(session, query, variables=None):
+    """Make a GraphQL request"""
+    payload = {
+        "query": query,
+        "variables": variables or {}
+    }
+
+    async with session.post(API_URL, json=payload, headers=HEADERS) as response:
+        return await response.json()
+
+async def register_customer(session):
+    """Register a throwaway customer and return (user_id, token)"""
+    variables = {
+        "input": {
+            "email": f"concurrency-{uuid.uuid4().hex[:8]}@example.com",
+            "password": "testpassword",
+            "fullName": "Concurrency Test",
+            "userType": "CUSTOMER"
+        }
+    }
+    result = await graphql_request(session, REGISTER_MUTATION, variables)
+    data = result["data"]["accountRegister"]
+    return data["user"]["id"], data["token"]
+
+async def add_address(session, token, index):
+    variables = {
+        "token": token,
+        "input": {
+            "street": f"{index} Main Street",
+            "city": "Springfield",
+            "state": "IL",
+            "postalCode": "62701",
+            "country": "US",
+            "isDefault": True
+        }
+    }
+    return await graphql_request(session, ADD_ADDRESS_MUTATION, variables)
+
+async def update_profile(session, token, index):
+    variables = {
+        "token": token,
+        "input": {"fullName": f"Concurrency Test {index}"}
+    }
+    return await graphql_request(session, UPDATE_MUTATION, variables)
+
+async def main():
+    """Run the concurrency check"""
+    print("=== Account Update Concurrency Test ===\n")
+
+    async with aiohttp.ClientSession() as session:
+        user_id, token = await register_customer(session)
+        print(f"Registered user {user_id}")
+
+        tasks = []
+        for index in range(CONCURRENCY):
+            tasks.append(add_address(session, token, index))
+            tasks.append(update_profile(session, token, index))
+        results = await asyncio.gather(*tasks)
+
+    errors = [result["errors"] for result in results if "errors" in result]
+    updates = [result["data"]["accountUpdate"] for result in results if result.get("data", {}).get("accountUpdate")]
+
+    client = AsyncIOMotorClient(MONGO_URL)
+    try:
+        user = await client[DB_NAME].users.find_one({"id": user_id})
+    finally:
+        client.close()
+
+    addresses = user.get("delivery_addresses", [])
+    defaults = [address for address in addresses if address["is_default"]]
+    address_ids = {address["id"] for address in addresses}
+
+    print(f"Requests: {len(results)}, errors: {len(errors)}")
+    print(f"Stored addresses: {len(addresses)} (expected {CONCURRENCY})")
+    print(f"Unique address ids: {len(address_ids)}")
+    print(f"Default addresses: {len(defaults)} (expected 1)")
+    print(f"Complete accountUpdate responses: {sum(1 for u in updates if u['id'] == user_id)} / {CONCURRENCY}")
+
+    ok = (
+        not errors
+        and len(addresses) == CONCURRENCY
+        and len(address_ids) == CONCURRENCY
+        and len(defaults) == 1
+        and all(update["id"] == user_id for update in updates)
+    )
+    print("\n✅ Consistent" if ok else "\n❌ Inconsistent state detected")
+
+if __name__ == "__main__":
+    asyncio.run(main())
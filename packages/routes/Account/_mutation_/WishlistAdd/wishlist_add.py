@@ -1,23 +1,43 @@
 import strawberry
+from typing import Optional
+from pymongo.errors import DuplicateKeyError
 from packages.types.outputs import SuccessResponse
 from packages.middleware.auth import AuthMiddleware
-from packages.types.models import UserType, Wishlist
+from packages.types.models import User, UserType, Wishlist
+from packages.pattern.events import WISHLIST_ADDED, events
+from packages.utils.idempotency import run_idempotent
 
 @strawberry.type
 class WishlistAdd:
     @strawberry.mutation
-    async def wishlist_add(self, info, product_id: str, token: str) -> SuccessResponse:
+    async def wishlist_add(
+        self,
+        info,
+        product_id: str,
+        token: str,
+        idempotency_key: Optional[str] = None
+    ) -> SuccessResponse:
         """
         Add a product to user's wishlist
         Only customers can add items to wishlist
+        Retries carrying the same idempotency key return the first response
         """
         db = info.context["db"]
-        
+
         # Verify authenticated customer
         current_user = await AuthMiddleware.get_current_user(db, token)
         if not current_user:
             raise Exception("Authentication required")
-        
+
+        if idempotency_key:
+            return await run_idempotent(
+                db, "wishlist_add", current_user.id, idempotency_key, {"product_id": product_id},
+                lambda: WishlistAdd.add(db, product_id, current_user), SuccessResponse
+            )
+        return await WishlistAdd.add(db, product_id, current_user)
+
+    @staticmethod
+    async def add(db, product_id: str, current_user: User) -> SuccessResponse:
         if current_user.user_type != UserType.CUSTOMER:
             raise Exception("Only customers can add items to wishlist")
         
@@ -29,25 +49,30 @@ class WishlistAdd:
         if not product:
             raise Exception("Product not found or not available")
         
-        # Check if already in wishlist
-        existing_wishlist_item = await db.wishlists.find_one({
-            "user_id": current_user.id,
-            "product_id": product_id
-        })
+        # Add to wishlist unless already present (single upsert on the unique index, no check-then-insert race)
+        wishlist_item = Wishlist(
+            user_id=current_user.id,
+            product_id=product_id
+        ).dict()
+        del wishlist_item["user_id"], wishlist_item["product_id"]
+        
+        try:
+            result = await db.wishlists.update_one(
+                {"user_id": current_user.id, "product_id": product_id},
+                {"$setOnInsert": wishlist_item},
+                upsert=True
+            )
+            already_present = result.upserted_id is None
+        except DuplicateKeyError:
+            already_present = True
         
-        if existing_wishlist_item:
+        if already_present:
             return SuccessResponse(
                 success=False,
                 message="Product is already in your wishlist"
             )
         
-        # Add to wishlist
-        wishlist_item = Wishlist(
-            user_id=current_user.id,
-            product_id=product_id
-        )
-        
-        await db.wishlists.insert_one(wishlist_item.dict())
+        await events.publish(WISHLIST_ADDED, db=db, user_id=current_user.id, product_ids=[product_id])
         
         return SuccessResponse(
             success=True,
@@ -0,0 +1,2 @@
+from .wishlist_add_many import WishlistAddMany
+__all__ = ['WishlistAddMany']
@@ -0,0 +1,101 @@
+import strawberry
+from typing import List
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from packages.types.outputs import WishlistBatchResponse, WishlistItemStatus
+from packages.middleware.auth import AuthMiddleware
+from packages.types.models import UserType, Wishlist
+from packages.pattern.events import WISHLIST_ADDED, events
+
+WISHLIST_BATCH_LIMIT = 100
+DUPLICATE_KEY_ERROR = 11000
+
+
+@strawberry.type
+class WishlistAddMany:
+    @strawberry.mutation
+    async def wishlist_add_many(self, info, product_ids: List[str], token: str) -> WishlistBatchResponse:
+        """
+        Add several products to user's wishlist in one request
+        Products are validated with a single query and written with one unordered bulk upsert
+        """
+        db = info.context["db"]
+
+        # Verify authenticated customer
+        current_user = await AuthMiddleware.get_current_user(db, token)
+        if not current_user:
+            raise Exception("Authentication required")
+
+        if current_user.user_type != UserType.CUSTOMER:
+            raise Exception("Only customers can add items to wishlist")
+
+        product_ids = list(dict.fromkeys(product_ids))
+        if len(product_ids) > WISHLIST_BATCH_LIMIT:
+            raise Exception(f"At most {WISHLIST_BATCH_LIMIT} products can be added at once")
+
+        # Validate all products in one round trip
+        available = await db.products.find(
+            {"id": {"$in": product_ids}, "is_available": True},
+            {"id": 1, "_id": 0}
+        ).to_list(length=None)
+        available_ids = {product["id"] for product in available}
+
+        statuses = {
+            product_id: WishlistItemStatus(
+                product_id=product_id,
+                success=False,
+                message="Product not found or not available"
+            )
+            for product_id in product_ids if product_id not in available_ids
+        }
+
+        # Upsert against the unique (user_id, product_id) index: existing rows are left untouched
+        to_add = [product_id for product_id in product_ids if product_id in available_ids]
+        operations = []
+        for product_id in to_add:
+            wishlist_item = Wishlist(user_id=current_user.id, product_id=product_id).dict()
+            del wishlist_item["user_id"], wishlist_item["product_id"]
+            operations.append(UpdateOne(
+                {"user_id": current_user.id, "product_id": product_id},
+                {"$setOnInsert": wishlist_item},
+                upsert=True
+            ))
+
+        inserted = set()
+        failed = {}
+        if operations:
+            try:
+                result = await db.wishlists.bulk_write(operations, ordered=False)
+                inserted = set(result.upserted_ids.keys())
+            except BulkWriteError as e:
+                inserted = {upsert["index"] for upsert in e.details.get("upserted", [])}
+                for error in e.details.get("writeErrors", []):
+                    # A concurrent request inserted the same row first
+                    if error.get("code") != DUPLICATE_KEY_ERROR:
+                        failed[error["index"]] = error.get("errmsg", "Write failed")
+
+        for index, product_id in enumerate(to_add):
+            if index in failed:
+                statuses[product_id] = WishlistItemStatus(
+                    product_id=product_id, success=False, message=failed[index]
+                )
+            elif index in inserted:
+                statuses[product_id] = WishlistItemStatus(
+                    product_id=product_id, success=True, message="Product added to wishlist successfully"
+                )
+            else:
+                statuses[product_id] = WishlistItemStatus(
+                    product_id=product_id, success=False, message="Product is already in your wishlist"
+                )
+
+        added = len(inserted)
+        if added:
+            await events.publish(
+                WISHLIST_ADDED, db=db, user_id=current_user.id,
+                product_ids=[product_id for index, product_id in enumerate(to_add) if index in inserted]
+            )
+        return WishlistBatchResponse(
+            success=added > 0,
+            message=f"{added} of {len(product_ids)} products added to wishlist",
+            items=[statuses[product_id] for product_id in product_ids]
+        )
@@ -2,6 +2,7 @@ import strawberry
 from packages.types.outputs import SuccessResponse
 from packages.middleware.auth import AuthMiddleware
 from packages.types.models import UserType
+from packages.pattern.events import WISHLIST_REMOVED, events
 
 @strawberry.type
 class WishlistRemove:
@@ -32,6 +33,8 @@ class WishlistRemove:
                 message="Product not found in your wishlist"
             )
         
+        await events.publish(WISHLIST_REMOVED, db=db, user_id=current_user.id, product_ids=[product_id])
+        
         return SuccessResponse(
             success=True,
             message="Product removed from wishlist successfully"
@@ -0,0 +1,2 @@
+from .wishlist_remove_many import WishlistRemoveMany
+__all__ = ['WishlistRemoveMany']
@@ -0,0 +1,54 @@
+import strawberry
+from typing import List
+from packages.types.outputs import WishlistBatchResponse, WishlistItemStatus
+from packages.middleware.auth import AuthMiddleware
+from packages.types.models import UserType
+from packages.pattern.events import WISHLIST_REMOVED, events
+from packages.routes.Account._mutation_.WishlistAddMany.wishlist_add_many import WISHLIST_BATCH_LIMIT
+
+
+@strawberry.type
+class WishlistRemoveMany:
+    @strawberry.mutation
+    async def wishlist_remove_many(self, info, product_ids: List[str], token: str) -> WishlistBatchResponse:
+        """
+        Remove several products from user's wishlist in one request
+        """
+        db = info.context["db"]
+
+        # Verify authenticated customer
+        current_user = await AuthMiddleware.get_current_user(db, token)
+        if not current_user:
+            raise Exception("Authentication required")
+
+        if current_user.user_type != UserType.CUSTOMER:
+            raise Exception("Only customers can remove items from wishlist")
+
+        product_ids = list(dict.fromkeys(product_ids))
+        if len(product_ids) > WISHLIST_BATCH_LIMIT:
+            raise Exception(f"At most {WISHLIST_BATCH_LIMIT} products can be removed at once")
+
+        filter_query = {"user_id": current_user.id, "product_id": {"$in": product_ids}}
+
+        # Find which items exist (index-only on user_id/product_id), then delete them in one write
+        existing = await db.wishlists.find(filter_query, {"product_id": 1, "_id": 0}).to_list(length=None)
+        existing_ids = {item["product_id"] for item in existing}
+
+        result = await db.wishlists.delete_many(filter_query) if existing_ids else None
+        removed = result.deleted_count if result else 0
+        if removed:
+            await events.publish(WISHLIST_REMOVED, db=db, user_id=current_user.id, product_ids=list(existing_ids))
+
+        return WishlistBatchResponse(
+            success=removed > 0,
+            message=f"{removed} of {len(product_ids)} products removed from wishlist",
+            items=[
+                WishlistItemStatus(
+                    product_id=product_id,
+                    success=product_id in existing_ids,
+                    message="Product removed from wishlist successfully"
+                    if product_id in existing_ids else "Product not found in your wishlist"
+                )
+                for product_id in product_ids
+            ]
+        )
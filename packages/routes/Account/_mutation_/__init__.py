@@ -1,8 +1,11 @@
 from .AccountRegister import AccountRegister
 from .AccountLogin import AccountLogin
 from .AccountLogout import AccountLogout
+from .AccountTokenRefresh import AccountTokenRefresh
 from .AccountUpdate import AccountUpdate
 from .WishlistAdd import WishlistAdd
 from .WishlistRemove import WishlistRemove
+from .WishlistAddMany import WishlistAddMany
+from .WishlistRemoveMany import WishlistRemoveMany
 
-__all__ = ['AccountRegister', 'AccountLogin', 'AccountLogout', 'AccountUpdate', 'WishlistAdd', 'WishlistRemove']
\ No newline at end of file
+__all__ = ['AccountRegister', 'AccountLogin', 'AccountLogout', 'AccountTokenRefresh', 'AccountUpdate', 'WishlistAdd', 'WishlistRemove', 'WishlistAddMany', 'WishlistRemoveMany']
\ No newline at end of file
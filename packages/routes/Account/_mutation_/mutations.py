@@ -7,30 +7,42 @@ Exports all account-related mutations
 from .AccountRegister import AccountRegister
 from .AccountLogin import AccountLogin
 from .AccountLogout import AccountLogout
+from .AccountTokenRefresh import AccountTokenRefresh
 from .AccountUpdate import AccountUpdate
 from .WishlistAdd import WishlistAdd
 from .WishlistRemove import WishlistRemove
+from .WishlistAddMany import WishlistAddMany
+from .WishlistRemoveMany import WishlistRemoveMany
 
 # Export specific mutations (like in Node.js structure)
 account_register = AccountRegister
 account_login = AccountLogin
 account_logout = AccountLogout
+account_token_refresh = AccountTokenRefresh
 account_update = AccountUpdate
 wishlist_add = WishlistAdd
 wishlist_remove = WishlistRemove
+wishlist_add_many = WishlistAddMany
+wishlist_remove_many = WishlistRemoveMany
 
 # Export all mutations as a list for easy iteration
 __all__ = [
     'AccountRegister',
     'AccountLogin', 
     'AccountLogout',
+    'AccountTokenRefresh',
     'AccountUpdate',
     'WishlistAdd',
     'WishlistRemove',
+    'WishlistAddMany',
+    'WishlistRemoveMany',
     'account_register',
     'account_login',
     'account_logout',
+    'account_token_refresh',
     'account_update',
     'wishlist_add',
-    'wishlist_remove'
+    'wishlist_remove',
+    'wishlist_add_many',
+    'wishlist_remove_many'
 ]
@@ -0,0 +1,3 @@
+from .account_connection import AccountConnection
+from .account_export import router as account_export_router
+__all__ = ['AccountConnection', 'account_export_router']
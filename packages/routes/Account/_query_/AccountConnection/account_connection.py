@@ -0,0 +1,127 @@
+import strawberry
+from datetime import datetime
+from typing import Optional
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from packages.types.inputs import AccountFilterInput
+from packages.types.outputs import UserGraphQL, UserConnection, UserEdge, PageInfo
+from packages.middleware.auth import AuthMiddleware
+from packages.types.models import UserType, AdminRole
+from packages.utils.pagination import encode_cursor, decode_cursor, page_size, keyset_after, is_selected
+from packages.utils.geo import geo_location
+
+# Never read secrets or address lists for listings and exports
+USER_LIST_PROJECTION = {"_id": 0, "password_hash": 0, "delivery_addresses": 0}
+
+
+async def require_user_admin(db, token: str):
+    """Only super admins and user managers can list or export accounts"""
+    current_user = await AuthMiddleware.get_current_user(db, token)
+    if not current_user or current_user.user_type != UserType.ADMIN:
+        raise Exception("Only admin users can list accounts")
+
+    if current_user.admin_role not in [AdminRole.SUPER_ADMIN, AdminRole.USER_MANAGER]:
+        raise Exception("Insufficient permissions to list accounts")
+
+    return current_user
+
+
+def _parse_datetime(value: str, name: str) -> datetime:
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise Exception(f"{name} must be an ISO 8601 datetime")
+
+
+def build_account_filter(filter: Optional[AccountFilterInput]) -> dict:
+    """Translate AccountFilterInput into a users query (served by the indexes in context/indexes.py)"""
+    filter_query = {}
+    if filter is None:
+        return filter_query
+
+    if filter.user_type is not None:
+        filter_query["user_type"] = filter.user_type
+    if filter.seller_type is not None:
+        filter_query["seller_type"] = filter.seller_type
+    if filter.is_active is not None:
+        filter_query["is_active"] = filter.is_active
+
+    created_at = {}
+    if filter.created_after:
+        created_at["$gte"] = _parse_datetime(filter.created_after, "created_after")
+    if filter.created_before:
+        created_at["$lt"] = _parse_datetime(filter.created_before, "created_before")
+    if created_at:
+        filter_query["created_at"] = created_at
+
+    return filter_query
+
+
+@strawberry.type
+class AccountConnection:
+    @strawberry.field
+    async def account_connection(
+        self,
+        info,
+        token: str,
+        filter: Optional[AccountFilterInput] = None,
+        first: Optional[int] = 20,
+        after: Optional[str] = None
+    ) -> UserConnection:
+        """
+        Get a page of accounts, newest first (admin only)
+        """
+        db: AsyncIOMotorDatabase = info.context["db"]
+        await require_user_admin(db, token)
+        limit = page_size(first)
+
+        filter_query = build_account_filter(filter)
+        page_query = dict(filter_query)
+        if after:
+            created_at, user_id = decode_cursor(after)
+            page_query = {"$and": [filter_query, keyset_after(["created_at", "id"], [created_at, user_id])]}
+
+        users = await db.users.find(page_query, USER_LIST_PROJECTION) \
+            .sort([("created_at", -1), ("id", -1)]) \
+            .limit(limit + 1) \
+            .to_list(length=limit + 1)
+        has_next_page = len(users) > limit
+        users = users[:limit]
+
+        edges = [
+            UserEdge(
+                node=UserGraphQL(
+                    id=user["id"],
+                    email=user["email"],
+                    full_name=user["full_name"],
+                    phone=user.get("phone"),
+                    user_type=user["user_type"],
+                    customer_category=user.get("customer_category"),
+                    admin_role=user.get("admin_role"),
+                    seller_type=user.get("seller_type"),
+                    is_active=user["is_active"],
+                    business_name=user.get("business_name"),
+                    business_address=user.get("business_address"),
+                    business_description=user.get("business_description"),
+                    business_location=geo_location(user.get("business_location")),
+                    created_at=user["created_at"].isoformat()
+                ),
+                cursor=encode_cursor(user["created_at"], user["id"])
+            )
+            for user in users
+        ]
+
+        # Counting can touch many index entries; only do it when asked
+        total_count = 0
+        if is_selected(info, "totalCount"):
+            total_count = await db.users.count_documents(filter_query)
+
+        return UserConnection(
+            edges=edges,
+            page_info=PageInfo(
+                has_next_page=has_next_page,
+                has_previous_page=after is not None,
+                start_cursor=edges[0].cursor if edges else None,
+                end_cursor=edges[-1].cursor if edges else None
+            ),
+            total_count=total_count
+        )
@@ -0,0 +1,114 @@
+"""
+Account Export
+Streams filtered accounts as CSV or NDJSON for compliance pulls
+
+GET /export/accounts?format=csv&user_type=SELLER&created_after=2025-01-01
+Authorization: Bearer <admin token>
+
+Rows are read with a server-side cursor and written as they arrive, so memory use is
+constant regardless of how many accounts match
+"""
+
+import csv
+import io
+import json
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from packages.context.database import db_context
+from packages.types.inputs import AccountFilterInput, UserType, SellerType
+from .account_connection import USER_LIST_PROJECTION, build_account_filter, require_user_admin
+
+EXPORT_FIELDS = [
+    "id",
+    "email",
+    "full_name",
+    "phone",
+    "user_type",
+    "customer_category",
+    "admin_role",
+    "seller_type",
+    "is_active",
+    "business_name",
+    "business_address",
+    "business_description",
+    "created_at",
+]
+EXPORT_BATCH_SIZE = 1000
+# Rows buffered per streamed chunk
+EXPORT_CHUNK_ROWS = 500
+
+router = APIRouter()
+
+
+def _row(user: dict) -> dict:
+    row = {field: user.get(field) for field in EXPORT_FIELDS}
+    if row["created_at"] is not None:
+        row["created_at"] = row["created_at"].isoformat()
+    return row
+
+
+async def _stream(cursor, export_format: str):
+    buffer = io.StringIO()
+    writer = None
+    if export_format == "csv":
+        writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+
+    rows = 0
+    async for user in cursor:
+        if writer is not None:
+            writer.writerow(_row(user))
+        else:
+            buffer.write(json.dumps(_row(user), separators=(",", ":")))
+            buffer.write("\n")
+        rows += 1
+        if rows % EXPORT_CHUNK_ROWS == 0:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+@router.get("/export/accounts")
+async def account_export(
+    authorization: str = Header(...),
+    format: str = Query("ndjson", pattern="^(csv|ndjson)$"),
+    user_type: Optional[UserType] = None,
+    seller_type: Optional[SellerType] = None,
+    is_active: Optional[bool] = None,
+    created_after: Optional[str] = None,
+    created_before: Optional[str] = None,
+):
+    db = db_context.db
+    token = authorization.removeprefix("Bearer ").strip()
+    try:
+        await require_user_admin(db, token)
+    except Exception as e:
+        raise HTTPException(status_code=403, detail=str(e))
+
+    try:
+        filter_query = build_account_filter(AccountFilterInput(
+            user_type=user_type,
+            seller_type=seller_type,
+            is_active=is_active,
+            created_after=created_after,
+            created_before=created_before
+        ))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    cursor = db.users.find(filter_query, USER_LIST_PROJECTION) \
+        .sort([("created_at", -1), ("id", -1)]) \
+        .batch_size(EXPORT_BATCH_SIZE)
+
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        _stream(cursor, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="accounts.{format}"'}
+    )
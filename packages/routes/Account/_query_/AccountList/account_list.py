@@ -2,6 +2,7 @@ import strawberry
 from typing import List
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from packages.types.outputs import UserGraphQL
+from packages.utils.geo import geo_location
 
 @strawberry.type
 class AccountList:
@@ -26,6 +27,7 @@ class AccountList:
                 business_name=user.get("business_name"),
                 business_address=user.get("business_address"),
                 business_description=user.get("business_description"),
+                business_location=geo_location(user.get("business_location")),
                 created_at=user["created_at"].isoformat()
             )
             for user in users
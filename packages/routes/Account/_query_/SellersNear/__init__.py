@@ -0,0 +1,2 @@
+from .sellers_near import SellersNear
+__all__ = ['SellersNear']
@@ -0,0 +1,140 @@
+import os
+import strawberry
+from typing import List, Optional
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from packages.types.inputs import SellerType
+from packages.types.outputs import UserGraphQL, NearbySellerConnection, NearbySellerEdge, PageInfo
+from packages.types.models import UserType
+from packages.utils.geo import geo_location, geo_point
+from packages.utils.pagination import encode_cursor, decode_cursor, page_size, is_selected
+
+SELLERS_NEAR_MAX_RADIUS_METERS = float(os.environ.get("SELLERS_NEAR_MAX_RADIUS_METERS", "50000"))
+# Radius used by $geoNear's spherical distances
+EARTH_RADIUS_METERS = 6378100
+
+# Never read secrets or address lists for listings
+SELLER_PROJECTION = {"_id": 0, "password_hash": 0, "delivery_addresses": 0}
+
+
+def seller_filter(seller_type: Optional[SellerType]) -> dict:
+    filter_query = {"user_type": UserType.SELLER, "is_active": True}
+    if seller_type is not None:
+        filter_query["seller_type"] = seller_type
+    return filter_query
+
+
+def build_sellers_near_pipeline(
+    point: dict,
+    radius: float,
+    filter_query: dict,
+    limit: int,
+    after: Optional[list] = None
+) -> List[dict]:
+    """
+    One $geoNear over the business_location 2dsphere index, in (distance, id) order
+    Pages resume at the cursor's distance (minDistance) and skip what the cursor has already covered
+    """
+    geo_near = {
+        "near": point,
+        "key": "business_location",
+        "distanceField": "distance",
+        "maxDistance": radius,
+        "query": filter_query,
+        "spherical": True,
+    }
+    pipeline = [{"$geoNear": geo_near}]
+    if after:
+        distance, seller_id = after
+        geo_near["minDistance"] = distance
+        pipeline.append({"$match": {"$or": [{"distance": {"$gt": distance}}, {"id": {"$gt": seller_id}}]}})
+    pipeline += [{"$limit": limit}, {"$project": SELLER_PROJECTION}]
+    return pipeline
+
+
+@strawberry.type
+class SellersNear:
+    @strawberry.field
+    async def sellers_near(
+        self,
+        info,
+        lat: float,
+        lng: float,
+        radius: float,
+        seller_type: Optional[SellerType] = None,
+        first: Optional[int] = 20,
+        after: Optional[str] = None
+    ) -> NearbySellerConnection:
+        """
+        Get active sellers within `radius` meters of a point, nearest first
+        """
+        db: AsyncIOMotorDatabase = info.context["db"]
+        point = geo_point(lat, lng)
+        if radius <= 0:
+            raise Exception("Radius must be positive")
+        radius = min(radius, SELLERS_NEAR_MAX_RADIUS_METERS)
+        limit = page_size(first)
+        filter_query = seller_filter(seller_type)
+        cursor = decode_cursor(after) if after else None
+
+        sellers = await db.users.aggregate(
+            build_sellers_near_pipeline(point, radius, filter_query, limit + 1, cursor)
+        ).to_list(length=limit + 1)
+        has_next_page = len(sellers) > limit
+
+        # $geoNear does not order equal distances; when a tie straddles the page boundary,
+        # read that whole distance in id order so the cursor never skips a seller
+        if has_next_page and sellers[limit - 1]["distance"] == sellers[limit]["distance"]:
+            boundary = sellers[limit]["distance"]
+            tied = build_sellers_near_pipeline(point, radius, filter_query, limit + 1, cursor)
+            tied[0]["$geoNear"]["minDistance"] = boundary
+            tied[0]["$geoNear"]["maxDistance"] = boundary
+            tied.insert(-2, {"$sort": {"id": 1}})
+            sellers = [seller for seller in sellers if seller["distance"] < boundary]
+            sellers += await db.users.aggregate(tied).to_list(length=limit + 1)
+
+        sellers = sorted(sellers, key=lambda seller: (seller["distance"], seller["id"]))[:limit]
+
+        edges = [
+            NearbySellerEdge(
+                node=UserGraphQL(
+                    id=seller["id"],
+                    email=seller["email"],
+                    full_name=seller["full_name"],
+                    phone=seller.get("phone"),
+                    user_type=seller["user_type"],
+                    customer_category=seller.get("customer_category"),
+                    admin_role=seller.get("admin_role"),
+                    seller_type=seller.get("seller_type"),
+                    is_active=seller["is_active"],
+                    business_name=seller.get("business_name"),
+                    business_address=seller.get("business_address"),
+                    business_description=seller.get("business_description"),
+                    business_location=geo_location(seller.get("business_location")),
+                    created_at=seller["created_at"].isoformat()
+                ),
+                cursor=encode_cursor(seller["distance"], seller["id"]),
+                distance=seller["distance"]
+            )
+            for seller in sellers
+        ]
+
+        # Counting reads every seller in the radius; only do it when asked
+        total_count = 0
+        if is_selected(info, "totalCount"):
+            total_count = await db.users.count_documents({
+                **filter_query,
+                "business_location": {
+                    "$geoWithin": {"$centerSphere": [point["coordinates"], radius / EARTH_RADIUS_METERS]}
+                }
+            })
+
+        return NearbySellerConnection(
+            edges=edges,
+            page_info=PageInfo(
+                has_next_page=has_next_page,
+                has_previous_page=after is not None,
+                start_cursor=edges[0].cursor if edges else None,
+                end_cursor=edges[-1].cursor if edges else None
+            ),
+            total_count=total_count
+        )
@@ -0,0 +1,2 @@
+from .wishlist_connection import WishlistConnection
+__all__ = ['WishlistConnection']
@@ -0,0 +1,139 @@
+import strawberry
+from typing import Optional
+from packages.types.outputs import ProductServiceGraphQL, ProductServiceConnection, ProductServiceEdge, PageInfo
+from packages.middleware.auth import AuthMiddleware
+from packages.types.models import UserType
+from packages.utils.pagination import (
+    encode_cursor, decode_cursor, page_size, keyset_after, selected_node_fields, is_selected
+)
+
+# GraphQL node field -> products document field
+PRODUCT_FIELD_MAP = {
+    "id": "id",
+    "name": "name",
+    "description": "description",
+    "type": "type",
+    "categoryId": "category_id",
+    "sellerId": "seller_id",
+    "price": "price",
+    "images": "images",
+    "isAvailable": "is_available",
+    "stockQuantity": "stock_quantity",
+    "serviceDuration": "service_duration",
+    "tags": "tags",
+    "createdAt": "created_at",
+}
+
+
+async def _current_customer(db, token: str):
+    current_user = await AuthMiddleware.get_current_user(db, token)
+    if not current_user:
+        raise Exception("Authentication required")
+
+    if current_user.user_type != UserType.CUSTOMER:
+        raise Exception("Only customers have wishlists")
+
+    return current_user
+
+
+@strawberry.type
+class WishlistConnection:
+    @strawberry.field
+    async def wishlist_connection(
+        self,
+        info,
+        token: str,
+        first: Optional[int] = 20,
+        after: Optional[str] = None
+    ) -> ProductServiceConnection:
+        """
+        Get a page of the user's wishlist, newest first
+        Only the requested product fields are read from the products collection
+        """
+        db = info.context["db"]
+        current_user = await _current_customer(db, token)
+        limit = page_size(first)
+
+        match = {"user_id": current_user.id}
+        if after:
+            created_at, item_id = decode_cursor(after)
+            match.update(keyset_after(["created_at", "id"], [created_at, item_id]))
+
+        # Project only the fields the client asked for (id is always needed)
+        projection = {"_id": 0, "id": 1}
+        for name in selected_node_fields(info):
+            if name in PRODUCT_FIELD_MAP:
+                projection[PRODUCT_FIELD_MAP[name]] = 1
+
+        # Walks the (user_id, created_at, id) index; the join stops once the page is full
+        pipeline = [
+            {"$match": match},
+            {"$sort": {"created_at": -1, "id": -1}},
+            {
+                "$lookup": {
+                    "from": "products",
+                    "localField": "product_id",
+                    "foreignField": "id",
+                    "pipeline": [
+                        {"$match": {"is_available": True}},  # Only show available products
+                        {"$project": projection}
+                    ],
+                    "as": "product"
+                }
+            },
+            {"$unwind": "$product"},
+            {"$limit": limit + 1},
+            {"$project": {"_id": 0, "id": 1, "created_at": 1, "product": 1}}
+        ]
+
+        rows = await db.wishlists.aggregate(pipeline).to_list(length=limit + 1)
+        has_next_page = len(rows) > limit
+        rows = rows[:limit]
+
+        edges = []
+        for row in rows:
+            product = row["product"]
+            edges.append(ProductServiceEdge(
+                node=ProductServiceGraphQL(
+                    id=product["id"],
+                    name=product.get("name", ""),
+                    description=product.get("description", ""),
+                    type=product.get("type", ""),
+                    category_id=product.get("category_id", ""),
+                    seller_id=product.get("seller_id", ""),
+                    price=product.get("price", 0.0),
+                    images=product.get("images", []),
+                    is_available=product.get("is_available", True),
+                    stock_quantity=product.get("stock_quantity"),
+                    service_duration=product.get("service_duration"),
+                    tags=product.get("tags", []),
+                    created_at=product["created_at"].isoformat() if "created_at" in product else ""
+                ),
+                cursor=encode_cursor(row["created_at"], row["id"])
+            ))
+
+        # Counting wishlist rows is an index-only operation; skip it unless requested
+        total_count = 0
+        if is_selected(info, "totalCount"):
+            total_count = await db.wishlists.count_documents({"user_id": current_user.id})
+
+        return ProductServiceConnection(
+            edges=edges,
+            page_info=PageInfo(
+                has_next_page=has_next_page,
+                has_previous_page=after is not None,
+                start_cursor=edges[0].cursor if edges else None,
+                end_cursor=edges[-1].cursor if edges else None
+            ),
+            total_count=total_count
+        )
+
+    @strawberry.field
+    async def wishlist_count(self, info, token: str) -> int:
+        """
+        Number of items in the user's wishlist (no product documents are read)
+        """
+        db = info.context["db"]
+        current_user = await _current_customer(db, token)
+
+        return await db.wishlists.count_documents({"user_id": current_user.id})
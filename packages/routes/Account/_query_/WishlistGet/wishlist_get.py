@@ -3,6 +3,7 @@ from typing import List
 from packages.types.outputs import ProductServiceGraphQL
 from packages.middleware.auth import AuthMiddleware
 from packages.types.models import UserType
+from packages.utils.cache import product_cache
 
 @strawberry.type
 class WishlistGet:
@@ -21,23 +22,25 @@ class WishlistGet:
         if current_user.user_type != UserType.CUSTOMER:
             raise Exception("Only customers have wishlists")
         
-        # Get wishlist items with product details
-        pipeline = [
-            {"$match": {"user_id": current_user.id}},
-            {
-                "$lookup": {
-                    "from": "products",
-                    "localField": "product_id",
-                    "foreignField": "id",
-                    "as": "product"
-                }
-            },
-            {"$unwind": "$product"},
-            {"$match": {"product.is_available": True}},  # Only show available products
-            {"$replaceRoot": {"newRoot": "$product"}}
-        ]
+        # Get wishlisted product ids, then hydrate them from the product cache
+        wishlist_items = await db.wishlists.find(
+            {"user_id": current_user.id},
+            {"product_id": 1, "_id": 0}
+        ).to_list(length=None)
+        product_ids = [item["product_id"] for item in wishlist_items]
+        
+        async def load_products(missing_ids):
+            products = await db.products.find({"id": {"$in": missing_ids}}).to_list(length=None)
+            return {product["id"]: product for product in products}
         
-        wishlist_products = await db.wishlists.aggregate(pipeline).to_list(length=None)
+        products_by_id = await product_cache.get_many(product_ids, load_products)
+        
+        # Only show available products
+        wishlist_products = [
+            products_by_id[product_id]
+            for product_id in product_ids
+            if products_by_id.get(product_id) and products_by_id[product_id]["is_available"]
+        ]
         
         return [
             ProductServiceGraphQL(
@@ -1,5 +1,8 @@
 from .AccountList import AccountList
 from .AccountGet import AccountGet
 from .WishlistGet import WishlistGet
+from .WishlistConnection import WishlistConnection
+from .AccountConnection import AccountConnection
+from .SellersNear import SellersNear
 
-__all__ = ['AccountList', 'AccountGet', 'WishlistGet']
\ No newline at end of file
+__all__ = ['AccountList', 'AccountGet', 'WishlistGet', 'WishlistConnection', 'AccountConnection', 'SellersNear']
\ No newline at end of file
@@ -7,18 +7,30 @@ Exports all account-related queries
 from .AccountList import AccountList
 from .AccountGet import AccountGet
 from .WishlistGet import WishlistGet
+from .WishlistConnection import WishlistConnection
+from .AccountConnection import AccountConnection
+from .SellersNear import SellersNear
 
 # Export specific queries (like in Node.js structure)
 account_list = AccountList
 account_get = AccountGet
 wishlist_get = WishlistGet
+wishlist_connection = WishlistConnection
+account_connection = AccountConnection
+sellers_near = SellersNear
 
 # Export all queries as a list for easy iteration
 __all__ = [
     'AccountList',
     'AccountGet',
     'WishlistGet',
+    'WishlistConnection',
+    'AccountConnection',
+    'SellersNear',
     'account_list',
     'account_get',
-    'wishlist_get'
+    'wishlist_get',
+    'wishlist_connection',
+    'account_connection',
+    'sellers_near'
 ]
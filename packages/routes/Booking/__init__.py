@@ -0,0 +1,4 @@
+from ._mutation_ import *
+from ._query_ import *
+
+__all__ = ['WorkingHoursSet', 'ServiceBook', 'BookingCancel', 'ServiceSlots', 'SellerBookings']
\ No newline at end of file
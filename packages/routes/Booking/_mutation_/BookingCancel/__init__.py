@@ -0,0 +1,2 @@
+from .booking_cancel import BookingCancel
+__all__ = ['BookingCancel']
@@ -0,0 +1,55 @@
+import strawberry
+from datetime import datetime
+from packages.types.outputs import SuccessResponse
+from packages.middleware.auth import AuthMiddleware
+from packages.types.models import BookingStatus
+from packages.routes.Booking._mutation_.ServiceBook.service_book import release_interval
+
+@strawberry.type
+class BookingCancel:
+    @strawberry.mutation
+    async def booking_cancel(self, info, booking_id: str, token: str) -> SuccessResponse:
+        """
+        Cancel a booking and free its slot
+        Either the booking customer or the seller can cancel
+        """
+        db = info.context["db"]
+
+        current_user = await AuthMiddleware.get_current_user(db, token)
+        if not current_user:
+            raise Exception("Authentication required")
+
+        # Flip the status first so the interval is only released for a cancelled booking. If the
+        # release fails, retrying the cancellation or the next overlapping claim removes it
+        booking = await db.bookings.find_one_and_update(
+            {
+                "id": booking_id,
+                "status": BookingStatus.CONFIRMED,
+                "$or": [{"customer_id": current_user.id}, {"seller_id": current_user.id}]
+            },
+            {"$set": {"status": BookingStatus.CANCELLED, "updated_at": datetime.now()}},
+            projection={"_id": 0, "id": 1, "seller_id": 1, "start": 1}
+        )
+        if not booking:
+            # A retry after a failed release frees the slot the earlier cancellation left claimed
+            cancelled = await db.bookings.find_one(
+                {
+                    "id": booking_id,
+                    "status": BookingStatus.CANCELLED,
+                    "$or": [{"customer_id": current_user.id}, {"seller_id": current_user.id}]
+                },
+                projection={"_id": 0, "id": 1, "seller_id": 1, "start": 1}
+            )
+            if cancelled:
+                await release_interval(db, cancelled)
+            return SuccessResponse(
+                success=False,
+                message="Booking not found or already cancelled"
+            )
+
+        await release_interval(db, booking)
+
+        return SuccessResponse(
+            success=True,
+            message="Booking cancelled successfully"
+        )
@@ -0,0 +1,2 @@
+from .service_book import ServiceBook
+__all__ = ['ServiceBook']
@@ -0,0 +1,157 @@
+import strawberry
+from datetime import datetime, timedelta
+from typing import Optional
+from pymongo.errors import DuplicateKeyError
+from packages.types.outputs import BookingGraphQL
+from packages.middleware.auth import AuthMiddleware
+from packages.types.models import User, UserType, Booking, BookingStatus
+from packages.utils.availability import working_windows, containing_window, to_minutes
+from packages.utils.idempotency import run_idempotent
+from packages.routes.Booking._query_.ServiceSlots.service_slots import (
+    BOOKING_SLOT_STEP_MINUTES, load_service, load_working_hours
+)
+from packages.routes.Booking._query_.SellerBookings.seller_bookings import to_booking_graphql
+
+
+def booking_day(booking: dict) -> dict:
+    """Key of the booking_days document holding a booking's interval"""
+    return {"seller_id": booking["seller_id"], "day": booking["start"].date().isoformat()}
+
+
+async def claim_interval(db, booking: dict) -> bool:
+    """
+    Add the booking's interval to its day document unless it overlaps a booked one
+    The overlap check and the write are a single conditional update, so of two concurrent
+    overlapping bookings exactly one matches
+    """
+    day = booking_day(booking)
+    query = {
+        **day,
+        "intervals": {"$not": {"$elemMatch": {"start": {"$lt": booking["end"]}, "end": {"$gt": booking["start"]}}}}
+    }
+    interval = {"start": booking["start"], "end": booking["end"], "booking_id": booking["id"]}
+    update = {"$push": {"intervals": {"$each": [interval], "$sort": {"start": 1}}}}
+
+    result = await db.booking_days.update_one(query, update)
+    if result.matched_count:
+        return True
+
+    # First booking of the day: create the day document (racing creators hit the unique index), then retry
+    try:
+        await db.booking_days.update_one(day, {"$setOnInsert": {"intervals": []}}, upsert=True)
+    except DuplicateKeyError:
+        pass
+    result = await db.booking_days.update_one(query, update)
+    if result.matched_count:
+        return True
+
+    # An interval left behind by a cancellation whose release failed must not block the slot
+    if await release_cancelled(db, booking):
+        result = await db.booking_days.update_one(query, update)
+        return result.matched_count == 1
+    return False
+
+
+async def release_cancelled(db, booking: dict) -> bool:
+    """Drop the day's intervals overlapping the booking whose bookings are cancelled"""
+    day_doc = await db.booking_days.find_one(booking_day(booking), {"_id": 0, "intervals": 1})
+    overlapping = [
+        interval["booking_id"] for interval in (day_doc or {}).get("intervals", [])
+        if interval["start"] < booking["end"] and interval["end"] > booking["start"]
+    ]
+    if not overlapping:
+        return False
+    cancelled = await db.bookings.distinct(
+        "id", {"id": {"$in": overlapping}, "status": BookingStatus.CANCELLED}
+    )
+    if not cancelled:
+        return False
+    await db.booking_days.update_one(
+        booking_day(booking), {"$pull": {"intervals": {"booking_id": {"$in": cancelled}}}}
+    )
+    return True
+
+
+async def release_interval(db, booking: dict) -> None:
+    await db.booking_days.update_one(booking_day(booking), {"$pull": {"intervals": {"booking_id": booking["id"]}}})
+
+
+@strawberry.type
+class ServiceBook:
+    @strawberry.mutation
+    async def service_book(
+        self,
+        info,
+        service_id: str,
+        start: str,
+        token: str,
+        idempotency_key: Optional[str] = None
+    ) -> BookingGraphQL:
+        """
+        Book a service starting at `start` (ISO 8601) for its service_duration
+        Only customers can book; the slot must lie within the seller's working hours and be free
+        Retries carrying the same idempotency key return the first response
+        """
+        db = info.context["db"]
+
+        # Verify authenticated customer
+        current_user = await AuthMiddleware.get_current_user(db, token)
+        if not current_user:
+            raise Exception("Authentication required")
+
+        if idempotency_key:
+            return await run_idempotent(
+                db, "service_book", current_user.id, idempotency_key, {"service_id": service_id, "start": start},
+                lambda: ServiceBook.book(db, service_id, start, current_user), BookingGraphQL
+            )
+        return await ServiceBook.book(db, service_id, start, current_user)
+
+    @staticmethod
+    async def book(db, service_id: str, start: str, current_user: User) -> BookingGraphQL:
+        if current_user.user_type != UserType.CUSTOMER:
+            raise Exception("Only customers can book services")
+
+        try:
+            start_at = datetime.fromisoformat(start)
+        except ValueError:
+            raise Exception("start must be an ISO 8601 datetime")
+        if start_at.tzinfo is not None:
+            raise Exception("start must be a local time without a UTC offset")
+        if start_at.second or start_at.microsecond:
+            raise Exception("start must be a whole minute")
+        if start_at <= datetime.now():
+            raise Exception("Cannot book a slot in the past")
+
+        service = await load_service(db, service_id)
+        end_at = start_at + timedelta(minutes=service["service_duration"])
+
+        # The booking must fit in one of the day's working windows
+        origin = datetime.combine(start_at.date(), datetime.min.time())
+        windows = working_windows(await load_working_hours(db, service["seller_id"]), start_at.date(), 1)
+        start_minute = to_minutes(start_at, origin)
+        window = containing_window(windows, start_minute, to_minutes(end_at, origin))
+        if window is None:
+            raise Exception("Requested time is outside the provider's working hours")
+        # Only the starts serviceSlots offers, so bookings can't leave gaps no slot fits in
+        if (start_minute - window[0]) % BOOKING_SLOT_STEP_MINUTES:
+            raise Exception(f"start must be on the {BOOKING_SLOT_STEP_MINUTES} minute slot grid of the working hours")
+
+        booking = Booking(
+            seller_id=service["seller_id"],
+            service_id=service_id,
+            customer_id=current_user.id,
+            start=start_at,
+            end=end_at
+        ).dict()
+
+        if not await claim_interval(db, booking):
+            raise Exception("Time slot is no longer available")
+
+        try:
+            await db.bookings.insert_one(dict(booking))
+        except Exception:
+            # Give the slot back if the booking record could not be written
+            await release_interval(db, booking)
+            raise
+
+        return to_booking_graphql(booking)
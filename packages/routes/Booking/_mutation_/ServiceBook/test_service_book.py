@@ -0,0 +1,179 @@
+"""
+Concurrency test script for Service Book API
+Fires concurrent serviceBook calls for overlapping slots of one provider
+and checks the schedule stays consistent:
+- exactly one booking wins, every other call gets "Time slot is no longer available"
+- the provider's day holds exactly one booked interval
+- cancelling the winner frees the slot again
+"""
+
+import asyncio
+import os
+import uuid
+from datetime import date, datetime, timedelta, timezone
+import aiohttp
+from motor.motor_asyncio import AsyncIOMotorClient
+
+# Configuration
+API_URL = "http://localhost:8001/graphql"
+HEADERS = {"Content-Type": "application/json"}
+MONGO_URL = os.environ.get("MONGO_URL", "mongodb://localhost:27017")
+DB_NAME = os.environ.get("DB_NAME", "ecommerce_db")
+CONCURRENCY = 50
+CUSTOMERS = 5
+SERVICE_DURATION = 60
+# Every start overlaps every other one (all lie within one SERVICE_DURATION)
+STARTS = ["10:00", "10:15", "10:30", "10:45"]
+
+REGISTER_MUTATION = """
+mutation AccountRegister($input: UserRegisterInput!) {
+  accountRegister(input: $input) {
+    token
+    user { id }
+    message
+  }
+}
+"""
+
+WORKING_HOURS_MUTATION = """
+mutation WorkingHoursSet($token: String!, $intervals: [WorkingIntervalInput!]!) {
+  workingHoursSet(token: $token, intervals: $intervals) {
+    weekday
+  }
+}
+"""
+
+BOOK_MUTATION = """
+mutation ServiceBook($serviceId: String!, $start: String!, $token: String!) {
+  serviceBook(serviceId: $serviceId, start: $start, token: $token) {
+    id
+    start
+    end
+    status
+  }
+}
+"""
+
+CANCEL_MUTATION = """
+mutation BookingCancel($bookingId: String!, $token: String!) {
+  bookingCancel(bookingId: $bookingId, token: $token) {
+    success
+    message
+  }
+}
+"""
+
+async def graphql_request(session, query, variables=None):
+    """Make a GraphQL request"""
+    payload = {
+        "query": query,
+        "variables": variables or {}
+    }
+
+    async with session.post(API_URL, json=payload, headers=HEADERS) as response:
+        return await response.json()
+
+async def register(session, user_type):
+    """Register a throwaway user and return (user_id, token)"""
+    variables = {
+        "input": {
+            "email": f"booking-{uuid.uuid4().hex[:8]}@example.com",
+            "password": "testpassword",
+            "fullName": "Booking Concurrency Test",
+            "userType": user_type
+        }
+    }
+    if user_type == "SELLER":
+        variables["input"]["sellerType"] = "SERVICE_PROVIDER"
+    result = await graphql_request(session, REGISTER_MUTATION, variables)
+    data = result["data"]["accountRegister"]
+    return data["user"]["id"], data["token"]
+
+async def create_service(db, seller_id):
+    """Insert the service directly; productCreate would need an admin-managed category"""
+    now = datetime.now(timezone.utc)
+    service_id = str(uuid.uuid4())
+    await db.products.insert_one({
+        "id": service_id,
+        "name": "Concurrency Test Service",
+        "description": "Booked concurrently by test_service_book.py",
+        "type": "service",
+        "category_id": "concurrency-test",
+        "seller_id": seller_id,
+        "price": 10.0,
+        "images": [],
+        "is_available": True,
+        "stock_quantity": None,
+        "service_duration": SERVICE_DURATION,
+        "tags": [],
+        "created_at": now,
+        "updated_at": now
+    })
+    return service_id
+
+async def book(session, service_id, start, token):
+    variables = {"serviceId": service_id, "start": start, "token": token}
+    return await graphql_request(session, BOOK_MUTATION, variables)
+
+async def main():
+    """Run the concurrency check"""
+    print("=== Service Book Concurrency Test ===\n")
+
+    client = AsyncIOMotorClient(MONGO_URL)
+    db = client[DB_NAME]
+    day = date.today() + timedelta(days=1)
+
+    try:
+        async with aiohttp.ClientSession() as session:
+            seller_id, seller_token = await register(session, "SELLER")
+            customers = [await register(session, "CUSTOMER") for _ in range(CUSTOMERS)]
+            hours = [{"weekday": weekday, "start": "09:00", "end": "17:00"} for weekday in range(7)]
+            await graphql_request(session, WORKING_HOURS_MUTATION, {"token": seller_token, "intervals": hours})
+            service_id = await create_service(db, seller_id)
+            print(f"Seller {seller_id}, service {service_id}, day {day.isoformat()}")
+
+            tokens = [customers[index % CUSTOMERS][1] for index in range(CONCURRENCY)]
+            tasks = [
+                book(session, service_id, f"{day.isoformat()}T{STARTS[index % len(STARTS)]}:00", tokens[index])
+                for index in range(CONCURRENCY)
+            ]
+            results = await asyncio.gather(*tasks)
+
+            wins = [result["data"]["serviceBook"] for result in results if (result.get("data") or {}).get("serviceBook")]
+            messages = [error["message"] for result in results for error in result.get("errors", [])]
+            conflicts = [message for message in messages if message == "Time slot is no longer available"]
+
+            booking_day = await db.booking_days.find_one({"seller_id": seller_id, "day": day.isoformat()})
+            intervals = booking_day["intervals"] if booking_day else []
+            stored = await db.bookings.count_documents({"service_id": service_id, "status": "confirmed"})
+
+            print(f"Requests: {len(results)}, wins: {len(wins)} (expected 1)")
+            print(f"Conflicts: {len(conflicts)} (expected {CONCURRENCY - 1}), other errors: {len(messages) - len(conflicts)}")
+            print(f"Booked intervals: {len(intervals)} (expected 1)")
+            print(f"Confirmed bookings: {stored} (expected 1)")
+
+            freed = False
+            if len(wins) == 1:
+                winner_token = next(
+                    token for result, token in zip(results, tokens) if (result.get("data") or {}).get("serviceBook")
+                )
+                cancel = await graphql_request(
+                    session, CANCEL_MUTATION, {"bookingId": wins[0]["id"], "token": winner_token}
+                )
+                rebook = await book(session, service_id, f"{day.isoformat()}T{STARTS[0]}:00", customers[0][1])
+                freed = cancel["data"]["bookingCancel"]["success"] and bool((rebook.get("data") or {}).get("serviceBook"))
+                print(f"Slot free again after cancelling: {freed}")
+    finally:
+        client.close()
+
+    ok = (
+        len(wins) == 1
+        and len(conflicts) == CONCURRENCY - 1
+        and len(intervals) == 1
+        and stored == 1
+        and freed
+    )
+    print("\n✅ Consistent" if ok else "\n❌ Inconsistent state detected")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,2 @@
+from .working_hours_set import WorkingHoursSet
+__all__ = ['WorkingHoursSet']
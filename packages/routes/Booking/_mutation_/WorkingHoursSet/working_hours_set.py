@@ -0,0 +1,46 @@
+import strawberry
+from datetime import datetime
+from typing import List
+from packages.types.inputs import WorkingIntervalInput
+from packages.types.outputs import WorkingInterval
+from packages.middleware.auth import AuthMiddleware
+from packages.types.models import UserType
+from packages.utils.availability import parse_clock, format_clock, normalize_weekly
+
+@strawberry.type
+class WorkingHoursSet:
+    @strawberry.mutation
+    async def working_hours_set(self, info, intervals: List[WorkingIntervalInput], token: str) -> List[WorkingInterval]:
+        """
+        Replace the authenticated seller's weekly working hours
+        Existing bookings are kept even if they fall outside the new hours
+        """
+        db = info.context["db"]
+
+        # Verify authenticated seller
+        current_user = await AuthMiddleware.get_current_user(db, token)
+        if not current_user:
+            raise Exception("Authentication required")
+
+        if current_user.user_type != UserType.SELLER:
+            raise Exception("Only sellers can set working hours")
+
+        weekly = normalize_weekly(
+            (interval.weekday, parse_clock(interval.start), parse_clock(interval.end))
+            for interval in intervals
+        )
+
+        await db.working_hours.update_one(
+            {"seller_id": current_user.id},
+            {"$set": {"intervals": weekly, "updated_at": datetime.now()}},
+            upsert=True
+        )
+
+        return [
+            WorkingInterval(
+                weekday=interval["weekday"],
+                start=format_clock(interval["start"]),
+                end=format_clock(interval["end"])
+            )
+            for interval in weekly
+        ]
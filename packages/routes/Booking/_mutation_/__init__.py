@@ -0,0 +1,5 @@
+from .WorkingHoursSet import WorkingHoursSet
+from .ServiceBook import ServiceBook
+from .BookingCancel import BookingCancel
+
+__all__ = ['WorkingHoursSet', 'ServiceBook', 'BookingCancel']
\ No newline at end of file
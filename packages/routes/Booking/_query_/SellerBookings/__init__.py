@@ -0,0 +1,2 @@
+from .seller_bookings import SellerBookings
+__all__ = ['SellerBookings']
@@ -0,0 +1,49 @@
+import strawberry
+from datetime import datetime, timedelta
+from typing import List
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from packages.types.outputs import BookingGraphQL
+from packages.middleware.auth import AuthMiddleware
+from packages.types.models import UserType
+from packages.routes.Booking._query_.ServiceSlots.service_slots import parse_range
+
+
+def to_booking_graphql(booking: dict) -> BookingGraphQL:
+    return BookingGraphQL(
+        id=booking["id"],
+        seller_id=booking["seller_id"],
+        service_id=booking["service_id"],
+        customer_id=booking["customer_id"],
+        start=booking["start"].isoformat(),
+        end=booking["end"].isoformat(),
+        status=booking["status"],
+        created_at=booking["created_at"].isoformat()
+    )
+
+
+@strawberry.type
+class SellerBookings:
+    @strawberry.field
+    async def seller_bookings(self, info, token: str, start_date: str, end_date: str) -> List[BookingGraphQL]:
+        """
+        Get the authenticated seller's bookings between two dates (inclusive), in time order
+        """
+        db: AsyncIOMotorDatabase = info.context["db"]
+
+        current_user = await AuthMiddleware.get_current_user(db, token)
+        if not current_user:
+            raise Exception("Authentication required")
+
+        if current_user.user_type != UserType.SELLER:
+            raise Exception("Only sellers can view their bookings")
+
+        first_day, days = parse_range(start_date, end_date)
+        range_start = datetime.combine(first_day, datetime.min.time())
+
+        # Walks the (seller_id, start) index
+        bookings = await db.bookings.find(
+            {"seller_id": current_user.id, "start": {"$gte": range_start, "$lt": range_start + timedelta(days=days)}},
+            {"_id": 0}
+        ).sort("start", 1).to_list(length=None)
+
+        return [to_booking_graphql(booking) for booking in bookings]
@@ -0,0 +1,2 @@
+from .service_slots import ServiceSlots
+__all__ = ['ServiceSlots']
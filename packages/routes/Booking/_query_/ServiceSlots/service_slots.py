@@ -0,0 +1,98 @@
+import asyncio
+import os
+import strawberry
+from datetime import date, datetime, timedelta
+from typing import List
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from packages.types.outputs import ServiceSlot
+from packages.utils.availability import working_windows, free_slots, to_minutes, from_minutes
+
+BOOKING_SLOT_STEP_MINUTES = int(os.environ.get("BOOKING_SLOT_STEP_MINUTES", "15"))
+BOOKING_MAX_RANGE_DAYS = int(os.environ.get("BOOKING_MAX_RANGE_DAYS", "31"))
+
+
+def parse_day(value: str, name: str) -> date:
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise Exception(f"{name} must be a date (YYYY-MM-DD)")
+
+
+def parse_range(start_date: str, end_date: str) -> tuple:
+    """(first day, number of days) of an inclusive date range"""
+    first_day = parse_day(start_date, "start_date")
+    days = (parse_day(end_date, "end_date") - first_day).days + 1
+    if days < 1:
+        raise Exception("end_date must not be before start_date")
+    if days > BOOKING_MAX_RANGE_DAYS:
+        raise Exception(f"Date range cannot exceed {BOOKING_MAX_RANGE_DAYS} days")
+    return first_day, days
+
+
+async def load_service(db, service_id: str) -> dict:
+    service = await db.products.find_one(
+        {"id": service_id, "type": "service", "is_available": True},
+        {"_id": 0, "id": 1, "seller_id": 1, "service_duration": 1}
+    )
+    if not service:
+        raise Exception("Service not found or not available")
+    if not service.get("service_duration") or service["service_duration"] <= 0:
+        raise Exception("Service has no duration")
+    return service
+
+
+async def load_working_hours(db, seller_id: str) -> List[dict]:
+    hours = await db.working_hours.find_one({"seller_id": seller_id}, {"_id": 0, "intervals": 1})
+    return hours["intervals"] if hours else []
+
+
+async def load_booked(db, seller_id: str, first_day: date, days: int) -> List[tuple]:
+    """Booked intervals of the range in minutes from its first midnight, sorted by start"""
+    origin = datetime.combine(first_day, datetime.min.time())
+    last_day = first_day + timedelta(days=days - 1)
+    booked = []
+    cursor = db.booking_days.find(
+        {"seller_id": seller_id, "day": {"$gte": first_day.isoformat(), "$lte": last_day.isoformat()}},
+        {"_id": 0, "intervals": 1}
+    ).sort("day", 1)
+    # Intervals are kept sorted within each day document
+    async for booking_day in cursor:
+        booked += [
+            (to_minutes(interval["start"], origin), to_minutes(interval["end"], origin))
+            for interval in booking_day["intervals"]
+        ]
+    return booked
+
+
+@strawberry.type
+class ServiceSlots:
+    @strawberry.field
+    async def service_slots(self, info, service_id: str, start_date: str, end_date: str) -> List[ServiceSlot]:
+        """
+        Get the free slots of a service between two dates (inclusive), earliest first
+        """
+        db: AsyncIOMotorDatabase = info.context["db"]
+        first_day, days = parse_range(start_date, end_date)
+        service = await load_service(db, service_id)
+
+        weekly, booked = await asyncio.gather(
+            load_working_hours(db, service["seller_id"]),
+            load_booked(db, service["seller_id"], first_day, days)
+        )
+
+        origin = datetime.combine(first_day, datetime.min.time())
+        duration = service["service_duration"]
+        slots = free_slots(
+            working_windows(weekly, first_day, days),
+            booked,
+            duration,
+            BOOKING_SLOT_STEP_MINUTES,
+            not_before=max(0, to_minutes(datetime.now(), origin) + 1)
+        )
+        return [
+            ServiceSlot(
+                start=from_minutes(start, origin).isoformat(),
+                end=from_minutes(start + duration, origin).isoformat()
+            )
+            for start in slots
+        ]
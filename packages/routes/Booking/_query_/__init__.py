@@ -0,0 +1,4 @@
+from .ServiceSlots import ServiceSlots
+from .SellerBookings import SellerBookings
+
+__all__ = ['ServiceSlots', 'SellerBookings']
\ No newline at end of file
@@ -6,6 +6,7 @@ from packages.types.inputs import CategoryInput
 from packages.types.outputs import CategoryGraphQL
 from packages.middleware.auth import AuthMiddleware
 from packages.types.models import UserType, AdminRole, Category
+from packages.utils.singleflight import category_reads
 
 @strawberry.type
 class CategoryCreate:
@@ -36,6 +37,7 @@ class CategoryCreate:
         
         category = Category(**category_data)
         await db.categories.insert_one(category.dict())
+        category_reads.forget("active")
         
         return CategoryGraphQL(
             id=category.id,
@@ -2,6 +2,7 @@ import strawberry
 from typing import List
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from packages.types.outputs import CategoryGraphQL
+from packages.utils.singleflight import category_reads
 
 @strawberry.type
 class CategoryList:
@@ -11,7 +12,11 @@ class CategoryList:
         Get list of all categories
         """
         db: AsyncIOMotorDatabase = info.context["db"]
-        categories = await db.categories.find({"is_active": True}).to_list(1000)
+        # Concurrent list calls (e.g. cold caches after a deploy) share one query
+        categories = await category_reads.do(
+            "active",
+            lambda: db.categories.find({"is_active": True}).to_list(1000)
+        )
         return [
             CategoryGraphQL(
                 id=cat["id"],
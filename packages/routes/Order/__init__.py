@@ -0,0 +1,4 @@
+from ._mutation_ import *
+from ._query_ import *
+
+__all__ = ['SellerStats', 'OrderList']
\ No newline at end of file
@@ -0,0 +1,2 @@
+from .order_list import OrderList
+__all__ = ['OrderList']
@@ -0,0 +1,166 @@
+import strawberry
+from typing import Dict, Optional
+from packages.types.outputs import (
+    OrderGraphQL, OrderItemGraphQL, OrderAddressGraphQL, OrderConnection, OrderEdge, PageInfo, ProductServiceGraphQL
+)
+from packages.middleware.auth import AuthMiddleware
+from packages.types.models import UserType
+from packages.utils.cache import product_cache
+from packages.utils.pagination import (
+    encode_cursor, decode_cursor, page_size, keyset_after, is_selected, is_path_selected
+)
+
+# Never return rollup bookkeeping
+ORDER_PROJECTION = {"_id": 0, "rolled_up": 0}
+
+
+def _address(address: Optional[dict]) -> Optional[OrderAddressGraphQL]:
+    if not address:
+        return None
+    location = address.get("location")
+    longitude, latitude = location["coordinates"] if location else (None, None)
+    return OrderAddressGraphQL(
+        street=address.get("street"),
+        city=address.get("city"),
+        state=address.get("state"),
+        postal_code=address.get("postal_code"),
+        country=address.get("country"),
+        latitude=latitude,
+        longitude=longitude
+    )
+
+
+def _product(product: Optional[dict]) -> Optional[ProductServiceGraphQL]:
+    if not product:
+        return None
+    return ProductServiceGraphQL(
+        id=product["id"],
+        name=product["name"],
+        description=product["description"],
+        type=product["type"],
+        category_id=product["category_id"],
+        seller_id=product["seller_id"],
+        price=product["price"],
+        images=product.get("images", []),
+        is_available=product["is_available"],
+        stock_quantity=product.get("stock_quantity"),
+        service_duration=product.get("service_duration"),
+        tags=product.get("tags", []),
+        created_at=product["created_at"].isoformat()
+    )
+
+
+async def order_connection(info, owner_field: str, owner_id: str, first: Optional[int], after: Optional[str]) -> OrderConnection:
+    """A page of one customer's or seller's orders, newest first"""
+    db = info.context["db"]
+    limit = page_size(first)
+
+    match = {owner_field: owner_id}
+    if after:
+        created_at, order_id = decode_cursor(after)
+        match.update(keyset_after(["created_at", "id"], [created_at, order_id]))
+
+    # Walks the (owner, created_at, id) index
+    orders = await db.orders.find(match, ORDER_PROJECTION) \
+        .sort([("created_at", -1), ("id", -1)]) \
+        .limit(limit + 1) \
+        .to_list(length=limit + 1)
+    has_next_page = len(orders) > limit
+    orders = orders[:limit]
+
+    # Item products of the whole page in one batched cache lookup, only when requested
+    products_by_id: Dict[str, Optional[dict]] = {}
+    if is_path_selected(info, "edges", "node", "items", "product"):
+        async def load_products(missing_ids):
+            products = await db.products.find({"id": {"$in": missing_ids}}).to_list(length=None)
+            return {product["id"]: product for product in products}
+
+        product_ids = [item["product_service_id"] for order in orders for item in order.get("items", [])]
+        products_by_id = await product_cache.get_many(product_ids, load_products)
+
+    edges = [
+        OrderEdge(
+            node=OrderGraphQL(
+                id=order["id"],
+                customer_id=order["customer_id"],
+                seller_id=order["seller_id"],
+                items=[
+                    OrderItemGraphQL(
+                        product_service_id=item["product_service_id"],
+                        quantity=item.get("quantity", 1),
+                        price=item["price"],
+                        product=_product(products_by_id.get(item["product_service_id"]))
+                    )
+                    for item in order.get("items", [])
+                ],
+                total_amount=order["total_amount"],
+                status=order["status"],
+                delivery_address=_address(order.get("delivery_address")),
+                special_instructions=order.get("special_instructions"),
+                created_at=order["created_at"].isoformat()
+            ),
+            cursor=encode_cursor(order["created_at"], order["id"])
+        )
+        for order in orders
+    ]
+
+    # Counting can touch many index entries; only do it when asked
+    total_count = 0
+    if is_selected(info, "totalCount"):
+        total_count = await db.orders.count_documents({owner_field: owner_id})
+
+    return OrderConnection(
+        edges=edges,
+        page_info=PageInfo(
+            has_next_page=has_next_page,
+            has_previous_page=after is not None,
+            start_cursor=edges[0].cursor if edges else None,
+            end_cursor=edges[-1].cursor if edges else None
+        ),
+        total_count=total_count
+    )
+
+
+@strawberry.type
+class OrderList:
+    @strawberry.field
+    async def orders_for_customer(
+        self,
+        info,
+        token: str,
+        first: Optional[int] = 20,
+        after: Optional[str] = None
+    ) -> OrderConnection:
+        """
+        Get a page of the authenticated customer's orders, newest first
+        """
+        db = info.context["db"]
+        current_user = await AuthMiddleware.get_current_user(db, token)
+        if not current_user:
+            raise Exception("Authentication required")
+
+        if current_user.user_type != UserType.CUSTOMER:
+            raise Exception("Only customers can list their orders")
+
+        return await order_connection(info, "customer_id", current_user.id, first, after)
+
+    @strawberry.field
+    async def orders_for_seller(
+        self,
+        info,
+        token: str,
+        first: Optional[int] = 20,
+        after: Optional[str] = None
+    ) -> OrderConnection:
+        """
+        Get a page of the orders placed with the authenticated seller, newest first
+        """
+        db = info.context["db"]
+        current_user = await AuthMiddleware.get_current_user(db, token)
+        if not current_user:
+            raise Exception("Authentication required")
+
+        if current_user.user_type != UserType.SELLER:
+            raise Exception("Only sellers can list their received orders")
+
+        return await order_connection(info, "seller_id", current_user.id, first, after)
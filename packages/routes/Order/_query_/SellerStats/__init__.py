@@ -0,0 +1,2 @@
+from .seller_stats import SellerStats
+__all__ = ['SellerStats']
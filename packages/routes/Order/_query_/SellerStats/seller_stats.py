@@ -0,0 +1,97 @@
+import asyncio
+import os
+import strawberry
+from datetime import date, timedelta
+from typing import Optional
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from packages.engines.sales import sales_rollups
+from packages.pattern.events import ORDER_PLACED, ORDER_STATUS_CHANGED, events
+from packages.types.outputs import SellerSalesStats, SellerDailySales, ProductSales
+from packages.middleware.auth import AuthMiddleware
+from packages.types.models import UserType
+
+SELLER_STATS_MAX_RANGE_DAYS = int(os.environ.get("SELLER_STATS_MAX_RANGE_DAYS", "366"))
+MAX_TOP_PRODUCTS = 50
+
+# Keep the daily rollups in step with orders placed or updated in this worker
+events.subscribe(ORDER_PLACED, sales_rollups.on_order_placed)
+events.subscribe(ORDER_STATUS_CHANGED, sales_rollups.on_order_status_changed)
+
+
+def _parse_day(value: str, name: str) -> date:
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise Exception(f"{name} must be a date (YYYY-MM-DD)")
+
+
+@strawberry.type
+class SellerStats:
+    @strawberry.field
+    async def seller_stats(
+        self,
+        info,
+        token: str,
+        start_date: str,
+        end_date: str,
+        top: Optional[int] = 10
+    ) -> SellerSalesStats:
+        """
+        Get the authenticated seller's revenue, units and orders per day and their best-selling
+        products between two dates (inclusive), read from the daily rollups
+        """
+        db: AsyncIOMotorDatabase = info.context["db"]
+
+        current_user = await AuthMiddleware.get_current_user(db, token)
+        if not current_user:
+            raise Exception("Authentication required")
+
+        if current_user.user_type != UserType.SELLER:
+            raise Exception("Only sellers can view sales statistics")
+
+        first_day = _parse_day(start_date, "start_date")
+        last_day = _parse_day(end_date, "end_date")
+        days = (last_day - first_day).days + 1
+        if days < 1:
+            raise Exception("end_date must not be before start_date")
+        if days > SELLER_STATS_MAX_RANGE_DAYS:
+            raise Exception(f"Date range cannot exceed {SELLER_STATS_MAX_RANGE_DAYS} days")
+        top = max(0, min(top or 0, MAX_TOP_PRODUCTS))
+
+        day_range = {"$gte": first_day.isoformat(), "$lte": last_day.isoformat()}
+        # Both read the (seller_id, day, product_id) index
+        totals_query = db.seller_daily_sales.find(
+            {"seller_id": current_user.id, "day": day_range, "product_id": None},
+            {"_id": 0, "day": 1, "revenue": 1, "units": 1, "orders": 1}
+        ).to_list(length=None)
+        products_query = db.seller_daily_sales.aggregate([
+            {"$match": {"seller_id": current_user.id, "day": day_range, "product_id": {"$ne": None}}},
+            {"$group": {"_id": "$product_id", "revenue": {"$sum": "$revenue"}, "units": {"$sum": "$units"}}},
+            {"$match": {"units": {"$gt": 0}}},
+            {"$sort": {"revenue": -1, "_id": 1}},
+            {"$limit": max(top, 1)}
+        ]).to_list(length=None)
+        totals, products = await asyncio.gather(totals_query, products_query)
+
+        by_day = {row["day"]: row for row in totals}
+        daily = []
+        for offset in range(days):
+            day = (first_day + timedelta(days=offset)).isoformat()
+            row = by_day.get(day, {})
+            daily.append(SellerDailySales(
+                day=day,
+                revenue=round(row.get("revenue", 0.0), 2),
+                units=row.get("units", 0),
+                orders=row.get("orders", 0)
+            ))
+
+        return SellerSalesStats(
+            revenue=round(sum(row["revenue"] for row in totals), 2),
+            units=sum(row.units for row in daily),
+            orders=sum(row.orders for row in daily),
+            days=daily,
+            top_products=[
+                ProductSales(product_id=row["_id"], revenue=round(row["revenue"], 2), units=row["units"])
+                for row in products[:top]
+            ]
+        )
@@ -0,0 +1,4 @@
+from .SellerStats import SellerStats
+from .OrderList import OrderList
+
+__all__ = ['SellerStats', 'OrderList']
\ No newline at end of file
@@ -1,4 +1,4 @@
 from ._mutation_ import *
 from ._query_ import *
 
-__all__ = ['ProductCreate', 'ProductUpdate', 'ProductList', 'ProductGet']
\ No newline at end of file
+__all__ = ['ProductCreate', 'ProductUpdate', 'ProductList', 'ProductGet', 'ProductFacets', 'ProductSuggest', 'ProductRecommendations', 'TrendingProducts']
\ No newline at end of file
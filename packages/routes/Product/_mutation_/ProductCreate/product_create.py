@@ -6,23 +6,42 @@ from typing import List, Optional
 from packages.types.inputs import ProductServiceInput
 from packages.types.outputs import ProductServiceGraphQL
 from packages.middleware.auth import AuthMiddleware
-from packages.types.models import UserType, SellerType, ProductService, ProductServiceType
+from packages.types.models import User, UserType, SellerType, ProductService, ProductServiceType
+from packages.utils.cache import product_cache
+from packages.pattern.events import PRODUCT_CHANGED, events
+from packages.utils.idempotency import run_idempotent
 
 @strawberry.type
 class ProductCreate:
     @strawberry.mutation
-    async def product_create(self, info, input: ProductServiceInput, token: str) -> ProductServiceGraphQL:
+    async def product_create(
+        self,
+        info,
+        input: ProductServiceInput,
+        token: str,
+        idempotency_key: Optional[str] = None
+    ) -> ProductServiceGraphQL:
         """
         Create a new product/service with category validation
         Only sellers can create products
+        Retries carrying the same idempotency key return the first response
         """
         db = info.context["db"]
-        
+
         # Verify authenticated seller
         current_user = await AuthMiddleware.get_current_user(db, token)
         if not current_user:
             raise Exception("Authentication required")
-        
+
+        if idempotency_key:
+            return await run_idempotent(
+                db, "product_create", current_user.id, idempotency_key, input,
+                lambda: ProductCreate.create(db, input, current_user), ProductServiceGraphQL
+            )
+        return await ProductCreate.create(db, input, current_user)
+
+    @staticmethod
+    async def create(db, input: ProductServiceInput, current_user: User) -> ProductServiceGraphQL:
         if current_user.user_type != UserType.SELLER:
             raise Exception("Only sellers can create products")
         
@@ -69,6 +88,11 @@ class ProductCreate:
         
         product = ProductService(**product_data)
         await db.products.insert_one(product.dict())
+        try:
+            await product_cache.invalidate(product.id)
+        finally:
+            # The write is committed; listeners must hear about it either way
+            await events.publish(PRODUCT_CHANGED, db=db, product_id=product.id)
         
         return ProductServiceGraphQL(
             id=product.id,
@@ -4,6 +4,8 @@ from packages.types.inputs import ProductServiceUpdateInput
 from packages.types.outputs import SuccessResponse
 from packages.middleware.auth import AuthMiddleware
 from packages.types.models import UserType
+from packages.utils.cache import product_cache
+from packages.pattern.events import PRODUCT_CHANGED, events
 
 @strawberry.type
 class ProductUpdate:
@@ -63,6 +65,11 @@ class ProductUpdate:
             {"id": product_id},
             {"$set": update_data}
         )
+        try:
+            await product_cache.invalidate(product_id)
+        finally:
+            # The write is committed; listeners must hear about it either way
+            await events.publish(PRODUCT_CHANGED, db=db, product_id=product_id)
         
         if result.modified_count == 0:
             return SuccessResponse(
@@ -0,0 +1,2 @@
+from .product_facets import ProductFacets
+__all__ = ['ProductFacets']
\ No newline at end of file
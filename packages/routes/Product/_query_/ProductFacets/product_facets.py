@@ -0,0 +1,101 @@
+import json
+import os
+import strawberry
+from typing import Optional
+from packages.pattern.events import PRODUCT_CHANGED, events
+from packages.types.inputs import ProductFilterInput
+from packages.types.outputs import FacetCount, PriceBucketCount, ProductFacets as ProductFacetsGraphQL
+from packages.routes.Product._query_.ProductList.product_list import build_product_filter
+from packages.utils.cache import LRUCache
+from packages.utils.singleflight import SingleFlight
+
+PRODUCT_FACETS_TTL = float(os.environ.get("PRODUCT_FACETS_TTL", "30"))
+PRODUCT_FACETS_CACHE_SIZE = 1000
+# Most frequent values returned per facet
+FACET_LIMIT = 50
+# Lower bounds of the price buckets; the last bucket is open-ended
+PRICE_BUCKET_BOUNDARIES = [0, 10, 25, 50, 100, 250, 500, 1000]
+
+# Facet results per filter signature; cleared whenever a product changes
+facets_cache = LRUCache(PRODUCT_FACETS_CACHE_SIZE, ttl=PRODUCT_FACETS_TTL)
+facet_reads = SingleFlight("product_facets", freshness=0)
+_generation = 0
+
+
+async def invalidate_facets(**payload):
+    global _generation
+    _generation += 1
+    facets_cache.clear()
+
+events.subscribe(PRODUCT_CHANGED, invalidate_facets)
+
+
+def facets_pipeline(filter_query: dict) -> list:
+    """Every facet in one pass over the matching products"""
+    def top(field):
+        return [{"$sortByCount": f"${field}"}, {"$limit": FACET_LIMIT}]
+
+    return [
+        {"$match": filter_query},
+        {"$facet": {
+            "total": [{"$count": "count"}],
+            "categories": top("category_id"),
+            "types": top("type"),
+            "sellers": top("seller_id"),
+            "price_buckets": [{
+                "$bucket": {
+                    "groupBy": "$price",
+                    "boundaries": PRICE_BUCKET_BOUNDARIES,
+                    # Prices at or above the last boundary share the open-ended bucket
+                    "default": PRICE_BUCKET_BOUNDARIES[-1],
+                    "output": {"count": {"$sum": 1}}
+                }
+            }]
+        }}
+    ]
+
+
+def _to_graphql(result: dict) -> ProductFacetsGraphQL:
+    def counts(rows):
+        return [FacetCount(value=str(row["_id"]), count=row["count"]) for row in rows if row["_id"] is not None]
+
+    upper = dict(zip(PRICE_BUCKET_BOUNDARIES, PRICE_BUCKET_BOUNDARIES[1:]))
+    return ProductFacetsGraphQL(
+        total=result["total"][0]["count"] if result["total"] else 0,
+        categories=counts(result["categories"]),
+        types=counts(result["types"]),
+        sellers=counts(result["sellers"]),
+        price_buckets=[
+            PriceBucketCount(min_price=row["_id"], max_price=upper.get(row["_id"]), count=row["count"])
+            for row in result["price_buckets"]
+        ]
+    )
+
+
+@strawberry.type
+class ProductFacets:
+    @strawberry.field
+    async def product_facets(self, info, filters: Optional[ProductFilterInput] = None) -> ProductFacetsGraphQL:
+        """
+        Get product counts by category, type, seller and price bucket
+        Results are cached per filter for PRODUCT_FACETS_TTL seconds and dropped on product changes
+        """
+        db = info.context["db"]
+        filter_query = build_product_filter(filters)
+        signature = json.dumps(filter_query, sort_keys=True, default=str)
+
+        cached = facets_cache.get(signature, None)
+        if cached is not None:
+            return cached
+
+        async def load():
+            generation = _generation
+            results = await db.products.aggregate(facets_pipeline(filter_query)).to_list(length=1)
+            facets = _to_graphql(results[0])
+            # Don't cache a result computed across an invalidation
+            if generation == _generation:
+                facets_cache.set(signature, facets)
+            return facets
+
+        # Concurrent misses for the same filter share one aggregation
+        return await facet_reads.do(signature, load)
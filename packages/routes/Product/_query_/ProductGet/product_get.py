@@ -1,6 +1,8 @@
 import strawberry
 from typing import Optional
 from packages.types.outputs import ProductServiceGraphQL
+from packages.utils.cache import product_cache
+from packages.pattern.events import PRODUCT_VIEWED, events
 
 @strawberry.type
 class ProductGet:
@@ -11,9 +13,14 @@ class ProductGet:
         """
         db = info.context["db"]
         
-        product = await db.products.find_one({"id": product_id})
+        # Served from the product cache; concurrent misses share one query
+        product = await product_cache.get(
+            product_id,
+            lambda: db.products.find_one({"id": product_id})
+        )
         
         if product:
+            await events.publish(PRODUCT_VIEWED, db=db, product_id=product["id"], category_id=product["category_id"])
             return ProductServiceGraphQL(
                 id=product["id"],
                 name=product["name"],
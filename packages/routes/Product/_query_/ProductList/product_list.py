@@ -1,6 +1,135 @@
 import strawberry
-from typing import List, Optional
+import time
+from typing import Dict, List, Optional
+from pymongo.errors import OperationFailure
+from packages.context.indexes import PRODUCT_LIST_INDEXES
+from packages.engines.catalog import CATALOG_ENGINE, catalog_snapshot
+from packages.pattern.events import PRODUCT_CHANGED, events
+from packages.types.inputs import ProductFilterInput, ProductSortField, SortDirection
+from packages.types.models import ProductServiceType
 from packages.types.outputs import ProductServiceGraphQL
+from packages.utils.cache import product_cache
+from packages.utils.metrics import metrics
+
+# Equality filters that can lead a list index, most selective first
+LIST_INDEX_SCOPES = ["seller_id", "category_id", "tags", None]
+# MongoDB's BadValue, returned for a hint naming an index that doesn't exist
+BAD_VALUE = 2
+# How long a missing list index is served unhinted before checking for it again
+MISSING_INDEX_RECHECK_SECONDS = 60
+
+# List index name -> when to check again whether it exists
+_missing_indexes: Dict[str, float] = {}
+
+
+def plan_product_list(filter_query: dict, sort_field: str) -> str:
+    """
+    Pick the declared index serving this filter and sort (equality, sort, id)
+    Raises when only an in-memory sort over the whole collection could answer the query
+    """
+    for scope in LIST_INDEX_SCOPES:
+        if scope is not None and scope not in filter_query:
+            continue
+        index = PRODUCT_LIST_INDEXES.get((scope, sort_field))
+        if index is not None:
+            return index.document["name"]
+
+    scopes = sorted({scope for scope, field in PRODUCT_LIST_INDEXES if field == sort_field and scope})
+    raise Exception(f"Sorting by {sort_field} requires a filter on one of: {', '.join(scopes)}")
+
+
+def build_product_filter(filter: Optional[ProductFilterInput]) -> dict:
+    """Translate ProductFilterInput into a products query"""
+    filter_query = {}
+    if filter is None:
+        return filter_query
+
+    if filter.category_id:
+        filter_query["category_id"] = filter.category_id
+    if filter.seller_id:
+        filter_query["seller_id"] = filter.seller_id
+    if filter.is_available is not None:
+        filter_query["is_available"] = filter.is_available
+    if filter.product_type:
+        filter_query["type"] = filter.product_type
+    if filter.tags:
+        filter_query["tags"] = {"$all": filter.tags}
+
+    if filter.min_price is not None and filter.max_price is not None and filter.min_price > filter.max_price:
+        raise Exception("min_price cannot be greater than max_price")
+    price = {}
+    if filter.min_price is not None:
+        price["$gte"] = filter.min_price
+    if filter.max_price is not None:
+        price["$lte"] = filter.max_price
+    if price:
+        filter_query["price"] = price
+
+    # Only products have stock: in_stock selects products and never matches services
+    if filter.in_stock is not None:
+        if filter.product_type and filter.product_type != ProductServiceType.PRODUCT:
+            raise Exception("in_stock only applies to products")
+        filter_query["stock_quantity"] = {"$gt": 0} if filter.in_stock else {"$lte": 0}
+
+    return filter_query
+
+
+async def query_snapshot(db, filters: ProductFilterInput, sort_field: str, descending: bool, limit: int) -> List[dict]:
+    """Resolve the page of ids from the catalog snapshot, then hydrate only those products"""
+    product_ids = catalog_snapshot.query(filters, sort_field, descending, limit)
+
+    async def load_products(missing_ids):
+        products = await db.products.find({"id": {"$in": missing_ids}}).to_list(length=None)
+        return {product["id"]: product for product in products}
+
+    products_by_id = await product_cache.get_many(product_ids, load_products)
+    return [products_by_id[product_id] for product_id in product_ids if products_by_id.get(product_id)]
+
+
+async def check_list_indexes(db) -> None:
+    """Record which planned list indexes are missing (run at startup, after ensure_indexes)"""
+    existing = await db.products.index_information()
+    recheck_at = time.monotonic() + MISSING_INDEX_RECHECK_SECONDS
+    _missing_indexes.clear()
+    for index in PRODUCT_LIST_INDEXES.values():
+        name = index.document["name"]
+        if name not in existing:
+            print(f"ERROR: products index {name} is missing; productList queries it serves will sort in memory")
+            _missing_indexes[name] = recheck_at
+
+
+async def query_indexed(db, filter_query: dict, sort_field: str, order: int, limit: int, index_name: str) -> List[dict]:
+    """
+    Read the page through the planned index
+    Only an index known to be missing (or still building) is bypassed; the unhinted query then
+    sorts in memory, which the limit keeps to a top-k sort
+    """
+    def page(hint: Optional[str]):
+        cursor = db.products.find(filter_query).sort([(sort_field, order), ("id", order)])
+        if hint:
+            cursor = cursor.hint(hint)
+        return cursor.limit(limit).to_list(length=limit)
+
+    recheck_at = _missing_indexes.get(index_name)
+    if recheck_at is not None and time.monotonic() < recheck_at:
+        metrics.incr("product_list.hint_fallback")
+        return await page(None)
+
+    try:
+        products = await page(index_name)
+    except OperationFailure as e:
+        if e.code != BAD_VALUE or index_name in await db.products.index_information():
+            raise
+        _missing_indexes[index_name] = time.monotonic() + MISSING_INDEX_RECHECK_SECONDS
+        metrics.incr("product_list.hint_fallback")
+        return await page(None)
+    _missing_indexes.pop(index_name, None)
+    return products
+
+
+if CATALOG_ENGINE == "snapshot":
+    events.subscribe(PRODUCT_CHANGED, catalog_snapshot.apply_change)
+
 
 @strawberry.type
 class ProductList:
@@ -12,31 +141,45 @@ class ProductList:
         seller_id: Optional[str] = None,
         is_available: Optional[bool] = None,
         product_type: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        in_stock: Optional[bool] = None,
+        tags: Optional[List[str]] = None,
+        sort_by: Optional[ProductSortField] = ProductSortField.CREATED_AT,
+        direction: Optional[SortDirection] = SortDirection.DESC,
         limit: Optional[int] = 50
     ) -> List[ProductServiceGraphQL]:
         """
-        Get list of products with optional filters
+        Get list of products with optional filters, sorted by price, creation date or name
         """
         db = info.context["db"]
         
         # Build filter query
-        filter_query = {}
-        
-        if category_id:
-            filter_query["category_id"] = category_id
-        if seller_id:
-            filter_query["seller_id"] = seller_id
-        if is_available is not None:
-            filter_query["is_available"] = is_available
-        if product_type:
-            filter_query["type"] = product_type
+        filters = ProductFilterInput(
+            category_id=category_id,
+            seller_id=seller_id,
+            is_available=is_available,
+            product_type=product_type,
+            min_price=min_price,
+            max_price=max_price,
+            in_stock=in_stock,
+            tags=tags
+        )
+        filter_query = build_product_filter(filters)
         
         # Apply limit
         if limit is None or limit > 100:
             limit = 50
-        
-        products = await db.products.find(filter_query).limit(limit).to_list(length=limit)
-        
+
+        sort_field = (sort_by or ProductSortField.CREATED_AT).value
+        order = 1 if direction == SortDirection.ASC else -1
+        index_name = plan_product_list(filter_query, sort_field)
+
+        if CATALOG_ENGINE == "snapshot" and catalog_snapshot.ready:
+            products = await query_snapshot(db, filters, sort_field, order == -1, limit)
+        else:
+            products = await query_indexed(db, filter_query, sort_field, order, limit, index_name)
+
         return [
             ProductServiceGraphQL(
                 id=product["id"],
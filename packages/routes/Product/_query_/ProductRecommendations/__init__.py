@@ -0,0 +1,2 @@
+from .product_recommendations import ProductRecommendations
+__all__ = ['ProductRecommendations']
\ No newline at end of file
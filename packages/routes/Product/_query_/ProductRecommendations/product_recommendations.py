@@ -0,0 +1,61 @@
+import strawberry
+from typing import List, Optional
+from packages.engines.recommend import RECOMMEND_TOP_K, recommendation_index
+from packages.pattern.events import WISHLIST_ADDED, WISHLIST_REMOVED, events
+from packages.types.outputs import ProductServiceGraphQL
+from packages.utils.cache import product_cache
+
+# Keep co-occurrence counts in step with wishlist writes in this worker
+events.subscribe(WISHLIST_ADDED, recommendation_index.on_wishlist_added)
+events.subscribe(WISHLIST_REMOVED, recommendation_index.on_wishlist_removed)
+
+
+@strawberry.type
+class ProductRecommendations:
+    @strawberry.field
+    async def product_recommendations(
+        self,
+        info,
+        product_id: str,
+        limit: Optional[int] = 10
+    ) -> List[ProductServiceGraphQL]:
+        """
+        Get products most often wishlisted together with the given product
+        """
+        db = info.context["db"]
+
+        if limit is None or limit < 1 or limit > RECOMMEND_TOP_K:
+            limit = 10
+
+        # All kept neighbours are fetched so unavailable ones can be skipped
+        product_ids = recommendation_index.recommend(product_id, RECOMMEND_TOP_K)
+
+        async def load_products(missing_ids):
+            products = await db.products.find({"id": {"$in": missing_ids}}).to_list(length=None)
+            return {product["id"]: product for product in products}
+
+        products_by_id = await product_cache.get_many(product_ids, load_products)
+        recommended = [
+            products_by_id[product_id]
+            for product_id in product_ids
+            if products_by_id.get(product_id) and products_by_id[product_id]["is_available"]
+        ][:limit]
+
+        return [
+            ProductServiceGraphQL(
+                id=product["id"],
+                name=product["name"],
+                description=product["description"],
+                type=product["type"],
+                category_id=product["category_id"],
+                seller_id=product["seller_id"],
+                price=product["price"],
+                images=product.get("images", []),
+                is_available=product["is_available"],
+                stock_quantity=product.get("stock_quantity"),
+                service_duration=product.get("service_duration"),
+                tags=product.get("tags", []),
+                created_at=product["created_at"].isoformat()
+            )
+            for product in recommended
+        ]
@@ -0,0 +1,2 @@
+from .product_suggest import ProductSuggest
+__all__ = ['ProductSuggest']
\ No newline at end of file
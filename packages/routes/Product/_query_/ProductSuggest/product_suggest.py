@@ -0,0 +1,22 @@
+import strawberry
+from typing import List, Optional
+from packages.engines.suggest import suggest_index
+from packages.pattern.events import PRODUCT_CHANGED, events
+from packages.types.outputs import ProductSuggestion
+
+# Keep the typeahead index in step with product writes in this worker
+events.subscribe(PRODUCT_CHANGED, suggest_index.apply_change)
+
+
+@strawberry.type
+class ProductSuggest:
+    @strawberry.field
+    async def product_suggest(self, info, prefix: str, limit: Optional[int] = 10) -> List[ProductSuggestion]:
+        """
+        Typeahead suggestions for products whose name or tags start with prefix
+        Served from the in-memory index, ranked by popularity
+        """
+        return [
+            ProductSuggestion(product_id=product_id, name=name)
+            for product_id, name in suggest_index.suggest(prefix, limit or 10)
+        ]
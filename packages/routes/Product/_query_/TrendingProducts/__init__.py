@@ -0,0 +1,2 @@
+from .trending_products import TrendingProducts
+__all__ = ['TrendingProducts']
\ No newline at end of file
@@ -0,0 +1,63 @@
+import strawberry
+from typing import List, Optional
+from packages.engines.trending import TRENDING_TOP_K, trending
+from packages.pattern.events import ORDER_PLACED, PRODUCT_VIEWED, WISHLIST_ADDED, events
+from packages.types.outputs import ProductServiceGraphQL
+from packages.utils.cache import product_cache
+
+# Feed views, wishlist adds and orders from this worker into the trending scores
+events.subscribe(PRODUCT_VIEWED, trending.on_product_viewed)
+events.subscribe(WISHLIST_ADDED, trending.on_wishlist_added)
+events.subscribe(ORDER_PLACED, trending.on_order_placed)
+
+
+@strawberry.type
+class TrendingProducts:
+    @strawberry.field
+    async def trending_products(
+        self,
+        info,
+        category_id: Optional[str] = None,
+        limit: Optional[int] = 10
+    ) -> List[ProductServiceGraphQL]:
+        """
+        Get the products with the highest recently decayed activity, optionally within a category
+        """
+        db = info.context["db"]
+
+        if limit is None or limit < 1:
+            limit = 10
+        limit = min(limit, TRENDING_TOP_K)
+
+        # All kept products are fetched so unavailable ones can be skipped
+        product_ids = [product_id for product_id, _ in trending.top(category_id, TRENDING_TOP_K)]
+
+        async def load_products(missing_ids):
+            products = await db.products.find({"id": {"$in": missing_ids}}).to_list(length=None)
+            return {product["id"]: product for product in products}
+
+        products_by_id = await product_cache.get_many(product_ids, load_products)
+        hot = [
+            products_by_id[product_id]
+            for product_id in product_ids
+            if products_by_id.get(product_id) and products_by_id[product_id]["is_available"]
+        ][:limit]
+
+        return [
+            ProductServiceGraphQL(
+                id=product["id"],
+                name=product["name"],
+                description=product["description"],
+                type=product["type"],
+                category_id=product["category_id"],
+                seller_id=product["seller_id"],
+                price=product["price"],
+                images=product.get("images", []),
+                is_available=product["is_available"],
+                stock_quantity=product.get("stock_quantity"),
+                service_duration=product.get("service_duration"),
+                tags=product.get("tags", []),
+                created_at=product["created_at"].isoformat()
+            )
+            for product in hot
+        ]
@@ -1,4 +1,8 @@
 from .ProductList import ProductList
 from .ProductGet import ProductGet
+from .ProductFacets import ProductFacets
+from .ProductSuggest import ProductSuggest
+from .ProductRecommendations import ProductRecommendations
+from .TrendingProducts import TrendingProducts
 
-__all__ = ['ProductList', 'ProductGet']
\ No newline at end of file
+__all__ = ['ProductList', 'ProductGet', 'ProductFacets', 'ProductSuggest', 'ProductRecommendations', 'TrendingProducts']
\ No newline at end of file
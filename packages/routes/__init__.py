@@ -1,5 +1,7 @@
 from .Account import *
 from .Category import *
 from .Product import *
+from .Booking import *
+from .Order import *
 
-__all__ = ['Account', 'Category', 'Product']
\ No newline at end of file
+__all__ = ['Account', 'Category', 'Product', 'Booking', 'Order']
\ No newline at end of file
@@ -7,10 +7,14 @@ Main entry point for all API routes
 from .Account import *
 from .Category import *
 from .Product import *
+from .Booking import *
+from .Order import *
 
 # Export all routes
 __all__ = [
     'Account',
     'Category',
-    'Product'
+    'Product',
+    'Booking',
+    'Order'
 ]
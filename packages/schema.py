@@ -4,18 +4,35 @@ import strawberry
 from packages.routes.Account._mutation_.AccountRegister.account_register import AccountRegister
 from packages.routes.Account._mutation_.AccountLogin.account_login import AccountLogin
 from packages.routes.Account._mutation_.AccountLogout.account_logout import AccountLogout
+from packages.routes.Account._mutation_.AccountTokenRefresh.account_token_refresh import AccountTokenRefresh
 from packages.routes.Account._mutation_.AccountUpdate.account_update import AccountUpdate
 from packages.routes.Account._mutation_.WishlistAdd.wishlist_add import WishlistAdd
 from packages.routes.Account._mutation_.WishlistRemove.wishlist_remove import WishlistRemove
+from packages.routes.Account._mutation_.WishlistAddMany.wishlist_add_many import WishlistAddMany
+from packages.routes.Account._mutation_.WishlistRemoveMany.wishlist_remove_many import WishlistRemoveMany
 from packages.routes.Account._query_.AccountList.account_list import AccountList
 from packages.routes.Account._query_.AccountGet.account_get import AccountGet
 from packages.routes.Account._query_.WishlistGet.wishlist_get import WishlistGet
+from packages.routes.Account._query_.WishlistConnection.wishlist_connection import WishlistConnection
+from packages.routes.Account._query_.AccountConnection.account_connection import AccountConnection
+from packages.routes.Account._query_.SellersNear.sellers_near import SellersNear
 from packages.routes.Category._mutation_.CategoryCreate.category_create import CategoryCreate
 from packages.routes.Category._query_.CategoryList.category_list import CategoryList
 from packages.routes.Product._mutation_.ProductCreate.product_create import ProductCreate
 from packages.routes.Product._mutation_.ProductUpdate.product_update import ProductUpdate
 from packages.routes.Product._query_.ProductList.product_list import ProductList
 from packages.routes.Product._query_.ProductGet.product_get import ProductGet
+from packages.routes.Product._query_.ProductFacets.product_facets import ProductFacets
+from packages.routes.Product._query_.ProductSuggest.product_suggest import ProductSuggest
+from packages.routes.Product._query_.ProductRecommendations.product_recommendations import ProductRecommendations
+from packages.routes.Product._query_.TrendingProducts.trending_products import TrendingProducts
+from packages.routes.Booking._mutation_.WorkingHoursSet.working_hours_set import WorkingHoursSet
+from packages.routes.Booking._mutation_.ServiceBook.service_book import ServiceBook
+from packages.routes.Booking._mutation_.BookingCancel.booking_cancel import BookingCancel
+from packages.routes.Booking._query_.ServiceSlots.service_slots import ServiceSlots
+from packages.routes.Booking._query_.SellerBookings.seller_bookings import SellerBookings
+from packages.routes.Order._query_.SellerStats.seller_stats import SellerStats
+from packages.routes.Order._query_.OrderList.order_list import OrderList
 
 # Combine all mutations
 @strawberry.type
@@ -23,12 +40,18 @@ class Mutation(
     AccountRegister, 
     AccountLogin, 
     AccountLogout, 
+    AccountTokenRefresh,
     AccountUpdate, 
     WishlistAdd,
     WishlistRemove,
+    WishlistAddMany,
+    WishlistRemoveMany,
     CategoryCreate,
     ProductCreate,
-    ProductUpdate
+    ProductUpdate,
+    WorkingHoursSet,
+    ServiceBook,
+    BookingCancel
 ):
     pass
 
@@ -38,9 +61,20 @@ class Query(
     AccountList, 
     AccountGet, 
     WishlistGet,
+    WishlistConnection,
+    AccountConnection,
+    SellersNear,
     CategoryList,
     ProductList,
-    ProductGet
+    ProductGet,
+    ProductFacets,
+    ProductSuggest,
+    ProductRecommendations,
+    TrendingProducts,
+    ServiceSlots,
+    SellerBookings,
+    SellerStats,
+    OrderList
 ):
     pass
 
@@ -35,6 +35,17 @@ class ProductServiceType(str, Enum):
     PRODUCT = "product"
     SERVICE = "service"
 
+@strawberry.enum
+class ProductSortField(str, Enum):
+    PRICE = "price"
+    CREATED_AT = "created_at"
+    NAME = "name"
+
+@strawberry.enum
+class SortDirection(str, Enum):
+    ASC = "asc"
+    DESC = "desc"
+
 @strawberry.enum
 class OrderStatus(str, Enum):
     PENDING = "pending"
@@ -57,6 +68,8 @@ class UserRegisterInput:
     seller_type: Optional[SellerType] = None
     business_name: Optional[str] = None
     business_address: Optional[str] = None
+    business_latitude: Optional[float] = None
+    business_longitude: Optional[float] = None
     business_description: Optional[str] = None
 
 @strawberry.input
@@ -82,6 +95,17 @@ class ProductServiceInput:
     service_duration: Optional[int] = None
     tags: Optional[List[str]] = None
 
+@strawberry.input
+class ProductFilterInput:
+    category_id: Optional[str] = None
+    seller_id: Optional[str] = None
+    is_available: Optional[bool] = None
+    product_type: Optional[str] = None
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+    in_stock: Optional[bool] = None
+    tags: Optional[List[str]] = None
+
 @strawberry.input
 class OrderInput:
     seller_id: str
@@ -103,6 +127,9 @@ class UserProfileUpdateInput:
     phone: Optional[str] = None
     business_name: Optional[str] = None
     business_address: Optional[str] = None
+    # Omitted leaves the location as is; an explicit null pair clears it
+    business_latitude: Optional[float] = strawberry.UNSET
+    business_longitude: Optional[float] = strawberry.UNSET
     business_description: Optional[str] = None
     customer_category: Optional[CustomerCategory] = None
     seller_type: Optional[SellerType] = None
@@ -115,6 +142,8 @@ class DeliveryAddressInput:
     postal_code: str
     country: str
     is_default: Optional[bool] = False
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
 
 @strawberry.input
 class CategoryUpdateInput:
@@ -139,6 +168,21 @@ class OrderUpdateInput:
     status: Optional[OrderStatus] = None
     special_instructions: Optional[str] = None
 
+@strawberry.input
+class AccountFilterInput:
+    user_type: Optional[UserType] = None
+    seller_type: Optional[SellerType] = None
+    is_active: Optional[bool] = None
+    created_after: Optional[str] = None  # ISO 8601, inclusive
+    created_before: Optional[str] = None  # ISO 8601, exclusive
+
 @strawberry.input
 class LogoutInput:
     logout_all_devices: Optional[bool] = False
+    refresh_token: Optional[str] = None  # revoked together with the access token
+
+@strawberry.input
+class WorkingIntervalInput:
+    weekday: int  # 0 = Monday ... 6 = Sunday
+    start: str  # "HH:MM"
+    end: str  # "HH:MM", 24:00 for end of day
@@ -40,6 +40,10 @@ class OrderStatus(str, Enum):
     DELIVERED = "delivered"
     CANCELLED = "cancelled"
 
+class BookingStatus(str, Enum):
+    CONFIRMED = "confirmed"
+    CANCELLED = "cancelled"
+
 # Base Model
 class BaseModelWithID(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -61,6 +65,8 @@ class User(BaseModelWithID):
     # Additional fields for sellers
     business_name: Optional[str] = None
     business_address: Optional[str] = None
+    # GeoJSON point, served by the users business_location 2dsphere index
+    business_location: Optional[Dict[str, Any]] = None
     business_description: Optional[str] = None
     
     # Additional fields for customers
@@ -101,6 +107,21 @@ class BlacklistedToken(BaseModelWithID):
     blacklisted_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     expires_at: datetime  # When the token would naturally expire
 
+class RefreshToken(BaseModelWithID):
+    token_hash: str  # HMAC of the opaque token; the token itself is never stored
+    user_id: str
+    family_id: str  # shared by every token rotated from the same login
+    expires_at: datetime
+    revoked_at: Optional[datetime] = None
+
 class Wishlist(BaseModelWithID):
     user_id: str
     product_id: str
+
+class Booking(BaseModelWithID):
+    seller_id: str
+    service_id: str
+    customer_id: str
+    start: datetime
+    end: datetime
+    status: BookingStatus = BookingStatus.CONFIRMED
@@ -2,6 +2,11 @@ import strawberry
 from typing import Optional, List
 
 # Output Types
+@strawberry.type
+class GeoLocation:
+    latitude: float
+    longitude: float
+
 @strawberry.type
 class UserGraphQL:
     id: str
@@ -17,6 +22,7 @@ class UserGraphQL:
     business_address: Optional[str] = strawberry.field(name="businessAddress")
     business_description: Optional[str] = strawberry.field(name="businessDescription")
     created_at: str = strawberry.field(name="createdAt")
+    business_location: Optional[GeoLocation] = strawberry.field(name="businessLocation", default=None)
 
 @strawberry.type
 class CategoryGraphQL:
@@ -44,15 +50,32 @@ class ProductServiceGraphQL:
     tags: List[str]
     created_at: str
 
+@strawberry.type
+class OrderItemGraphQL:
+    product_service_id: str
+    quantity: int
+    price: float  # unit price when the order was placed
+    product: Optional[ProductServiceGraphQL] = None  # current product; None if not requested or deleted
+
+@strawberry.type
+class OrderAddressGraphQL:
+    street: Optional[str]
+    city: Optional[str]
+    state: Optional[str]
+    postal_code: Optional[str]
+    country: Optional[str]
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+
 @strawberry.type
 class OrderGraphQL:
     id: str
     customer_id: str
     seller_id: str
-    items: str  # JSON string
+    items: List[OrderItemGraphQL]
     total_amount: float
     status: str
-    delivery_address: Optional[str]  # JSON string
+    delivery_address: Optional[OrderAddressGraphQL]
     special_instructions: Optional[str]
     created_at: str
 
@@ -61,12 +84,98 @@ class AuthResponse:
     token: str
     user: UserGraphQL
     message: str
+    refresh_token: Optional[str] = None
+
+@strawberry.type
+class TokenRefreshResponse:
+    token: str
+    refresh_token: str
+    message: str
 
 @strawberry.type
 class SuccessResponse:
     success: bool
     message: str
 
+@strawberry.type
+class WishlistItemStatus:
+    product_id: str
+    success: bool
+    message: str
+
+@strawberry.type
+class WishlistBatchResponse:
+    success: bool
+    message: str
+    items: List[WishlistItemStatus]
+
+@strawberry.type
+class FacetCount:
+    value: str
+    count: int
+
+@strawberry.type
+class PriceBucketCount:
+    min_price: float
+    max_price: Optional[float]  # None for the open-ended top bucket
+    count: int
+
+@strawberry.type
+class ProductFacets:
+    total: int
+    categories: List[FacetCount]
+    types: List[FacetCount]
+    sellers: List[FacetCount]
+    price_buckets: List[PriceBucketCount]
+
+@strawberry.type
+class ProductSuggestion:
+    product_id: str
+    name: str
+
+@strawberry.type
+class BookingGraphQL:
+    id: str
+    seller_id: str
+    service_id: str
+    customer_id: str
+    start: str
+    end: str
+    status: str
+    created_at: str
+
+@strawberry.type
+class ServiceSlot:
+    start: str
+    end: str
+
+@strawberry.type
+class WorkingInterval:
+    weekday: int
+    start: str
+    end: str
+
+@strawberry.type
+class SellerDailySales:
+    day: str
+    revenue: float
+    units: int
+    orders: int
+
+@strawberry.type
+class ProductSales:
+    product_id: str
+    revenue: float
+    units: int
+
+@strawberry.type
+class SellerSalesStats:
+    revenue: float
+    units: int
+    orders: int
+    days: List[SellerDailySales]
+    top_products: List[ProductSales]
+
 @strawberry.type
 class ErrorResponse:
     error: str
@@ -91,6 +200,18 @@ class UserEdge:
     node: UserGraphQL
     cursor: str
 
+@strawberry.type
+class NearbySellerConnection:
+    edges: List['NearbySellerEdge']
+    page_info: PageInfo
+    total_count: int
+
+@strawberry.type
+class NearbySellerEdge:
+    node: UserGraphQL
+    cursor: str
+    distance: float  # meters
+
 @strawberry.type
 class CategoryConnection:
     edges: List['CategoryEdge']
@@ -0,0 +1,106 @@
+"""
+Slot Availability
+Free booking slots for a date range, computed in one merge pass over two sorted interval
+arrays: the provider's working windows and their booked intervals
+
+Times are integer minutes from midnight of the first day of the range. Working hours are a
+weekly template of (weekday, start, end) intervals in minutes of the day (weekday 0 = Monday)
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Iterable, List, Optional, Tuple
+
+MINUTES_PER_DAY = 24 * 60
+
+Interval = Tuple[int, int]
+
+
+def parse_clock(value: str) -> int:
+    """Minutes of the day for "HH:MM" (24:00 allowed as an end of day)"""
+    try:
+        hours, minutes = value.split(":")
+        total = int(hours) * 60 + int(minutes)
+    except ValueError:
+        raise Exception(f"Invalid time {value!r}, expected HH:MM")
+    if not 0 <= int(minutes) < 60 or not 0 <= total <= MINUTES_PER_DAY:
+        raise Exception(f"Invalid time {value!r}, expected HH:MM")
+    return total
+
+
+def format_clock(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def normalize_weekly(intervals: Iterable[Tuple[int, int, int]]) -> List[dict]:
+    """Validate (weekday, start, end) intervals and return them sorted; overlaps are rejected"""
+    ordered = sorted(intervals)
+    for index, (weekday, start, end) in enumerate(ordered):
+        if not 0 <= weekday <= 6:
+            raise Exception("Weekday must be between 0 (Monday) and 6 (Sunday)")
+        if start >= end:
+            raise Exception("Working hours must end after they start")
+        if index and ordered[index - 1][0] == weekday and ordered[index - 1][2] > start:
+            raise Exception(f"Working hours overlap on weekday {weekday}")
+    return [{"weekday": weekday, "start": start, "end": end} for weekday, start, end in ordered]
+
+
+def working_windows(weekly: List[dict], first_day: date, days: int) -> List[Interval]:
+    """Working windows of `days` consecutive days, in order (weekly must be sorted)"""
+    by_weekday: List[List[Interval]] = [[] for _ in range(7)]
+    for interval in weekly:
+        by_weekday[interval["weekday"]].append((interval["start"], interval["end"]))
+
+    windows = []
+    weekday = first_day.weekday()
+    for offset in range(0, days * MINUTES_PER_DAY, MINUTES_PER_DAY):
+        windows += [(offset + start, offset + end) for start, end in by_weekday[weekday]]
+        weekday = (weekday + 1) % 7
+    return windows
+
+
+def free_slots(
+    windows: List[Interval],
+    booked: List[Interval],
+    duration: int,
+    step: int,
+    not_before: int = 0
+) -> List[int]:
+    """
+    Starts of every free slot of `duration` minutes, `step` minutes apart within each window
+    Both lists must be sorted by start and free of overlaps (bookings are guarded per day, so
+    their ends are sorted too); each booking is passed at most once
+    """
+    slots = []
+    count = len(booked)
+    next_booking = 0
+    for window_start, window_end in windows:
+        start = window_start
+        if start < not_before:
+            start = window_start + -(-(not_before - window_start) // step) * step
+        while start + duration <= window_end:
+            while next_booking < count and booked[next_booking][1] <= start:
+                next_booking += 1
+            if next_booking < count and booked[next_booking][0] < start + duration:
+                # Jump to the first slot start at or after the end of the booking
+                blocked_until = booked[next_booking][1]
+                start = window_start + -(-(blocked_until - window_start) // step) * step
+                continue
+            slots.append(start)
+            start += step
+    return slots
+
+
+def containing_window(windows: List[Interval], start: int, end: int) -> Optional[Interval]:
+    """The working window [start, end) lies inside, if any"""
+    for window_start, window_end in windows:
+        if window_start <= start and end <= window_end:
+            return window_start, window_end
+    return None
+
+
+def to_minutes(value: datetime, origin: datetime) -> int:
+    return int((value - origin) // timedelta(minutes=1))
+
+
+def from_minutes(minutes: int, origin: datetime) -> datetime:
+    return origin + timedelta(minutes=minutes)
@@ -0,0 +1,70 @@
+"""
+Benchmark for GraphQL response encoders
+Compares encode time and bytes produced for representative productList / wishlistGet payloads
+
+Run with:
+    python -m packages.utils.bench_encoding
+"""
+
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from packages.utils.encoding import StdlibEncoder, OrjsonEncoder, orjson
+
+# Payload sizes to measure (number of products in the response)
+SIZES = [10, 100, 500]
+ROUNDS = 200
+
+
+def build_product(index: int) -> dict:
+    created_at = datetime(2025, 1, 1) + timedelta(minutes=index)
+    return {
+        "id": str(uuid.uuid4()),
+        "name": f"Premium Coffee Beans #{index}",
+        "description": "High-quality arabica coffee beans, single origin, medium roast. " * 3,
+        "type": "product",
+        "categoryId": str(uuid.uuid4()),
+        "sellerId": str(uuid.uuid4()),
+        "price": 29.99 + index,
+        "images": [f"https://cdn.example.com/products/{index}/{n}.jpg" for n in range(3)],
+        "isAvailable": True,
+        "stockQuantity": 100 + index,
+        "serviceDuration": None,
+        "tags": ["coffee", "organic", "premium", "café"],
+        "createdAt": created_at.isoformat(),
+    }
+
+
+def build_response(size: int) -> dict:
+    return {"data": {"productList": [build_product(i) for i in range(size)]}}
+
+
+def measure(encoder, payload) -> tuple:
+    encoded = encoder.encode(payload)
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        encoder.encode(payload)
+    elapsed = time.perf_counter() - start
+    return elapsed / ROUNDS * 1_000_000, len(encoded)
+
+
+def main():
+    encoders = [StdlibEncoder()]
+    if orjson is not None:
+        encoders.append(OrjsonEncoder())
+    else:
+        print("orjson not installed; only the stdlib encoder is measured")
+
+    print(f"{'products':>8} {'encoder':>8} {'us/encode':>10} {'bytes':>8} {'speedup':>8}")
+    for size in SIZES:
+        payload = build_response(size)
+        baseline = None
+        for encoder in encoders:
+            micros, size_bytes = measure(encoder, payload)
+            baseline = baseline or micros
+            print(f"{size:>8} {encoder.name:>8} {micros:>10.1f} {size_bytes:>8} {baseline / micros:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
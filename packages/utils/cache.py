@@ -0,0 +1,306 @@
+"""
+Two-tier Cache
+Bounded in-process LRU (L1) in front of a pluggable shared store (L2)
+
+L1 entries live for a few seconds so workers converge quickly after another worker
+invalidates a key; L2 (e.g. Redis) is shared by all workers and invalidated directly
+
+L2 is an optimization only: its errors are counted (cache.<name>.l2_errors) and reads fall
+back to L1 and the loader. Invalidation deletes the L2 key twice, the second time after
+PRODUCT_CACHE_L2_REDELETE_SECONDS, to drop a stale value another worker loaded before the
+write and stored after the first delete
+"""
+
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional
+
+import bson
+
+from packages.utils.metrics import metrics
+from packages.utils.singleflight import SingleFlight
+
+PRODUCT_CACHE_L1_SIZE = int(os.environ.get("PRODUCT_CACHE_L1_SIZE", "10000"))
+PRODUCT_CACHE_L1_TTL = float(os.environ.get("PRODUCT_CACHE_L1_TTL", "5"))
+PRODUCT_CACHE_L2_TTL = int(os.environ.get("PRODUCT_CACHE_L2_TTL", "300"))
+PRODUCT_CACHE_L2_REDELETE_SECONDS = float(os.environ.get("PRODUCT_CACHE_L2_REDELETE_SECONDS", "2"))
+# e.g. redis://localhost:6379/0 ; unset means L1 only
+PRODUCT_CACHE_L2_URL = os.environ.get("PRODUCT_CACHE_L2_URL")
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Bounded LRU with per-entry expiry"""
+
+    def __init__(self, maxsize: int, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = _MISSING) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class CacheStore:
+    """Shared (L2) store interface; values are opaque bytes"""
+
+    async def get_many(self, keys: List[str]) -> Dict[str, bytes]:
+        raise NotImplementedError
+
+    async def set_many(self, items: Dict[str, bytes], ttl: int) -> None:
+        raise NotImplementedError
+
+    async def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+
+class InMemoryStore(CacheStore):
+    """Process-local stand-in for a shared store (tests, single worker setups)"""
+
+    def __init__(self):
+        self._data: Dict[str, tuple] = {}
+
+    async def get_many(self, keys: List[str]) -> Dict[str, bytes]:
+        now = time.monotonic()
+        found = {}
+        for key in keys:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > now:
+                found[key] = entry[1]
+        return found
+
+    async def set_many(self, items: Dict[str, bytes], ttl: int) -> None:
+        expires_at = time.monotonic() + ttl
+        for key, value in items.items():
+            self._data[key] = (expires_at, value)
+
+    async def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+
+class RedisStore(CacheStore):
+    """Redis-backed shared store"""
+
+    def __init__(self, url: str, prefix: str):
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise RuntimeError("PRODUCT_CACHE_L2_URL is set but the redis package is not installed")
+
+        self.client = redis.from_url(url)
+        self.prefix = prefix
+
+    async def get_many(self, keys: List[str]) -> Dict[str, bytes]:
+        values = await self.client.mget([self.prefix + key for key in keys])
+        return {key: value for key, value in zip(keys, values) if value is not None}
+
+    async def set_many(self, items: Dict[str, bytes], ttl: int) -> None:
+        async with self.client.pipeline(transaction=False) as pipe:
+            for key, value in items.items():
+                pipe.set(self.prefix + key, value, ex=ttl)
+            await pipe.execute()
+
+    async def delete(self, key: str) -> None:
+        await self.client.delete(self.prefix + key)
+
+
+def _encode(value: Any) -> bytes:
+    return bson.encode({"v": value})
+
+
+def _decode(data: bytes) -> Any:
+    return bson.decode(data)["v"]
+
+
+class TieredCache:
+    """
+    Read-through cache of documents keyed by id
+    Missing documents are cached as None so repeated lookups of unknown ids stay cheap
+    """
+
+    def __init__(
+        self,
+        name: str,
+        l1: LRUCache,
+        l2: Optional[CacheStore] = None,
+        l2_ttl: int = 300,
+        l2_redelete_delay: float = 2.0
+    ):
+        self.name = name
+        self.l1 = l1
+        self.l2 = l2
+        self.l2_ttl = l2_ttl
+        self.l2_redelete_delay = l2_redelete_delay
+        self.l2_hits = 0
+        self.l2_misses = 0
+        self.l2_errors = 0
+        self.loads = 0
+        self._redeletes: set = set()
+        self.flight = SingleFlight(name)
+        # Keys invalidated while a load was in flight must not be refilled with the stale result
+        self._generation = 0
+        self._invalidated: LRUCache = LRUCache(maxsize=10000)
+        metrics.register(f"cache.{name}", self.stats)
+
+    async def get(self, key: str, load: Callable[[], Awaitable[Any]]) -> Any:
+        value = self.l1.get(key)
+        if value is not _MISSING:
+            return value
+        # Concurrent misses for the same key share one L2/database round trip
+        return await self.flight.do(key, lambda: self._fill_one(key, load))
+
+    async def _l2_call(self, operation: Awaitable[Any], default: Any = None) -> Any:
+        """Run an L2 operation; on failure count it and carry on without L2"""
+        try:
+            return await operation
+        except Exception:
+            self.l2_errors += 1
+            metrics.incr(f"cache.{self.name}.l2_errors")
+            return default
+
+    async def _fill_one(self, key: str, load: Callable[[], Awaitable[Any]]) -> Any:
+        generation = self._generation
+        if self.l2 is not None:
+            found = await self._l2_call(self.l2.get_many([key]), {})
+            if key in found:
+                self.l2_hits += 1
+                value = _decode(found[key])
+                self.l1.set(key, value)
+                return value
+            self.l2_misses += 1
+
+        self.loads += 1
+        value = await load()
+        await self._store({key: value}, generation)
+        return value
+
+    async def get_many(
+        self,
+        keys: Iterable[str],
+        load_many: Callable[[List[str]], Awaitable[Dict[str, Any]]],
+    ) -> Dict[str, Any]:
+        """
+        Resolve many keys at once: L1, then one L2 round trip, then one batched load
+        `load_many` receives the keys still missing and returns {key: document}
+        """
+        generation = self._generation
+        results: Dict[str, Any] = {}
+        missing: List[str] = []
+        for key in dict.fromkeys(keys):
+            value = self.l1.get(key)
+            if value is _MISSING:
+                missing.append(key)
+            else:
+                results[key] = value
+
+        if missing and self.l2 is not None:
+            found = await self._l2_call(self.l2.get_many(missing), {})
+            self.l2_hits += len(found)
+            self.l2_misses += len(missing) - len(found)
+            for key, data in found.items():
+                value = _decode(data)
+                self.l1.set(key, value)
+                results[key] = value
+            missing = [key for key in missing if key not in found]
+
+        if missing:
+            self.loads += 1
+            loaded = await load_many(missing)
+            fresh = {key: loaded.get(key) for key in missing}
+            await self._store(fresh, generation)
+            results.update(fresh)
+
+        return results
+
+    async def _store(self, items: Dict[str, Any], generation: int) -> None:
+        items = {
+            key: value for key, value in items.items()
+            if self._invalidated.get(key, 0) <= generation
+        }
+        for key, value in items.items():
+            self.l1.set(key, value)
+        if self.l2 is not None and items:
+            await self._l2_call(self.l2.set_many({key: _encode(value) for key, value in items.items()}, self.l2_ttl))
+
+    async def invalidate(self, key: str) -> None:
+        """Drop a key everywhere; never raises for L2 failures"""
+        self._generation += 1
+        self._invalidated.set(key, self._generation)
+        self.l1.delete(key)
+        self.flight.forget(key)
+        if self.l2 is not None:
+            await self._l2_call(self.l2.delete(key))
+            # The generation guard is per process; a second delete catches other workers' stale fills
+            task = asyncio.create_task(self._redelete(key))
+            self._redeletes.add(task)
+            task.add_done_callback(self._redeletes.discard)
+
+    async def _redelete(self, key: str) -> None:
+        await asyncio.sleep(self.l2_redelete_delay)
+        await self._l2_call(self.l2.delete(key))
+
+    def stats(self) -> dict:
+        def ratio(hits, misses):
+            total = hits + misses
+            return round(hits / total, 4) if total else None
+
+        return {
+            "l1_size": len(self.l1),
+            "l1_hits": self.l1.hits,
+            "l1_misses": self.l1.misses,
+            "l1_hit_ratio": ratio(self.l1.hits, self.l1.misses),
+            "l2_hits": self.l2_hits,
+            "l2_misses": self.l2_misses,
+            "l2_hit_ratio": ratio(self.l2_hits, self.l2_misses),
+            "l2_errors": self.l2_errors,
+            "loads": self.loads,
+        }
+
+
+def _product_l2() -> Optional[CacheStore]:
+    if not PRODUCT_CACHE_L2_URL:
+        return None
+    return RedisStore(PRODUCT_CACHE_L2_URL, prefix="product:")
+
+
+# Product documents keyed by product id (product_get, wishlist hydration)
+product_cache = TieredCache(
+    "product",
+    LRUCache(PRODUCT_CACHE_L1_SIZE, ttl=PRODUCT_CACHE_L1_TTL),
+    _product_l2(),
+    l2_ttl=PRODUCT_CACHE_L2_TTL,
+    l2_redelete_delay=PRODUCT_CACHE_L2_REDELETE_SECONDS,
+)
@@ -0,0 +1,148 @@
+"""
+Request Deadlines
+Every GraphQL request gets a deadline (REQUEST_TIMEOUT_MS, or the client's
+X-Request-Timeout-Ms header capped at REQUEST_TIMEOUT_MAX_MS)
+
+The context's db is wrapped so every find / find_one / aggregate / count_documents / distinct
+carries maxTimeMS = time left, which makes MongoDB abort the operation itself once the
+client has stopped waiting. Reads issued after the deadline fail immediately.
+Writes are passed through unchanged so they are never left half-applied.
+
+Timeouts surface as DeadlineExceeded, a GraphQL error with code DEADLINE_EXCEEDED
+"""
+
+import math
+import os
+import time
+from typing import Any, Optional
+
+from graphql import GraphQLError
+from pymongo.errors import ExecutionTimeout
+
+from packages.utils.metrics import metrics
+
+REQUEST_TIMEOUT_MS = int(os.environ.get("REQUEST_TIMEOUT_MS", "10000"))
+REQUEST_TIMEOUT_MAX_MS = int(os.environ.get("REQUEST_TIMEOUT_MAX_MS", "60000"))
+REQUEST_TIMEOUT_HEADER = "x-request-timeout-ms"
+
+# Cursor methods that return the cursor itself and can be chained
+_CHAINABLE = {"sort", "limit", "skip", "batch_size", "hint", "collation", "comment", "allow_disk_use"}
+
+
+class DeadlineExceeded(GraphQLError):
+    def __init__(self, message: str = "Request deadline exceeded"):
+        super().__init__(message, extensions={"code": "DEADLINE_EXCEEDED"})
+        metrics.incr("deadline.exceeded")
+
+
+class Deadline:
+    def __init__(self, timeout_ms: float):
+        self.timeout_ms = timeout_ms
+        self.expires_at = time.monotonic() + timeout_ms / 1000
+
+    @classmethod
+    def from_request(cls, request=None) -> "Deadline":
+        timeout_ms = REQUEST_TIMEOUT_MS
+        if request is not None:
+            header = request.headers.get(REQUEST_TIMEOUT_HEADER)
+            if header:
+                try:
+                    timeout_ms = min(max(int(header), 1), REQUEST_TIMEOUT_MAX_MS)
+                except ValueError:
+                    pass
+        return cls(timeout_ms)
+
+    def remaining_ms(self) -> int:
+        """Milliseconds left; raises DeadlineExceeded once the deadline has passed"""
+        remaining = (self.expires_at - time.monotonic()) * 1000
+        if remaining <= 0:
+            raise DeadlineExceeded()
+        return max(1, math.floor(remaining))
+
+
+class DeadlineCursor:
+    """Motor cursor wrapper translating server-side timeouts into DeadlineExceeded"""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._cursor, name)
+        if name in _CHAINABLE:
+            def chain(*args, **kwargs):
+                attr(*args, **kwargs)
+                return self
+            return chain
+        return attr
+
+    async def to_list(self, length: Optional[int] = None):
+        try:
+            return await self._cursor.to_list(length=length)
+        except ExecutionTimeout:
+            raise DeadlineExceeded()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return await self._cursor.__anext__()
+        except ExecutionTimeout:
+            raise DeadlineExceeded()
+
+
+class DeadlineCollection:
+    """Collection wrapper adding maxTimeMS to reads"""
+
+    def __init__(self, collection, deadline: Deadline):
+        self._collection = collection
+        self._deadline = deadline
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._collection, name)
+
+    def find(self, *args, **kwargs) -> DeadlineCursor:
+        kwargs.setdefault("max_time_ms", self._deadline.remaining_ms())
+        return DeadlineCursor(self._collection.find(*args, **kwargs))
+
+    def aggregate(self, pipeline, *args, **kwargs) -> DeadlineCursor:
+        kwargs.setdefault("maxTimeMS", self._deadline.remaining_ms())
+        return DeadlineCursor(self._collection.aggregate(pipeline, *args, **kwargs))
+
+    async def find_one(self, *args, **kwargs):
+        kwargs.setdefault("max_time_ms", self._deadline.remaining_ms())
+        try:
+            return await self._collection.find_one(*args, **kwargs)
+        except ExecutionTimeout:
+            raise DeadlineExceeded()
+
+    async def count_documents(self, filter, *args, **kwargs):
+        kwargs.setdefault("maxTimeMS", self._deadline.remaining_ms())
+        try:
+            return await self._collection.count_documents(filter, *args, **kwargs)
+        except ExecutionTimeout:
+            raise DeadlineExceeded()
+
+    async def distinct(self, key, *args, **kwargs):
+        kwargs.setdefault("maxTimeMS", self._deadline.remaining_ms())
+        try:
+            return await self._collection.distinct(key, *args, **kwargs)
+        except ExecutionTimeout:
+            raise DeadlineExceeded()
+
+
+class DeadlineDatabase:
+    """Database wrapper handing out deadline-aware collections"""
+
+    def __init__(self, db, deadline: Deadline):
+        self._db = db
+        self.deadline = deadline
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._db, name)
+        if hasattr(attr, "find_one"):
+            return DeadlineCollection(attr, self.deadline)
+        return attr
+
+    def __getitem__(self, name: str) -> DeadlineCollection:
+        return DeadlineCollection(self._db[name], self.deadline)
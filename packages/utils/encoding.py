@@ -0,0 +1,88 @@
+"""
+Response Encoding
+Pluggable JSON encoders for GraphQL responses
+Uses orjson when it is installed and falls back to the standard library otherwise
+"""
+
+import json
+import os
+from typing import Any, Callable, Optional
+
+from strawberry.fastapi import GraphQLRouter
+from fastapi import Response, status
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+# "auto" picks the fastest available backend, "orjson" / "stdlib" force one
+JSON_ENCODER = os.environ.get("JSON_ENCODER", "auto")
+
+
+class ResponseEncoder:
+    """Encodes response payloads to JSON bytes"""
+
+    name = "base"
+
+    def encode(self, data: Any) -> bytes:
+        raise NotImplementedError
+
+    def encode_str(self, data: Any) -> str:
+        return self.encode(data).decode("utf-8")
+
+
+class StdlibEncoder(ResponseEncoder):
+    name = "stdlib"
+
+    def encode(self, data: Any) -> bytes:
+        # Compact separators and raw UTF-8 keep the payload as small as orjson's
+        return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+class OrjsonEncoder(ResponseEncoder):
+    name = "orjson"
+
+    def __init__(self, default: Optional[Callable[[Any], Any]] = None):
+        if orjson is None:
+            raise RuntimeError("orjson is not installed")
+        self.default = default
+
+    def encode(self, data: Any) -> bytes:
+        return orjson.dumps(data, default=self.default)
+
+
+def get_response_encoder(name: Optional[str] = None) -> ResponseEncoder:
+    """
+    Resolve an encoder by name
+    Unknown names and a missing orjson install fall back to the stdlib encoder
+    """
+    name = (name or JSON_ENCODER).lower()
+    if name in ("auto", "orjson") and orjson is not None:
+        return OrjsonEncoder()
+    return StdlibEncoder()
+
+
+class EncodingGraphQLRouter(GraphQLRouter):
+    """
+    GraphQLRouter that serializes responses with a pluggable ResponseEncoder
+    """
+
+    def __init__(self, *args, response_encoder: Optional[ResponseEncoder] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.response_encoder = response_encoder or get_response_encoder()
+
+    def encode_json(self, data: object) -> str:
+        # Used by multipart/streaming responses which expect text
+        return self.response_encoder.encode_str(data)
+
+    def create_response(self, response_data, sub_response: Response) -> Response:
+        response = Response(
+            self.response_encoder.encode(response_data),
+            media_type="application/json",
+            status_code=sub_response.status_code or status.HTTP_200_OK,
+        )
+
+        response.headers.raw.extend(sub_response.headers.raw)
+
+        return response
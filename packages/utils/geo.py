@@ -0,0 +1,30 @@
+"""
+Geo Helpers
+Coordinates are stored as GeoJSON points ({"type": "Point", "coordinates": [lng, lat]}) so
+they can be served by 2dsphere indexes
+"""
+
+from typing import Optional
+
+from packages.types.outputs import GeoLocation
+
+
+def geo_point(latitude: Optional[float], longitude: Optional[float]) -> Optional[dict]:
+    """GeoJSON point for a latitude / longitude pair; None when neither is given"""
+    if latitude is None and longitude is None:
+        return None
+    if latitude is None or longitude is None:
+        raise Exception("Latitude and longitude must be given together")
+    if not -90 <= latitude <= 90:
+        raise Exception("Latitude must be between -90 and 90")
+    if not -180 <= longitude <= 180:
+        raise Exception("Longitude must be between -180 and 180")
+    return {"type": "Point", "coordinates": [float(longitude), float(latitude)]}
+
+
+def geo_location(point: Optional[dict]) -> Optional[GeoLocation]:
+    """GraphQL location of a stored GeoJSON point"""
+    if not point:
+        return None
+    longitude, latitude = point["coordinates"]
+    return GeoLocation(latitude=latitude, longitude=longitude)
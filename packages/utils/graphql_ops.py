@@ -0,0 +1,151 @@
+"""
+GraphQL Operation Classification
+Extracts the root fields (and the caller's token) of a GraphQL request without executing
+it, so middleware (admission control, rate limiting) can apply per-operation policies
+
+Root fields are returned in snake_case, matching the resolver names
+(e.g. accountLogin -> account_login)
+"""
+
+import json
+import re
+from functools import lru_cache
+from typing import NamedTuple, Optional, Tuple
+
+from graphql import GraphQLError, parse
+from graphql.language import (
+    FieldNode,
+    FragmentDefinitionNode,
+    FragmentSpreadNode,
+    OperationDefinitionNode,
+    StringValueNode,
+)
+from starlette.datastructures import Headers
+from starlette.types import Message, Receive, Scope
+
+_CAMEL_BOUNDARY = re.compile(r"(?<!^)(?=[A-Z])")
+
+
+class GraphQLRequestInfo(NamedTuple):
+    fields: Tuple[str, ...]
+    # Token passed as the `token` variable / argument or as a Bearer Authorization header
+    token: Optional[str]
+
+
+def to_snake_case(name: str) -> str:
+    return _CAMEL_BOUNDARY.sub("_", name).lower()
+
+
+def _collect(selection_set, fragments: dict, fields: list, tokens: list, seen: set) -> None:
+    for selection in selection_set.selections:
+        if isinstance(selection, FieldNode):
+            fields.append(to_snake_case(selection.name.value))
+            for argument in selection.arguments:
+                if argument.name.value == "token" and isinstance(argument.value, StringValueNode):
+                    tokens.append(argument.value.value)
+        elif isinstance(selection, FragmentSpreadNode):
+            name = selection.name.value
+            if name in fragments and name not in seen:
+                seen.add(name)
+                _collect(fragments[name].selection_set, fragments, fields, tokens, seen)
+        else:  # inline fragment
+            _collect(selection.selection_set, fragments, fields, tokens, seen)
+
+
+@lru_cache(maxsize=1024)
+def _summarize(query: str, operation_name: Optional[str]) -> Tuple[Tuple[str, ...], Optional[str]]:
+    try:
+        document = parse(query)
+    except GraphQLError:
+        return (), None
+
+    fragments = {}
+    operations = []
+    for definition in document.definitions:
+        if isinstance(definition, FragmentDefinitionNode):
+            fragments[definition.name.value] = definition
+        elif isinstance(definition, OperationDefinitionNode):
+            operations.append(definition)
+
+    for operation in operations:
+        if operation_name is None or (operation.name and operation.name.value == operation_name):
+            fields, tokens = [], []
+            _collect(operation.selection_set, fragments, fields, tokens, set())
+            return tuple(fields), tokens[0] if tokens else None
+    return (), None
+
+
+def root_fields(query: str, operation_name: Optional[str] = None) -> Tuple[str, ...]:
+    """Root field names of the selected operation; empty when the document doesn't parse"""
+    return _summarize(query, operation_name)[0]
+
+
+def parse_request(body: bytes, authorization: Optional[str] = None) -> GraphQLRequestInfo:
+    """Summarize a JSON GraphQL POST body"""
+    token = None
+    if authorization and authorization.startswith("Bearer "):
+        token = authorization[7:].strip() or None
+
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return GraphQLRequestInfo((), token)
+    if not isinstance(payload, dict) or not isinstance(payload.get("query"), str):
+        return GraphQLRequestInfo((), token)
+
+    operation_name = payload.get("operationName")
+    fields, inline_token = _summarize(payload["query"], operation_name if isinstance(operation_name, str) else None)
+    variables = payload.get("variables")
+    if isinstance(variables, dict) and isinstance(variables.get("token"), str):
+        token = variables["token"]
+    elif inline_token:
+        token = inline_token
+    return GraphQLRequestInfo(fields, token)
+
+
+def operation_fields(body: bytes) -> Tuple[str, ...]:
+    """Root fields of a JSON GraphQL POST body"""
+    return parse_request(body).fields
+
+
+async def read_graphql_request(scope: Scope, receive: Receive) -> Tuple[GraphQLRequestInfo, Receive]:
+    """
+    Summarize a GraphQL POST once per request
+    The body is buffered and replayed to the app; the summary is kept in the scope state
+    so stacked middleware doesn't read or parse the body again
+    """
+    state = scope.setdefault("state", {})
+    if "graphql_request" in state:
+        return state["graphql_request"], receive
+
+    body, receive = await _buffer_body(receive)
+    info = parse_request(body, Headers(scope=scope).get("authorization"))
+    state["graphql_request"] = info
+    return info, receive
+
+
+async def _buffer_body(receive: Receive):
+    """Read the whole request body and return it with a receive callable that replays it"""
+    chunks = []
+    more_body = True
+    while more_body:
+        message = await receive()
+        if message["type"] != "http.request":
+            # Client went away before sending the body; let the app see the disconnect
+            async def disconnected() -> Message:
+                return message
+            return b"", disconnected
+        chunks.append(message.get("body", b""))
+        more_body = message.get("more_body", False)
+
+    body = b"".join(chunks)
+    replayed = False
+
+    async def replay() -> Message:
+        nonlocal replayed
+        if not replayed:
+            replayed = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await receive()
+
+    return body, replay
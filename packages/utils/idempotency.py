@@ -0,0 +1,163 @@
+"""
+Idempotency Keys
+Lets clients safely retry mutations: the first execution's response is stored under the
+key and returned to every retry within IDEMPOTENCY_TTL_HOURS without running the resolver
+
+Keys are scoped to the operation and the authenticated user, not the token, so a retry
+after a token refresh still replays. Concurrent duplicates are serialized with a lease: the first
+request inserts an in_progress record and executes, the others poll until it completes.
+The executing request renews its lease every IDEMPOTENCY_LEASE_SECONDS / 3, so a duplicate
+only takes over once the first execution has stopped renewing (crashed or hung worker).
+Failed executions release the lease and are not stored, so they can be retried.
+
+Response types must be flat strawberry types (scalars and lists of scalars)
+"""
+
+import asyncio
+import dataclasses
+import hashlib
+import json
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Optional, Type
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from packages.utils.cache import LRUCache
+from packages.utils.metrics import metrics
+
+IDEMPOTENCY_TTL_HOURS = int(os.environ.get("IDEMPOTENCY_TTL_HOURS", "24"))
+# How long an execution may hold a key before a duplicate is allowed to take over
+IDEMPOTENCY_LEASE_SECONDS = float(os.environ.get("IDEMPOTENCY_LEASE_SECONDS", "30"))
+IDEMPOTENCY_CACHE_SIZE = int(os.environ.get("IDEMPOTENCY_CACHE_SIZE", "10000"))
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+POLL_INTERVAL_SECONDS = 0.05
+POLL_MAX_INTERVAL_SECONDS = 0.5
+
+# Completed responses never change, so they can be served from memory for the whole window
+_completed = LRUCache(IDEMPOTENCY_CACHE_SIZE, ttl=IDEMPOTENCY_TTL_HOURS * 3600)
+
+
+def _scope(operation: str, user_id: str, key: str) -> str:
+    return f"{operation}:{user_id}:{key}"
+
+
+def _fingerprint(arguments: Any) -> str:
+    """Hash of the mutation arguments, to reject a key reused for a different request"""
+    if dataclasses.is_dataclass(arguments):
+        arguments = dataclasses.asdict(arguments)
+    encoded = json.dumps(arguments, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def _replay(record: dict, fingerprint: str, response_type: Type) -> Any:
+    if record["fingerprint"] != fingerprint:
+        raise Exception("Idempotency key was already used with different arguments")
+    metrics.incr("idempotency.replayed")
+    return response_type(**record["response"])
+
+
+async def _acquire(db, scope: str, fingerprint: str, owner: str) -> Optional[dict]:
+    """Insert or take over the lease; returns the existing record when another request holds it"""
+    now = datetime.now(timezone.utc)
+    lease = {
+        "status": "in_progress",
+        "fingerprint": fingerprint,
+        "owner": owner,
+        "lease_expires_at": now + timedelta(seconds=IDEMPOTENCY_LEASE_SECONDS),
+        "expires_at": now + timedelta(hours=IDEMPOTENCY_TTL_HOURS),
+        "created_at": now,
+        "updated_at": now
+    }
+    try:
+        await db.idempotency_keys.insert_one({"key": scope, **lease})
+        return None
+    except DuplicateKeyError:
+        pass
+
+    # Take over a lease that is no longer renewed, i.e. its execution crashed or hung
+    taken = await db.idempotency_keys.find_one_and_update(
+        {"key": scope, "status": "in_progress", "lease_expires_at": {"$lte": now}, "fingerprint": fingerprint},
+        {"$set": lease},
+        return_document=ReturnDocument.AFTER
+    )
+    if taken:
+        return None
+    return await db.idempotency_keys.find_one({"key": scope}) or {"status": "released"}
+
+
+async def _renew(db, scope: str, owner: str) -> None:
+    """Keep extending our lease while the execution runs"""
+    while True:
+        await asyncio.sleep(IDEMPOTENCY_LEASE_SECONDS / 3)
+        result = await db.idempotency_keys.update_one(
+            {"key": scope, "status": "in_progress", "owner": owner},
+            {"$set": {
+                "lease_expires_at": datetime.now(timezone.utc) + timedelta(seconds=IDEMPOTENCY_LEASE_SECONDS)
+            }}
+        )
+        if not result.modified_count:
+            metrics.incr("idempotency.lease_lost")
+            return
+
+
+async def run_idempotent(
+    db,
+    operation: str,
+    user_id: str,
+    key: str,
+    arguments: Any,
+    execute: Callable[[], Awaitable[Any]],
+    response_type: Type
+) -> Any:
+    """Run execute() at most once per (operation, user_id, key) and replay its response"""
+    if not key or len(key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+        raise Exception(f"Idempotency key must be 1-{IDEMPOTENCY_KEY_MAX_LENGTH} characters")
+
+    scope = _scope(operation, user_id, key)
+    fingerprint = _fingerprint(arguments)
+
+    cached = _completed.get(scope, None)
+    if cached is not None:
+        return _replay(cached, fingerprint, response_type)
+
+    owner = uuid.uuid4().hex
+    interval = POLL_INTERVAL_SECONDS
+    deadline = asyncio.get_running_loop().time() + IDEMPOTENCY_LEASE_SECONDS
+    while True:
+        record = await _acquire(db, scope, fingerprint, owner)
+        if record is None:
+            break
+        if record["status"] == "completed":
+            _completed.set(scope, record)
+            return _replay(record, fingerprint, response_type)
+        if record.get("fingerprint", fingerprint) != fingerprint:
+            raise Exception("Idempotency key was already used with different arguments")
+
+        # Another request holds the lease or just released it; back off before trying again
+        if asyncio.get_running_loop().time() >= deadline:
+            raise Exception("A request with this idempotency key is still in progress")
+        metrics.incr("idempotency.waited")
+        await asyncio.sleep(interval)
+        interval = min(interval * 2, POLL_MAX_INTERVAL_SECONDS)
+
+    renewal = asyncio.create_task(_renew(db, scope, owner))
+    try:
+        response = await execute()
+    except BaseException:
+        # Errors are not stored; release the key so the client can retry
+        await db.idempotency_keys.delete_one({"key": scope, "status": "in_progress", "owner": owner})
+        raise
+    finally:
+        renewal.cancel()
+
+    record = {"fingerprint": fingerprint, "response": dataclasses.asdict(response), "status": "completed"}
+    await db.idempotency_keys.update_one(
+        {"key": scope},
+        {"$set": {**record, "updated_at": datetime.now(timezone.utc)}, "$unset": {"lease_expires_at": ""}}
+    )
+    _completed.set(scope, record)
+    metrics.incr("idempotency.executed")
+    return response
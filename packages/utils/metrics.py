@@ -0,0 +1,45 @@
+"""
+In-process Metrics
+Lightweight counters and gauges exposed through the /metrics endpoint
+"""
+
+import threading
+from typing import Any, Callable, Dict
+
+
+class Metrics:
+    """
+    Registry of named counters, gauges and stat providers
+    Providers are callables returning a dict, evaluated when a snapshot is taken
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values: Dict[str, float] = {}
+        self._providers: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+    def incr(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self._values[name] = self._values.get(name, 0) + value
+
+    def set(self, name: str, value: float) -> None:
+        with self._lock:
+            self._values[name] = value
+
+    def get(self, name: str, default: float = 0) -> float:
+        return self._values.get(name, default)
+
+    def register(self, name: str, provider: Callable[[], Dict[str, Any]]) -> None:
+        """Register a callable whose stats are included under `name` in snapshots"""
+        self._providers[name] = provider
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            data: Dict[str, Any] = dict(self._values)
+        for name, provider in self._providers.items():
+            data[name] = provider()
+        return data
+
+
+# Global metrics registry
+metrics = Metrics()
@@ -0,0 +1,111 @@
+"""
+Pagination Helpers
+Opaque keyset cursors for connection queries
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional
+
+from strawberry.types.nodes import SelectedField
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"$date": value.isoformat()}
+    raise TypeError(f"Cannot encode {type(value).__name__} in a cursor")
+
+
+def _object_hook(value: dict) -> Any:
+    if "$date" in value:
+        return datetime.fromisoformat(value["$date"])
+    return value
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode the sort key of the last item of a page"""
+    raw = json.dumps(list(values), default=_default, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii"))
+        values = json.loads(raw, object_hook=_object_hook)
+    except (ValueError, UnicodeError):
+        raise Exception("Invalid cursor")
+    if not isinstance(values, list):
+        raise Exception("Invalid cursor")
+    return values
+
+
+def page_size(first: Optional[int]) -> int:
+    """Clamp a requested page size to 1..MAX_PAGE_SIZE"""
+    if first is None:
+        return DEFAULT_PAGE_SIZE
+    return max(1, min(first, MAX_PAGE_SIZE))
+
+
+def keyset_after(fields: List[str], values: List[Any], descending: bool = True) -> dict:
+    """
+    Filter selecting documents strictly after `values` in (fields...) order
+    e.g. fields=["created_at", "id"] -> created_at < a OR (created_at == a AND id < b)
+    """
+    op = "$lt" if descending else "$gt"
+    clauses = []
+    for i, field in enumerate(fields):
+        clause = {fields[j]: values[j] for j in range(i)}
+        clause[field] = {op: values[i]}
+        clauses.append(clause)
+    return clauses[0] if len(clauses) == 1 else {"$or": clauses}
+
+
+def _collect_fields(selections, names: set) -> None:
+    for selection in selections:
+        if isinstance(selection, SelectedField):
+            names.add(selection.name)
+        else:
+            # Fragment spreads and inline fragments
+            _collect_fields(selection.selections, names)
+
+
+def selected_node_fields(info) -> set:
+    """GraphQL field names selected under edges { node { ... } } of a connection"""
+    names: set = set()
+    for field in info.selected_fields:
+        for edges in field.selections:
+            if getattr(edges, "name", None) != "edges":
+                continue
+            for node in edges.selections:
+                if getattr(node, "name", None) == "node":
+                    _collect_fields(node.selections, names)
+    return names
+
+
+def is_selected(info, name: str) -> bool:
+    """Whether a top-level field of the returned object (e.g. totalCount) was requested"""
+    for field in info.selected_fields:
+        for selection in field.selections:
+            if getattr(selection, "name", None) == name:
+                return True
+    return False
+
+
+def _path_selected(selections, path: List[str]) -> bool:
+    for selection in selections:
+        if not isinstance(selection, SelectedField):
+            # Fragment spreads and inline fragments
+            if _path_selected(selection.selections, path):
+                return True
+        elif selection.name == path[0] and (len(path) == 1 or _path_selected(selection.selections, path[1:])):
+            return True
+    return False
+
+
+def is_path_selected(info, *path: str) -> bool:
+    """Whether a nested field of the returned object was requested, e.g. ("edges", "node", "items")"""
+    return any(_path_selected(field.selections, list(path)) for field in info.selected_fields)
@@ -0,0 +1,242 @@
+"""
+Persisted Queries
+Read-only catalog operations served over GET so browsers, CDNs and reverse proxies can cache them
+
+GET /graphql/persisted/{name or sha256}?variables={...}
+
+- Cache-Control max-age is the smallest cache hint of the operation's root fields
+- A strong ETag is derived from the operation, its variables and the data version
+  (max updated_at of the underlying collection or the product's own updated_at);
+  a matching If-None-Match answers 304 without running any resolver
+"""
+
+import hashlib
+import json
+from typing import Awaitable, Callable, Dict, Optional
+
+from fastapi import APIRouter, HTTPException, Request, Response
+from graphql import parse
+from graphql.language import OperationDefinitionNode
+
+from packages.utils.encoding import ResponseEncoder, get_response_encoder
+from packages.utils.metrics import metrics
+
+# Per-field cache hints (seconds) for public root fields
+CACHE_HINTS: Dict[str, int] = {
+    "categoryList": 300,
+    "productList": 30,
+    "productGet": 60,
+}
+
+# Suffixes appended to strong ETags by CompressionMiddleware
+ENCODING_SUFFIXES = ("-br", "-gzip")
+
+PRODUCT_FIELDS = """
+    id
+    name
+    description
+    type
+    categoryId
+    sellerId
+    price
+    images
+    isAvailable
+    stockQuantity
+    serviceDuration
+    tags
+    createdAt
+"""
+
+
+async def _max_updated_at(collection) -> str:
+    doc = await collection.find_one({}, {"updated_at": 1, "_id": 0}, sort=[("updated_at", -1)])
+    updated_at = doc.get("updated_at") if doc else None
+    return updated_at.isoformat() if updated_at else "empty"
+
+
+async def category_list_version(db, variables: dict) -> str:
+    return await _max_updated_at(db.categories)
+
+
+async def product_list_version(db, variables: dict) -> str:
+    return await _max_updated_at(db.products)
+
+
+async def product_get_version(db, variables: dict) -> str:
+    doc = await db.products.find_one({"id": variables.get("productId")}, {"updated_at": 1, "created_at": 1, "_id": 0})
+    if doc is None:
+        return "missing"
+    # Documents written before updated_at existed fall back to created_at
+    updated_at = doc.get("updated_at") or doc.get("created_at")
+    return updated_at.isoformat() if updated_at else "unversioned"
+
+
+class PersistedOperation:
+    def __init__(self, name: str, query: str, version: Callable[[object, dict], Awaitable[str]]):
+        self.name = name
+        self.query = query
+        self.version = version
+        self.sha256 = hashlib.sha256(query.encode("utf-8")).hexdigest()
+        self.max_age = self._max_age(query)
+
+    @staticmethod
+    def _max_age(query: str) -> int:
+        document = parse(query)
+        max_age = None
+        for definition in document.definitions:
+            if not isinstance(definition, OperationDefinitionNode) or definition.operation.value != "query":
+                raise ValueError("Persisted operations must be read-only queries")
+            for selection in definition.selection_set.selections:
+                hint = CACHE_HINTS.get(selection.name.value, 0)
+                max_age = hint if max_age is None else min(max_age, hint)
+        return max_age or 0
+
+
+PERSISTED_OPERATIONS = [
+    PersistedOperation(
+        "CategoryList",
+        """
+        query CategoryList {
+          categoryList { id name description parentCategoryId isActive createdBy createdAt }
+        }
+        """,
+        category_list_version,
+    ),
+    PersistedOperation(
+        "ProductList",
+        """
+        query ProductList(
+          $categoryId: String
+          $sellerId: String
+          $isAvailable: Boolean
+          $productType: String
+          $minPrice: Float
+          $maxPrice: Float
+          $inStock: Boolean
+          $tags: [String!]
+          $sortBy: ProductSortField
+          $direction: SortDirection
+          $limit: Int
+        ) {
+          productList(
+            categoryId: $categoryId
+            sellerId: $sellerId
+            isAvailable: $isAvailable
+            productType: $productType
+            minPrice: $minPrice
+            maxPrice: $maxPrice
+            inStock: $inStock
+            tags: $tags
+            sortBy: $sortBy
+            direction: $direction
+            limit: $limit
+          ) {%s}
+        }
+        """ % PRODUCT_FIELDS,
+        product_list_version,
+    ),
+    PersistedOperation(
+        "ProductGet",
+        """
+        query ProductGet($productId: String!) {
+          productGet(productId: $productId) {%s}
+        }
+        """ % PRODUCT_FIELDS,
+        product_get_version,
+    ),
+]
+
+OPERATIONS_BY_KEY: Dict[str, PersistedOperation] = {}
+for _operation in PERSISTED_OPERATIONS:
+    OPERATIONS_BY_KEY[_operation.name] = _operation
+    OPERATIONS_BY_KEY[_operation.sha256] = _operation
+
+
+def compute_etag(operation: PersistedOperation, variables: dict, version: str) -> str:
+    canonical = json.dumps(variables, sort_keys=True, separators=(",", ":"))
+    digest = hashlib.sha256(f"{operation.sha256}|{canonical}|{version}".encode("utf-8")).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def matching_etag(if_none_match: Optional[str], etag: str) -> Optional[str]:
+    """
+    The If-None-Match validator matching etag, ignoring encoding suffixes, or None
+    Returned as the client sent it, so a 304 carries the same validator as the cached 200
+    """
+    if not if_none_match:
+        return None
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return etag
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        unsuffixed = candidate
+        for suffix in ENCODING_SUFFIXES:
+            if unsuffixed.endswith(suffix + '"'):
+                unsuffixed = unsuffixed[: -len(suffix) - 1] + '"'
+        if unsuffixed == etag:
+            return candidate
+    return None
+
+
+def build_persisted_router(
+    schema,
+    context_getter: Callable[[Request], Awaitable[dict]],
+    response_encoder: Optional[ResponseEncoder] = None,
+) -> APIRouter:
+    """Create the router serving persisted operations over GET"""
+    router = APIRouter()
+    encoder = response_encoder or get_response_encoder()
+
+    @router.get("/persisted/{operation_key}")
+    async def persisted_query(operation_key: str, request: Request, variables: Optional[str] = None):
+        operation = OPERATIONS_BY_KEY.get(operation_key)
+        if operation is None:
+            raise HTTPException(status_code=404, detail="Unknown persisted operation")
+
+        try:
+            variable_values = json.loads(variables) if variables else {}
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Variables must be valid JSON")
+        if not isinstance(variable_values, dict):
+            raise HTTPException(status_code=400, detail="Variables must be a JSON object")
+
+        context = await context_getter(request)
+        version = await operation.version(context["db"], variable_values)
+        etag = compute_etag(operation, variable_values, version)
+        cache_headers = {
+            "ETag": etag,
+            "Cache-Control": f"public, max-age={operation.max_age}",
+        }
+
+        validator = matching_etag(request.headers.get("if-none-match"), etag)
+        if validator:
+            metrics.incr("persisted.not_modified")
+            # CompressionMiddleware leaves 304s alone, so add what it adds to the 200
+            return Response(
+                status_code=304,
+                headers={**cache_headers, "ETag": validator, "Vary": "Accept-Encoding"}
+            )
+
+        metrics.incr("persisted.executed")
+        result = await schema.execute(
+            operation.query,
+            variable_values=variable_values,
+            context_value=context,
+            operation_name=operation.name,
+        )
+
+        payload = {"data": result.data}
+        if result.errors:
+            # Never let a CDN cache an error
+            payload["errors"] = [error.formatted for error in result.errors]
+            cache_headers = {"Cache-Control": "no-store"}
+
+        return Response(
+            encoder.encode(payload),
+            media_type="application/json",
+            headers=cache_headers,
+        )
+
+    return router
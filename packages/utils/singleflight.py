@@ -0,0 +1,92 @@
+"""
+Single-flight Request Coalescing
+Concurrent identical reads share one database query and one result
+"""
+
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+from packages.utils.metrics import metrics
+
+# Completed results are reused for this long (0 disables reuse after completion)
+SINGLEFLIGHT_FRESHNESS_MS = float(os.environ.get("SINGLEFLIGHT_FRESHNESS_MS", "50"))
+SINGLEFLIGHT_MAX_RECENT = 10000
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent calls per key
+
+    - The first caller for a key starts the load; later callers await the same task
+    - The load runs as its own task, so a cancelled caller does not cancel the others
+    - Results stay shareable for `freshness` seconds after completion; errors are never reused
+    """
+
+    def __init__(self, name: str, freshness: float = SINGLEFLIGHT_FRESHNESS_MS / 1000.0):
+        self.name = name
+        self.freshness = freshness
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._recent: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+        self.fresh_hits = 0
+        metrics.register(f"singleflight.{name}", self.stats)
+
+    async def do(self, key: Hashable, load: Callable[[], Awaitable[Any]]) -> Any:
+        self.calls += 1
+
+        recent = self._recent.get(key)
+        if recent is not None:
+            if recent[0] > time.monotonic():
+                self.fresh_hits += 1
+                return recent[1]
+            del self._recent[key]
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return await asyncio.shield(task)
+
+        self.executions += 1
+        task = asyncio.ensure_future(self._run(key, load))
+        self._inflight[key] = task
+        return await asyncio.shield(task)
+
+    async def _run(self, key: Hashable, load: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            result = await load()
+        finally:
+            self._inflight.pop(key, None)
+        if self.freshness > 0:
+            self._remember(key, result)
+        return result
+
+    def _remember(self, key: Hashable, result: Any) -> None:
+        self._recent[key] = (time.monotonic() + self.freshness, result)
+        self._recent.move_to_end(key)
+        while len(self._recent) > SINGLEFLIGHT_MAX_RECENT:
+            self._recent.popitem(last=False)
+
+    def forget(self, key: Hashable) -> None:
+        """Drop a remembered result, e.g. after the underlying document was written"""
+        self._recent.pop(key, None)
+
+    def clear(self) -> None:
+        self._recent.clear()
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "fresh_hits": self.fresh_hits,
+            "inflight": len(self._inflight),
+        }
+
+
+# Shared coalescers for hot catalog reads
+category_reads = SingleFlight("category_list")